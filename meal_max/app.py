@@ -1,23 +1,131 @@
+import csv
+import functools
+import io
+from itertools import islice
+import json
+import os
+import time
+
 from dotenv import load_dotenv
-from flask import Flask, jsonify, make_response, Response, request
+from flask import Flask, g, jsonify, make_response, Response, request
 # from flask_cors import CORS
 
 from meal_max.models import kitchen_model
-from meal_max.models.battle_model import BattleModel
-from meal_max.utils.sql_utils import check_database_connection, check_table_exists
+from meal_max.models.arena_model import ARENA_IDLE_TIMEOUT, ARENA_MAX_ARENAS, ArenaRegistry
+from meal_max.models import simulation_model
+from meal_max.models.leaderboard_model import encode_cursor, leaderboard
+from meal_max.models.tournament_model import TournamentModel
+from meal_max.utils.random_providers import CircuitBreakerProvider, get_random_provider
+from meal_max.utils.logger import configure_app_logger
+from meal_max.utils.metrics import METRICS_ENABLED, registry
+from meal_max.utils.random_utils import get_http_stats, get_random_buffer_stats
+from meal_max.utils.sql_utils import (
+    check_database_connection,
+    check_table_exists,
+    get_pragma_profile,
+    get_pragma_settings,
+)
 
 
 # Load environment variables from .env file
 load_dotenv()
 
 app = Flask(__name__)
+configure_app_logger(app)
 # This bypasses standard security stuff we'll talk about later
 # If you get errors that use words like cross origin or flight,
 # uncomment this
 # CORS(app)
 
-# Initialize the BattleModel
-battle_model = BattleModel()
+# Each client battles in its own arena, picked by the X-Arena-Id header or arena_id query parameter
+arenas = ArenaRegistry(ARENA_MAX_ARENAS, ARENA_IDLE_TIMEOUT)
+tournament_model = TournamentModel()
+
+registry.gauge("meal_max_arenas", "Arenas currently held.", lambda: arenas.stats()['arenas'])
+registry.gauge("meal_max_meal_cache_entries", "Meals in the meal cache.",
+               lambda: (kitchen_model.get_meal_cache_stats() or {}).get('size'))
+registry.gauge("meal_max_random_buffer_depth", "Random numbers waiting in the prefetch buffer.",
+               lambda: (get_random_buffer_stats() or {}).get('depth'))
+
+# Fail fast on a misconfigured PRAGMA profile rather than on the first query
+app.logger.info("Database PRAGMA settings: %s", get_pragma_settings())
+
+
+@app.before_request
+def start_timer() -> None:
+    g.start_time = time.perf_counter()
+
+
+http_requests = registry.counter("meal_max_http_requests_total", "HTTP requests served.",
+                                 ("method", "route", "status"))
+http_request_duration = registry.histogram("meal_max_http_request_duration_seconds",
+                                           "Time to build each HTTP response.", ("method", "route"))
+
+
+@app.after_request
+def log_request(response: Response) -> Response:
+    """Logs each request's route, status and latency, tagged as the http.request event, and records them as metrics."""
+    start = g.get('start_time')
+    elapsed = time.perf_counter() - start if start is not None else None
+    latency_ms = round(elapsed * 1000, 3) if elapsed is not None else None
+    if METRICS_ENABLED:
+        # the route pattern rather than the path, so ids in the URL do not each get their own series
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        http_requests.inc(request.method, route, str(response.status_code))
+        if elapsed is not None:
+            http_request_duration.observe(elapsed, request.method, route)
+    app.logger.info("%s %s %d in %s ms", request.method, request.path, response.status_code, latency_ms,
+                    extra={'event': 'http.request', 'method': request.method, 'path': request.path,
+                           'status': response.status_code, 'latency_ms': latency_ms})
+    return response
+
+
+# part of every ETag, so tags from another process or an earlier run never match this one's versions
+_ETAG_EPOCH = f"{os.getpid():x}{int(time.time()):x}"
+
+def conditional(validator, vary=()):
+    """
+    Decorates a GET route to answer conditional requests without running it.
+
+    `validator` returns an (ETag, last modified time) pair for the current
+    request from in-memory version counters, so working it out never touches
+    the database. When If-None-Match matches the ETag, or there is no
+    If-None-Match and If-Modified-Since is no earlier than the last change,
+    the route is skipped and a 304 is returned. Successful responses carry
+    the ETag and Last-Modified headers, and a Vary on the `vary` request headers
+    the version depends on. If `validator` raises ValueError, the route runs
+    unconditionally and reports the error itself.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                tag, modified = validator()
+            except ValueError:
+                return view(*args, **kwargs)
+            etag = f"{_ETAG_EPOCH}-{tag}"
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                since = request.if_modified_since
+                not_modified = since is not None and int(modified) <= since.timestamp()
+
+            response = Response(status=304) if not_modified else view(*args, **kwargs)
+            if response.status_code in (200, 304):
+                response.set_etag(etag)
+                # Last-Modified only has whole seconds, so a change later in the same second would
+                # go unnoticed by If-Modified-Since; leave it out until that second has passed
+                if int(modified) < int(time.time()):
+                    response.last_modified = int(modified)
+                response.vary.update(vary)
+            return response
+        return wrapper
+    return decorator
+
+def _data_validator():
+    version, modified = kitchen_model.get_data_version()
+    return f"d{version}", modified
+
 
 ####################################################
 #
@@ -43,7 +151,8 @@ def db_check() -> Response:
     Route to check if the database connection and meals table are functional.
 
     Returns:
-        JSON response indicating the database health status.
+        JSON response indicating the database health status, along with the
+        active PRAGMA profile and the read/write concurrency it provides.
     Raises:
         404 error if there is an issue with the database.
     """
@@ -54,10 +163,68 @@ def db_check() -> Response:
         app.logger.info("Checking if meals table exists...")
         check_table_exists("meals")
         app.logger.info("meals table exists.")
-        return make_response(jsonify({'database_status': 'healthy'}), 200)
+        profile = get_pragma_profile()
+        return make_response(jsonify({'database_status': 'healthy', 'pragma_profile': profile}), 200)
     except Exception as e:
         return make_response(jsonify({'error': str(e)}), 404)
 
+@app.route('/api/random-buffer', methods=['GET'])
+def random_buffer() -> Response:
+    """
+    Route to report the random number prefetch buffer's depth, misses and refill latency,
+    along with the active random provider, its circuit breaker state, and random.org
+    request counts, connections opened and latency histogram.
+
+    Returns:
+        JSON response with the buffer metrics, or null metrics if buffering is disabled.
+    """
+    app.logger.info('Random buffer stats')
+    provider = get_random_provider()
+    provider_stats = provider.stats() if isinstance(provider, CircuitBreakerProvider) else None
+    return make_response(jsonify({
+        'status': 'success',
+        'random_buffer': get_random_buffer_stats(),
+        'random_provider': provider.name,
+        'circuit_breaker': provider_stats,
+        'random_org_http': get_http_stats(),
+    }), 200)
+
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics() -> Response:
+    """
+    Route to expose request, query, connection and random draw counters and latency
+    histograms in the Prometheus text format.
+
+    Returns:
+        Plain-text response in the Prometheus exposition format, version 0.0.4.
+    """
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/api/meal-cache', methods=['GET'])
+def meal_cache() -> Response:
+    """
+    Route to report the meal cache's size and hit/miss/eviction counters.
+
+    Returns:
+        JSON response with the cache metrics, or null metrics if caching is disabled.
+    """
+    app.logger.info('Meal cache stats')
+    return make_response(jsonify({'status': 'success', 'meal_cache': kitchen_model.get_meal_cache_stats()}), 200)
+
+
+@app.route('/api/arenas', methods=['GET'])
+def arena_stats() -> Response:
+    """
+    Route to report how many battle arenas are open and how many have been evicted.
+
+    Returns:
+        JSON response with the arena registry metrics.
+    """
+    app.logger.info('Arena stats')
+    return make_response(jsonify({'status': 'success', 'arenas': arenas.stats()}), 200)
+
 
 ##########################################################
 #
@@ -115,6 +282,60 @@ def add_meal() -> Response:
         app.logger.error("Failed to add combatant: %s", str(e))
         return make_response(jsonify({'error': str(e)}), 500)
 
+def _iter_ndjson_rows(stream):
+    """Yields one parsed object per non-blank line; lines that are not JSON are passed through as text."""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield line.decode('utf-8', errors='replace')
+
+@app.route('/api/create-meals', methods=['POST'])
+def add_meals() -> Response:
+    """
+    Route to add many meals to the database in one request.
+
+    Accepted bodies (by Content-Type):
+        - application/json: an array of meal objects.
+        - application/x-ndjson: one meal object per line, read as a stream.
+        - text/csv: a header row of meal,cuisine,price,difficulty then one meal per line, read as a stream.
+
+    Each meal object has the same fields as /api/create-meal.
+
+    Returns:
+        JSON response with per-row results (inserted, duplicate or invalid) and totals.
+    Raises:
+        400 error if the body is not in an accepted format.
+        500 error if there is an issue adding the meals to the database.
+    """
+    app.logger.info('Creating meals in bulk')
+    try:
+        content_type = request.mimetype
+        if content_type == 'application/json':
+            rows = request.get_json(silent=True)
+            if not isinstance(rows, list):
+                return make_response(jsonify({'error': 'Request body must be a JSON array of meals'}), 400)
+        elif content_type in ('application/x-ndjson', 'application/jsonl'):
+            rows = _iter_ndjson_rows(request.stream)
+        elif content_type == 'text/csv':
+            rows = csv.DictReader(io.TextIOWrapper(request.stream, encoding='utf-8', newline=''))
+        else:
+            return make_response(jsonify({'error': 'Content-Type must be application/json, application/x-ndjson or text/csv'}), 400)
+
+        results = kitchen_model.create_meals_bulk(rows)
+
+        totals = {status: 0 for status in ('inserted', 'duplicate', 'invalid')}
+        for result in results:
+            totals[result['status']] += 1
+        app.logger.info("Bulk import finished: %s", totals)
+        return make_response(jsonify({'status': 'success', **totals, 'results': results}), 200)
+    except Exception as e:
+        app.logger.error("Failed to add meals: %s", str(e))
+        return make_response(jsonify({'error': str(e)}), 500)
+
 @app.route('/api/clear-meals', methods=['DELETE'])
 def clear_catalog() -> Response:
     """
@@ -152,6 +373,7 @@ def delete_meal(meal_id: int) -> Response:
         return make_response(jsonify({'error': str(e)}), 500)
 
 @app.route('/api/get-meal-by-id/<int:meal_id>', methods=['GET'])
+@conditional(_data_validator)
 def get_meal_by_id(meal_id: int) -> Response:
     """
     Route to get a meal by its ID.
@@ -159,6 +381,9 @@ def get_meal_by_id(meal_id: int) -> Response:
     Path Parameter:
         - meal_id (int): The ID of the meal.
 
+    Supports If-None-Match and If-Modified-Since: a 304 is returned without
+    reading the meal if no meal has changed since.
+
     Returns:
         JSON response with the meal details or error message.
     """
@@ -194,6 +419,48 @@ def get_meal_by_name(meal_name: str) -> Response:
         app.logger.error(f"Error retrieving meal by name: {e}")
         return make_response(jsonify({'error': str(e)}), 500)
 
+@app.route('/api/get-meals', methods=['POST'])
+def get_meals() -> Response:
+    """
+    Route to get many meals at once by their IDs or names.
+
+    Expected JSON Input:
+        - ids (List[int]): The IDs of the meals.
+        or
+        - names (List[str]): The names of the meals.
+
+    At most MEAL_LOOKUP_MAX meals can be asked for; uncached meals are read in
+    chunked IN (...) queries rather than one query per meal.
+
+    Returns:
+        JSON response with the active meals in request order, plus the requested
+        IDs or names that were not found ('missing') or have been deleted ('deleted').
+    Raises:
+        400 error if the input is invalid.
+        500 error if there is an issue retrieving the meals.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or ('ids' in data) == ('names' in data):
+            return make_response(jsonify({'error': 'Provide either ids or names'}), 400)
+
+        values = data.get('ids', data.get('names'))
+        if isinstance(values, list) and len(values) > kitchen_model.MEAL_LOOKUP_MAX:
+            return make_response(jsonify(
+                {'error': f'At most {kitchen_model.MEAL_LOOKUP_MAX} meals can be requested at once'}), 400)
+
+        app.logger.info("Retrieving meals by %s", 'ID' if 'ids' in data else 'name')
+        try:
+            result = kitchen_model.find_meals(meal_ids=data.get('ids'), meal_names=data.get('names'))
+        except ValueError as e:
+            app.logger.error("Invalid meal lookup: %s", str(e))
+            return make_response(jsonify({'error': str(e)}), 400)
+
+        return make_response(jsonify({'status': 'success', **result}), 200)
+    except Exception as e:
+        app.logger.error(f"Error retrieving meals: {e}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
 
 ############################################################
 #
@@ -202,10 +469,14 @@ def get_meal_by_name(meal_name: str) -> Response:
 ############################################################
 
 
+def _arena_id() -> str:
+    """Returns the arena the request is for; clients that do not pick one share 'default'."""
+    return request.headers.get('X-Arena-Id') or request.args.get('arena_id') or 'default'
+
 @app.route('/api/battle', methods=['GET'])
 def battle() -> Response:
     """
-    Route to initiate a battle between the two currently prepared meals.
+    Route to initiate a battle between the two meals prepared in the caller's arena.
 
     Returns:
         JSON response indicating the result of the battle and the winner.
@@ -215,7 +486,7 @@ def battle() -> Response:
     try:
         app.logger.info('Two meals enter, one meal leaves!')
 
-        winner = battle_model.battle()
+        winner = arenas.battle(_arena_id())
 
         return make_response(jsonify({'status': 'success', 'winner': winner}), 200)
     except Exception as e:
@@ -225,7 +496,7 @@ def battle() -> Response:
 @app.route('/api/clear-combatants', methods=['POST'])
 def clear_combatants() -> Response:
     """
-    Route to clear the list of combatants for the battle.
+    Route to clear the list of combatants in the caller's arena.
 
     Returns:
         JSON response indicating success of the operation.
@@ -234,24 +505,33 @@ def clear_combatants() -> Response:
     """
     try:
         app.logger.info('Clearing all combatants...')
-        battle_model.clear_combatants()
+        arenas.clear_combatants(_arena_id())
         app.logger.info('Combatants cleared.')
         return make_response(jsonify({'status': 'success'}), 200)
     except Exception as e:
         app.logger.error("Failed to clear combatants: %s", str(e))
         return make_response(jsonify({'error': str(e)}), 500)
 
+def _arena_validator():
+    version, modified = arenas.get_version(_arena_id())
+    return f"a{version}", modified
+
 @app.route('/api/get-combatants', methods=['GET'])
+# the arena comes from a header, so caches must not share one arena's list with another
+@conditional(_arena_validator, vary=('X-Arena-Id',))
 def get_combatants() -> Response:
     """
-    Route to get the list of combatants for the battle.
+    Route to get the list of combatants in the caller's arena.
+
+    Supports If-None-Match and If-Modified-Since: a 304 is returned if the
+    arena's combatants have not changed since.
 
     Returns:
         JSON response with the list of combatants.
     """
     try:
         app.logger.info('Getting combatants...')
-        combatants = battle_model.get_combatants()
+        combatants = arenas.get_combatants(_arena_id())
         return make_response(jsonify({'status': 'success', 'combatants': combatants}), 200)
     except Exception as e:
         app.logger.error("Failed to get combatants: %s", str(e))
@@ -280,8 +560,7 @@ def prep_combatant() -> Response:
 
         try:
             meal = kitchen_model.get_meal_by_name(meal)
-            battle_model.prep_combatant(meal)
-            combatants = battle_model.get_combatants()
+            combatants = arenas.prep_combatant(_arena_id(), meal)
         except Exception as e:
             app.logger.error("Failed to prepare combatant: %s", str(e))
             return make_response(jsonify({'error': str(e)}), 500)
@@ -292,6 +571,94 @@ def prep_combatant() -> Response:
         return make_response(jsonify({'error': str(e)}), 500)
 
 
+############################################################
+#
+# Tournament
+#
+############################################################
+
+
+@app.route('/api/tournament', methods=['POST'])
+def run_tournament() -> Response:
+    """
+    Route to run a whole tournament between meals in one request.
+
+    Expected JSON Input:
+        - meal_ids (List[int]): The meals taking part, in seed order.
+        - format (str): 'round_robin', 'single_elimination', 'double_elimination' or 'swiss'.
+            Default is 'round_robin'.
+        - rounds (int, optional): Number of Swiss rounds.
+
+    Every bout is decided in-process and all results are recorded in one transaction.
+
+    Returns:
+        JSON response with every bout, the final standings and the champion.
+    Raises:
+        400 error if the input is invalid.
+        500 error if there is an issue running the tournament.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get('meal_ids'), list):
+            return make_response(jsonify({'error': 'meal_ids must be a list of meal ids'}), 400)
+
+        tournament_format = data.get('format', 'round_robin')
+        app.logger.info("Running %s tournament between %d meals", tournament_format, len(data['meal_ids']))
+
+        try:
+            result = tournament_model.run(data['meal_ids'], tournament_format, data.get('rounds'))
+        except ValueError as e:
+            app.logger.error("Invalid tournament: %s", str(e))
+            return make_response(jsonify({'error': str(e)}), 400)
+
+        return make_response(jsonify({'status': 'success', 'tournament': result}), 200)
+    except Exception as e:
+        app.logger.error(f"Tournament error: {e}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+
+############################################################
+#
+# Simulation
+#
+############################################################
+
+
+@app.route('/api/simulate', methods=['POST'])
+def simulate() -> Response:
+    """
+    Route to forecast win probabilities between meals without recording any battles.
+
+    Expected JSON Input:
+        - meal_ids (List[int]): The meals to compare.
+        - bouts (int, optional): Simulated bouts per pair of meals. Default is 100000.
+        - seed (int, optional): Seed for a reproducible run.
+
+    Returns:
+        JSON response with the simulated and exact win-probability matrices.
+    Raises:
+        400 error if the input is invalid.
+        500 error if there is an issue running the simulation.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get('meal_ids'), list):
+            return make_response(jsonify({'error': 'meal_ids must be a list of meal ids'}), 400)
+        app.logger.info("Simulating battles between %d meals", len(data['meal_ids']))
+
+        try:
+            result = simulation_model.simulate(data['meal_ids'], bouts=data.get('bouts', 100000),
+                                               seed=data.get('seed'))
+        except ValueError as e:
+            app.logger.error("Invalid simulation: %s", str(e))
+            return make_response(jsonify({'error': str(e)}), 400)
+
+        return make_response(jsonify({'status': 'success', 'simulation': result}), 200)
+    except Exception as e:
+        app.logger.error(f"Simulation error: {e}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+
 ############################################################
 #
 # Leaderboard
@@ -300,29 +667,199 @@ def prep_combatant() -> Response:
 
 
 @app.route('/api/leaderboard', methods=['GET'])
+@conditional(_data_validator)
 def get_leaderboard() -> Response:
     """
-    Route to get the leaderboard of meals sorted by wins, battles, or win percentage.
+    Route to get the leaderboard of meals sorted by wins or win percentage.
 
     Query Parameters:
-        - sort (str): The field to sort by ('wins', 'battles', or 'win_pct'). Default is 'wins'.
+        - sort (str): The field to sort by ('wins' or 'win_pct'). Default is 'wins'.
+        - limit (int): Maximum number of meals to return. Optional.
+        - offset (int): Number of meals to skip. Default is 0.
+        - cursor (str): The next_cursor from a previous page, for keyset pagination. Optional.
+        - cuisine (str): Only include meals of this cuisine. Optional.
+        - difficulty (str): Only include meals of this difficulty. Optional.
+
+    Unfiltered pages are served from the in-memory leaderboard; filtered pages
+    are read from the database through the leaderboard indexes. Supports
+    If-None-Match and If-Modified-Since: a 304 is returned without building
+    the page if no meal has changed since.
 
     Returns:
-        JSON response with a sorted leaderboard of meals.
+        JSON response with a sorted leaderboard of meals, plus a next_cursor when
+        a full page of `limit` meals was returned.
     Raises:
+        400 error if limit or offset is not a non-negative integer.
         500 error if there is an issue generating the leaderboard.
     """
     try:
         sort_by = request.args.get('sort', 'wins')  # Default sort by wins
+        limit = request.args.get('limit', type=int)
+        offset = request.args.get('offset', 0, type=int)
+        cursor = request.args.get('cursor')
+        cuisine = request.args.get('cuisine')
+        difficulty = request.args.get('difficulty')
+        if (limit is not None and limit < 0) or offset < 0:
+            return make_response(jsonify({'error': 'limit and offset must be non-negative integers'}), 400)
         app.logger.info("Generating leaderboard sorted by %s", sort_by)
 
-        leaderboard_data = kitchen_model.get_leaderboard(sort_by)
+        if cuisine is not None or difficulty is not None:
+            leaderboard_data = kitchen_model.get_leaderboard(sort_by, limit=limit, offset=offset, cursor=cursor,
+                                                             cuisine=cuisine, difficulty=difficulty)
+        else:
+            leaderboard_data = leaderboard.get_leaderboard(sort_by, limit=limit, offset=offset, cursor=cursor)
 
-        return make_response(jsonify({'status': 'success', 'leaderboard': leaderboard_data}), 200)
+        response = {'status': 'success', 'leaderboard': leaderboard_data}
+        if limit and len(leaderboard_data) == limit:
+            response['next_cursor'] = encode_cursor(leaderboard_data[-1], sort_by)
+        return make_response(jsonify(response), 200)
     except Exception as e:
         app.logger.error(f"Error generating leaderboard: {e}")
         return make_response(jsonify({'error': str(e)}), 500)
 
+@app.route('/api/leaderboard/rank/<int:meal_id>', methods=['GET'])
+def get_leaderboard_rank(meal_id: int) -> Response:
+    """
+    Route to get a meal's position on the leaderboard.
+
+    Path Parameter:
+        - meal_id (int): The ID of the meal.
+
+    Query Parameters:
+        - sort (str): The field to rank by ('wins' or 'win_pct'). Default is 'wins'.
+
+    Returns:
+        JSON response with the meal's leaderboard entry, its rank and the number of ranked meals.
+    Raises:
+        500 error if the meal is not ranked or there is an issue reading the leaderboard.
+    """
+    try:
+        sort_by = request.args.get('sort', 'wins')
+        app.logger.info("Getting leaderboard rank of meal %d by %s", meal_id, sort_by)
+
+        rank = leaderboard.get_rank(meal_id, sort_by)
+
+        return make_response(jsonify({'status': 'success', 'rank': rank}), 200)
+    except Exception as e:
+        app.logger.error(f"Error getting leaderboard rank: {e}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+
+############################################################
+#
+# Export
+#
+############################################################
+
+
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+def _encode_export_batch(rows, export_format, fields):
+    """Encodes a batch of rows as NDJSON lines or CSV records."""
+    if export_format == 'ndjson':
+        return ''.join(json.dumps(row) + '\n' for row in rows)
+    buffer = io.StringIO()
+    csv.DictWriter(buffer, fields, lineterminator='\n').writerows(rows)
+    return buffer.getvalue()
+
+def _stream_export(rows, export_format, fields, name):
+    """
+    Streams rows from a kitchen_model iterator, one EXPORT_BATCH_SIZE batch per chunk.
+
+    The first batch is read before the response starts, so a database error is
+    still reported as a 500; later errors can only cut the stream short.
+    `rows` reads each batch on a short-lived connection, so a slow client holds
+    none while it downloads. Closing the response (including on client
+    disconnect, or for a HEAD request that never reads the body) closes `rows`.
+    """
+    batch_size = kitchen_model.EXPORT_BATCH_SIZE
+    first = list(islice(rows, batch_size))
+
+    def generate():
+        try:
+            if export_format == 'csv':
+                yield ','.join(fields) + '\n'
+            batch = first
+            while batch:
+                yield _encode_export_batch(batch, export_format, fields)
+                batch = list(islice(rows, batch_size))
+        except Exception as e:
+            app.logger.error("Export of %s failed mid-stream: %s", name, str(e))
+            raise
+
+    response = Response(generate(), mimetype=EXPORT_FORMATS[export_format],
+                        headers={'Content-Disposition': f'attachment; filename={name}.{export_format}'})
+    # a HEAD request or an early disconnect never starts generate(), so it cannot close rows itself
+    response.call_on_close(rows.close)
+    return response
+
+@app.route('/api/export/meals', methods=['GET'])
+def export_meals() -> Response:
+    """
+    Route to download every active meal, streamed in id order.
+
+    Query Parameters:
+        - format (str): 'ndjson' or 'csv'. Default is 'ndjson'.
+
+    Rows are read from the database in batches and written out as they are
+    read, so memory use does not grow with the catalog. A CSV export can be
+    uploaded again to /api/create-meals.
+
+    Returns:
+        Streamed NDJSON (one meal object per line) or CSV (with a header row).
+    Raises:
+        400 error if the format is not supported.
+        500 error if there is an issue reading the meals.
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return make_response(jsonify({'error': 'format must be ndjson or csv'}), 400)
+        app.logger.info("Exporting meals as %s", export_format)
+
+        return _stream_export(kitchen_model.iter_meals(), export_format, kitchen_model.MEAL_EXPORT_FIELDS, 'meals')
+    except Exception as e:
+        app.logger.error(f"Error exporting meals: {e}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
+@app.route('/api/export/leaderboard', methods=['GET'])
+def export_leaderboard() -> Response:
+    """
+    Route to download the whole leaderboard, streamed in rank order.
+
+    Query Parameters:
+        - format (str): 'ndjson' or 'csv'. Default is 'ndjson'.
+        - sort (str): The field to sort by ('wins' or 'win_pct'). Default is 'wins'.
+        - cuisine (str): Only include meals of this cuisine. Optional.
+        - difficulty (str): Only include meals of this difficulty. Optional.
+
+    Rows come straight from the leaderboard indexes in batches, so memory
+    use does not grow with the number of ranked meals.
+
+    Returns:
+        Streamed NDJSON (one leaderboard entry per line) or CSV (with a header row).
+    Raises:
+        400 error if the format or sort is not supported.
+        500 error if there is an issue reading the leaderboard.
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return make_response(jsonify({'error': 'format must be ndjson or csv'}), 400)
+        sort_by = request.args.get('sort', 'wins')
+        app.logger.info("Exporting leaderboard sorted by %s as %s", sort_by, export_format)
+
+        try:
+            rows = kitchen_model.iter_leaderboard(sort_by, cuisine=request.args.get('cuisine'),
+                                                  difficulty=request.args.get('difficulty'))
+        except ValueError as e:
+            return make_response(jsonify({'error': str(e)}), 400)
+
+        return _stream_export(rows, export_format, kitchen_model.LEADERBOARD_EXPORT_FIELDS, 'leaderboard')
+    except Exception as e:
+        app.logger.error(f"Error exporting leaderboard: {e}")
+        return make_response(jsonify({'error': str(e)}), 500)
+
 
 
 if __name__ == '__main__':
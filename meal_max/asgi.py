@@ -0,0 +1,108 @@
+"""ASGI entry point for the meal battle service.
+
+Battles are served on the event loop: the random draw is awaited from an
+async random.org client and the SQLite work is handed to the bounded
+database executor, so one process keeps many battles in flight while they
+wait on I/O. Every other route is served by the Flask app on a thread pool.
+
+Run with:
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+"""
+import asyncio
+import json
+import os
+import time
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+
+from app import app as flask_app, arenas, http_request_duration, http_requests
+from meal_max.utils.async_random import create_async_random_client
+from meal_max.utils.metrics import METRICS_ENABLED
+from meal_max.utils.sql_utils import close_db_executor, run_in_db_executor
+
+
+# threads serving the synchronous Flask routes
+ASGI_WSGI_WORKERS = int(os.getenv("ASGI_WSGI_WORKERS", "10"))
+
+wsgi_application = WSGIMiddleware(flask_app, workers=ASGI_WSGI_WORKERS)
+random_client = create_async_random_client()
+
+
+def _arena_id(scope) -> str:
+    """Reads the arena from the X-Arena-Id header or arena_id query parameter, as app.py does."""
+    for name, value in scope['headers']:
+        if name == b'x-arena-id' and value:
+            return value.decode('latin-1')
+    arena_ids = parse_qs(scope.get('query_string', b'').decode('latin-1')).get('arena_id')
+    return arena_ids[0] if arena_ids else 'default'
+
+
+async def _send_json(send, status: int, payload: dict) -> None:
+    body = json.dumps(payload).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def battle(scope, receive, send) -> None:
+    """
+    Route to initiate a battle between the two meals prepared in the caller's arena.
+
+    Same request, response and route metrics as the Flask /api/battle route.
+    """
+    start = time.perf_counter()
+    try:
+        flask_app.logger.info('Two meals enter, one meal leaves!')
+
+        arena_id = _arena_id(scope)
+        # an invalid arena or one without two combatants fails before a random number is spent on it
+        combatants = await run_in_db_executor(arenas.get_combatants, arena_id)
+        if len(combatants) < 2:
+            raise ValueError("Two combatants must be prepped for a battle.")
+
+        random_number = await random_client.get_random()
+        winner = await run_in_db_executor(arenas.battle, arena_id, random_number)
+
+        status, payload = 200, {'status': 'success', 'winner': winner}
+    except Exception as e:
+        flask_app.logger.error(f"Battle error: {e}")
+        status, payload = 500, {'error': str(e)}
+
+    await _send_json(send, status, payload)
+    if METRICS_ENABLED:
+        http_requests.inc(scope['method'], scope['path'], str(status))
+        http_request_duration.observe(time.perf_counter() - start, scope['method'], scope['path'])
+
+
+async def lifespan(scope, receive, send) -> None:
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await random_client.aclose()
+            # waits for queued database work, so it runs off the event loop
+            await asyncio.to_thread(close_db_executor)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+ASYNC_ROUTES = {
+    ('GET', '/api/battle'): battle,
+}
+
+
+async def application(scope, receive, send) -> None:
+    if scope['type'] == 'lifespan':
+        await lifespan(scope, receive, send)
+        return
+
+    handler = ASYNC_ROUTES.get((scope.get('method'), scope.get('path'))) if scope['type'] == 'http' else None
+    if handler is not None:
+        await handler(scope, receive, send)
+    else:
+        await wsgi_application(scope, receive, send)
@@ -0,0 +1,99 @@
+"""Throughput of BattleModel.battle with a stubbed randomness source.
+
+    python -m benchmarks.battle_benchmark --battles 20000 --meals 10000 --output battle.json
+
+Random numbers come from a SeededRandomProvider, so nothing waits on
+random.org. Modes:
+    in_memory  battle() with record_battle_result stubbed out: scoring, decision
+               and logging calls only
+    sqlite     battle() recording each result in a temp database of --meals meals
+    vectorized decide_battles over NumPy arrays, the batch path used by
+               tournaments and simulations, for comparison
+"""
+import argparse
+import random
+import time
+from typing import Any, Optional
+from unittest.mock import patch
+
+import numpy as np
+
+from benchmarks.common import measure, quiet_logging, save_results, temp_database
+from meal_max.models import battle_model, kitchen_model
+from meal_max.models.battle_model import BattleModel, decide_battles
+from meal_max.models.kitchen_model import Meal
+from meal_max.utils.random_providers import SeededRandomProvider
+
+
+MODES = ("in_memory", "sqlite", "vectorized")
+
+
+def _meal_pairs(meals: int, count: int, seed: int) -> list[tuple[Meal, Meal]]:
+    rng = random.Random(seed)
+    cuisines = ("Italian", "French", "Mexican", "Thai")
+    pairs = []
+    for _ in range(count):
+        first, second = rng.sample(range(1, meals + 1), 2)
+        pairs.append(tuple(Meal(id=meal_id, meal=f"Meal {meal_id - 1}", cuisine=rng.choice(cuisines),
+                                price=round(rng.uniform(1, 50), 2), difficulty=rng.choice(("HIGH", "MED", "LOW")))
+                           for meal_id in (first, second)))
+    return pairs
+
+
+def _battle_once(model: BattleModel, pairs: list[tuple[Meal, Meal]]):
+    def battle(i):
+        model.clear_combatants()
+        model.prep_combatant(pairs[i][0])
+        model.prep_combatant(pairs[i][1])
+        model.battle()
+    return battle
+
+
+def run_mode(mode: str, battles: int, meals: int, seed: int = 0) -> dict[str, Any]:
+    """Runs `battles` battles in the given mode.
+
+    Returns:
+        dict[str, Any]: Throughput and per-battle latency, see `benchmarks.common.summarize`.
+    """
+    model = BattleModel(SeededRandomProvider(seed))
+    if mode == "in_memory":
+        pairs = _meal_pairs(meals, battles, seed)
+        with patch.object(battle_model, 'record_battle_result', lambda winner_id, loser_id: None):
+            return measure(_battle_once(model, pairs), battles, warmup=min(100, battles))
+    if mode == "sqlite":
+        with temp_database(meals, seed):
+            # meals exactly as stored, so every recorded result finds its rows
+            stored = kitchen_model.get_meals_by_ids(list(range(1, meals + 1)))
+            rng = random.Random(seed)
+            pairs = [tuple(rng.sample(stored, 2)) for _ in range(battles)]
+            return measure(_battle_once(model, pairs), battles)
+    if mode == "vectorized":
+        rng = np.random.default_rng(seed)
+        scores_1, scores_2 = rng.uniform(0, 500, battles), rng.uniform(0, 500, battles)
+        randoms = rng.integers(0, 100, battles) / 100
+        start = time.perf_counter()
+        decide_battles(scores_1, scores_2, randoms)
+        elapsed = time.perf_counter() - start
+        return {'ops': battles, 'ops_per_sec': round(battles / elapsed, 1), 'mean_us': round(elapsed / battles * 1e6, 4)}
+    raise ValueError(f"Unknown mode: {mode}.")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark BattleModel.battle throughput.")
+    parser.add_argument("--battles", type=int, default=20000, help="battles per mode")
+    parser.add_argument("--meals", type=int, default=10000, help="meals in the temp database for the sqlite mode")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file as well as stdout")
+    args = parser.parse_args(argv)
+    if args.meals < 2 or args.battles < 1:
+        parser.error("meals must be at least 2 and battles at least 1")
+
+    quiet_logging()
+    modes = {mode: run_mode(mode, args.battles, args.meals, args.seed) for mode in args.modes}
+    save_results("battle_model", {'battles': args.battles, 'meals': args.meals, 'seed': args.seed, 'modes': modes},
+                 args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Shared helpers for the benchmark scripts: temp databases, timing and JSON results."""
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Any, Callable, Iterator, Optional
+
+from meal_max.models import kitchen_model
+from meal_max.models.leaderboard_model import leaderboard
+from meal_max.utils import sql_utils
+
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sql", "create_meal_table.sql")
+
+CUISINES = ("Italian", "French", "Mexican", "Thai", "Japanese", "Indian", "Greek", "Korean", "Spanish", "Ethiopian")
+DIFFICULTIES = ("HIGH", "MED", "LOW")
+
+
+def meal_rows(count: int, seed: int = 0) -> Iterator[tuple]:
+    """Generates (meal, cuisine, price, difficulty, battles, wins) rows with unique names.
+
+    About a third of the meals have no battles, so they stay off the leaderboard.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        battles = rng.choice((0, rng.randint(1, 200)))
+        yield (f"Meal {i}", rng.choice(CUISINES), round(rng.uniform(1, 50), 2), rng.choice(DIFFICULTIES),
+               battles, rng.randint(0, battles))
+
+
+def create_database(path: str, meals: int, seed: int = 0) -> None:
+    """Creates the meals table at `path` and fills it with `meals` generated meals."""
+    conn = sqlite3.connect(path)
+    try:
+        with open(SCHEMA_PATH) as fh:
+            conn.executescript(fh.read())
+        conn.executemany("INSERT INTO meals (meal, cuisine, price, difficulty, battles, wins) VALUES (?, ?, ?, ?, ?, ?)",
+                         meal_rows(meals, seed))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@contextmanager
+def temp_database(meals: int, seed: int = 0) -> Iterator[str]:
+    """Points the app at a fresh temp database of `meals` meals for the duration of the block.
+
+    Resets the connection pool, meal cache and leaderboard on the way in and out.
+
+    Yields:
+        str: The database path.
+    """
+    saved_path, saved_schema = sql_utils.DB_PATH, os.environ.get("SQL_CREATE_TABLE_PATH")
+    with tempfile.TemporaryDirectory(prefix="meal_max_bench_") as directory:
+        path = os.path.join(directory, "meal_max.db")
+        create_database(path, meals, seed)
+        _reset(path)
+        os.environ["SQL_CREATE_TABLE_PATH"] = SCHEMA_PATH
+        try:
+            yield path
+        finally:
+            _reset(saved_path)
+            if saved_schema is None:
+                os.environ.pop("SQL_CREATE_TABLE_PATH", None)
+            else:
+                os.environ["SQL_CREATE_TABLE_PATH"] = saved_schema
+
+
+def _reset(db_path: str) -> None:
+    sql_utils.close_connection_pool()
+    sql_utils.DB_PATH = db_path
+    if kitchen_model.meal_cache is not None:
+        kitchen_model.meal_cache.clear()
+    leaderboard.invalidate()
+
+
+def quiet_logging(level: int = logging.WARNING) -> None:
+    """Raises every meal_max logger to `level`, so benchmarks measure the code rather than log I/O."""
+    for name, logger in logging.root.manager.loggerDict.items():
+        if name.startswith("meal_max") and isinstance(logger, logging.Logger):
+            logger.setLevel(level)
+
+
+def summarize(durations: list[float]) -> dict[str, float]:
+    """Summarizes per-operation durations in seconds as ops/sec and latency percentiles in microseconds."""
+    ordered = sorted(durations)
+    total = sum(ordered)
+
+    def percentile(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1e6, 2)
+
+    return {
+        'ops': len(ordered),
+        'ops_per_sec': round(len(ordered) / total, 1) if total else None,
+        'mean_us': round(statistics.fmean(ordered) * 1e6, 2),
+        'p50_us': percentile(0.50),
+        'p95_us': percentile(0.95),
+        'p99_us': percentile(0.99),
+        'max_us': round(ordered[-1] * 1e6, 2),
+    }
+
+
+def measure(func: Callable[[int], Any], ops: int, warmup: int = 0) -> dict[str, float]:
+    """Times `ops` calls of `func(i)`, after `warmup` untimed calls.
+
+    Returns:
+        dict[str, float]: See `summarize`.
+    """
+    for i in range(warmup):
+        func(i)
+    durations = []
+    for i in range(ops):
+        start = time.perf_counter()
+        func(i)
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(benchmark: str, results: dict[str, Any], output: Optional[str]) -> dict[str, Any]:
+    """Adds run metadata to `results`, prints them as JSON and writes them to `output` if given.
+
+    Returns:
+        dict[str, Any]: The results with metadata.
+    """
+    document = {
+        'benchmark': benchmark,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sqlite': sqlite3.sqlite_version,
+        **results,
+    }
+    print(json.dumps(document, indent=2))
+    if output:
+        with open(output, "w") as f:
+            json.dump(document, f, indent=2)
+    return document
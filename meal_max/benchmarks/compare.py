@@ -0,0 +1,74 @@
+"""Compares two benchmark result files and flags regressions.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 10
+
+Every mean latency (`mean_us`) found at the same position in both files is
+compared. One that grew by more than --threshold percent is a regression,
+and the command exits with status 1 if there are any.
+"""
+import argparse
+import json
+import sys
+from typing import Any, Iterator, Optional
+
+
+def latencies(results: Any, path: tuple = ()) -> Iterator[tuple[str, float]]:
+    """Yields (dotted path, mean_us) for every summary in a results document."""
+    if isinstance(results, dict):
+        if isinstance(results.get('mean_us'), (int, float)):
+            yield ".".join(path), float(results['mean_us'])
+        for key, value in results.items():
+            yield from latencies(value, path + (str(key),))
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> list[dict[str, Any]]:
+    """Returns one row per operation present in both documents, with its change in percent.
+
+    Args:
+        baseline (dict[str, Any]): The reference run.
+        current (dict[str, Any]): The run to check.
+        threshold (float): Percent increase in mean latency that counts as a regression.
+
+    Returns:
+        list[dict[str, Any]]: The rows, each with `operation`, `baseline_us`, `current_us`,
+            `change_pct` and `regression`.
+    """
+    before = dict(latencies(baseline))
+    rows = []
+    for operation, current_us in latencies(current):
+        baseline_us = before.get(operation)
+        if baseline_us is None or baseline_us <= 0:
+            continue
+        change = (current_us - baseline_us) / baseline_us * 100
+        rows.append({
+            'operation': operation,
+            'baseline_us': baseline_us,
+            'current_us': current_us,
+            'change_pct': round(change, 1),
+            'regression': change > threshold,
+        })
+    return rows
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions between two JSON result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.threshold)
+    for row in rows:
+        flag = "REGRESSION" if row['regression'] else ""
+        print(f"{row['operation']:<60} {row['baseline_us']:>12.2f} {row['current_us']:>12.2f} "
+              f"{row['change_pct']:>+8.1f}% {flag}")
+    return 1 if any(row['regression'] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
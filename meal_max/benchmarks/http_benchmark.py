@@ -0,0 +1,191 @@
+"""HTTP load generator for the meal battle API.
+
+    python -m benchmarks.http_benchmark --meals 10000 --concurrency 8 --duration 10 \\
+        --mix battle=3,leaderboard=1,get_meal=2 --output http.json
+
+Without --url the Flask app is served in-process by werkzeug's threaded
+server on a temp database of --meals meals, drawing random numbers from the
+seeded provider so random.org is never called. The server then shares the
+GIL with the load generator, so use it to compare runs rather than as a
+capacity figure. With --url the load goes to a
+running instance, which must already have meals named "Meal 0" to "Meal N-1"
+(as `benchmarks.common.create_database` makes them).
+
+Each worker thread keeps one keep-alive session and picks a scenario per
+iteration, weighted by --mix:
+    battle       clear-combatants, prep-combatant twice, battle, in the worker's own arena
+    leaderboard  GET /api/leaderboard?limit=10
+    get_meal     GET /api/get-meal-by-id/<random id>
+"""
+import argparse
+from collections import defaultdict
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import requests
+
+from benchmarks.common import quiet_logging, save_results, summarize, temp_database
+from meal_max.utils import random_providers
+
+
+SCENARIOS = ("battle", "leaderboard", "get_meal")
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    """Parses a --mix string such as "battle=3,leaderboard=1" into scenario weights.
+
+    Raises:
+        ValueError: If a scenario is unknown or a weight is not a non-negative integer.
+    """
+    mix = {}
+    for entry in spec.split(","):
+        name, _, weight = entry.strip().partition("=")
+        if name not in SCENARIOS or not weight.isdigit():
+            raise ValueError(f"Invalid mix entry: {entry.strip()}. Expected one of {SCENARIOS} with a weight.")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise ValueError("The mix needs at least one scenario with a positive weight.")
+    return mix
+
+
+class LoadGenerator:
+    """Drives the API from `concurrency` threads for `duration` seconds and records every request."""
+
+    def __init__(self, base_url: str, meals: int, mix: dict[str, int], concurrency: int, duration: float,
+                 seed: int = 0):
+        self.base_url = base_url.rstrip("/")
+        self.meals = meals
+        self.mix = mix
+        self.concurrency = concurrency
+        self.duration = duration
+        self.seed = seed
+        self._durations: dict[str, list[float]] = defaultdict(list)
+        self._errors: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def run(self) -> dict[str, Any]:
+        """Runs the load and returns overall and per-endpoint results.
+
+        Returns:
+            dict[str, Any]: Requests per second, error counts and a latency summary per endpoint.
+        """
+        deadline = time.perf_counter() + self.duration
+        threads = [threading.Thread(target=self._worker, args=(i, deadline)) for i in range(self.concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        total = sum(len(durations) for durations in self._durations.values())
+        return {
+            'requests': total,
+            'elapsed_seconds': round(elapsed, 3),
+            'requests_per_sec': round(total / elapsed, 1),
+            'errors': dict(self._errors),
+            'endpoints': {name: summarize(durations) for name, durations in sorted(self._durations.items())},
+        }
+
+    def _worker(self, index: int, deadline: float) -> None:
+        rng = random.Random(self.seed + index)
+        session = requests.Session()
+        session.headers['X-Arena-Id'] = f"bench-{index}"
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        scenarios: dict[str, Callable[[requests.Session, random.Random], None]] = {
+            'battle': self._battle,
+            'leaderboard': self._leaderboard,
+            'get_meal': self._get_meal,
+        }
+        try:
+            while time.perf_counter() < deadline:
+                scenarios[rng.choices(names, weights)[0]](session, rng)
+        finally:
+            session.close()
+
+    def _request(self, session: requests.Session, endpoint: str, method: str, path: str, **kwargs) -> None:
+        start = time.perf_counter()
+        try:
+            response = session.request(method, self.base_url + path, timeout=30, **kwargs)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._durations[endpoint].append(elapsed)
+            if not ok:
+                self._errors[endpoint] += 1
+
+    def _battle(self, session: requests.Session, rng: random.Random) -> None:
+        first, second = rng.sample(range(self.meals), 2)
+        self._request(session, 'clear-combatants', 'POST', '/api/clear-combatants')
+        self._request(session, 'prep-combatant', 'POST', '/api/prep-combatant', json={'meal': f"Meal {first}"})
+        self._request(session, 'prep-combatant', 'POST', '/api/prep-combatant', json={'meal': f"Meal {second}"})
+        self._request(session, 'battle', 'GET', '/api/battle')
+
+    def _leaderboard(self, session: requests.Session, rng: random.Random) -> None:
+        self._request(session, 'leaderboard', 'GET', '/api/leaderboard', params={'limit': 10})
+
+    def _get_meal(self, session: requests.Session, rng: random.Random) -> None:
+        self._request(session, 'get-meal-by-id', 'GET', f'/api/get-meal-by-id/{rng.randint(1, self.meals)}')
+
+
+def run_in_process(meals: int, load: Callable[[str], dict[str, Any]], seed: int = 0) -> dict[str, Any]:
+    """Serves the app on a temp database from a background thread while `load(base_url)` runs."""
+    from werkzeug.serving import make_server
+
+    random_providers.RANDOM_PROVIDER = "seeded"
+    random_providers.RANDOM_SEED = seed
+    from app import app
+
+    # the load generator reports every request; per-request log lines would only slow the server
+    app.logger.setLevel(logging.WARNING)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    with temp_database(meals, seed):
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            return load(f"http://127.0.0.1:{server.server_port}")
+        finally:
+            server.shutdown()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Drive the meal battle API with a mix of requests.")
+    parser.add_argument("--url", help="base URL of a running instance; serves the app in-process if omitted")
+    parser.add_argument("--meals", type=int, default=10000, help="meals in the database")
+    parser.add_argument("--mix", default="battle=3,leaderboard=1,get_meal=2", help="scenario weights")
+    parser.add_argument("--concurrency", type=int, default=8, help="worker threads")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file as well as stdout")
+    args = parser.parse_args(argv)
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.meals < 2 or args.concurrency < 1 or args.duration <= 0:
+        parser.error("meals must be at least 2, concurrency at least 1 and duration positive")
+
+    def load(base_url: str) -> dict[str, Any]:
+        return LoadGenerator(base_url, args.meals, mix, args.concurrency, args.duration, args.seed).run()
+
+    quiet_logging()
+    results = load(args.url) if args.url else run_in_process(args.meals, load, args.seed)
+    save_results("http", {
+        'target': args.url or 'in-process',
+        'meals': args.meals,
+        'mix': mix,
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        **results,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Micro-benchmarks for every kitchen_model function against temp databases of several sizes.
+
+    python -m benchmarks.kitchen_benchmark --sizes 1000 100000 1000000 --ops 2000 --output kitchen.json
+
+Each size gets a fresh database of generated meals. Reads pick random ids and
+names, with the meal cache cleared before each cold read so both the cold
+(SQLite) and warm (cache) paths are reported. Writes that change the table
+run after the reads, and clear_meals runs last.
+"""
+import argparse
+import random
+from typing import Any, Optional
+
+from benchmarks.common import measure, quiet_logging, save_results, temp_database
+from meal_max.models import kitchen_model
+from meal_max.models.leaderboard_model import leaderboard
+
+
+def run_size(meals: int, ops: int, seed: int = 0) -> dict[str, Any]:
+    """Benchmarks each kitchen_model function on a database of `meals` meals.
+
+    Returns:
+        dict[str, Any]: The summary for each operation, keyed by name.
+    """
+    rng = random.Random(seed)
+    ids = [rng.randint(1, meals) for _ in range(ops)]
+    cache = kitchen_model.meal_cache
+    results = {}
+
+    with temp_database(meals, seed):
+        def cold(func):
+            def call(i):
+                if cache is not None:
+                    cache.clear()
+                func(i)
+            return call
+
+        results['get_meal_by_id.cold'] = measure(cold(lambda i: kitchen_model.get_meal_by_id(ids[i])), ops)
+        results['get_meal_by_id.cached'] = measure(lambda i: kitchen_model.get_meal_by_id(ids[0]), ops, warmup=1)
+        results['get_meal_by_name.cold'] = measure(
+            cold(lambda i: kitchen_model.get_meal_by_name(f"Meal {ids[i] - 1}")), ops)
+        batches = [rng.sample(range(1, meals + 1), min(100, meals)) for _ in range(max(1, ops // 10))]
+        results['get_meals_by_ids.100'] = measure(cold(lambda i: kitchen_model.get_meals_by_ids(batches[i])),
+                                                  len(batches))
+        results['get_meals_by_names.100'] = measure(
+            cold(lambda i: kitchen_model.get_meals_by_names([f"Meal {meal_id - 1}" for meal_id in batches[i]])),
+            len(batches))
+
+        for sort_by in ("wins", "win_pct"):
+            results[f'get_leaderboard.{sort_by}.top10'] = measure(
+                lambda i: kitchen_model.get_leaderboard(sort_by, limit=10), ops)
+            results[f'get_leaderboard.{sort_by}.cuisine_top10'] = measure(
+                lambda i: kitchen_model.get_leaderboard(sort_by, limit=10, cuisine="Thai"), max(1, ops // 10))
+        results['leaderboard.in_memory.top10'] = measure(lambda i: leaderboard.get_leaderboard("wins", limit=10),
+                                                         ops, warmup=1)
+
+        results['update_meal_stats'] = measure(
+            lambda i: kitchen_model.update_meal_stats(ids[i], 'win' if i % 2 else 'loss'), ops)
+        results['record_battle_result'] = measure(
+            lambda i: kitchen_model.record_battle_result(ids[i], ids[i] % meals + 1), ops)
+        pairs = [[(rng.randint(1, meals // 2), rng.randint(meals // 2 + 1, meals)) for _ in range(100)]
+                 for _ in range(max(1, ops // 10))]
+        results['record_battle_results.100'] = measure(lambda i: kitchen_model.record_battle_results(pairs[i]),
+                                                       len(pairs))
+
+        results['create_meal'] = measure(
+            lambda i: kitchen_model.create_meal(f"Bench meal {i}", "Thai", 10.0, "MED"), ops)
+        results['create_meals_bulk.1000'] = measure(
+            lambda i: kitchen_model.create_meals_bulk(
+                {'meal': f"Bulk meal {i}-{j}", 'cuisine': "Thai", 'price': 10.0, 'difficulty': "LOW"}
+                for j in range(1000)),
+            max(1, ops // 100))
+        deletable = rng.sample(range(1, meals + 1), min(ops, meals))
+        results['delete_meal'] = measure(lambda i: kitchen_model.delete_meal(deletable[i]), len(deletable))
+        results['clear_meals'] = measure(lambda i: kitchen_model.clear_meals(), 1)
+
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark kitchen_model functions against temp databases.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="meals in each database, e.g. 1000 to 1000000")
+    parser.add_argument("--ops", type=int, default=1000, help="timed calls per operation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file as well as stdout")
+    args = parser.parse_args(argv)
+    if min(args.sizes) < 2 or args.ops < 1:
+        parser.error("sizes must be at least 2 and ops at least 1")
+
+    quiet_logging()
+    sizes = {str(size): run_size(size, args.ops, args.seed) for size in args.sizes}
+    save_results("kitchen_model", {'ops': args.ops, 'seed': args.seed, 'sizes': sizes}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Measures what logging costs the battle path under each handler setup.
+
+Runs BattleModel battles with the database write stubbed out and a seeded
+random provider, so the only I/O is logging, written to os.devnull:
+
+    python -m benchmarks.logging_benchmark --battles 20000 --output logging.json
+
+Scenarios:
+    disabled      loggers above CRITICAL, the cost of the calls alone
+    sync          one shared stderr-style handler, as configure_logger sets up
+    duplicated_5  five handlers on each logger, as repeated configure_logger
+                  calls used to leave them
+    queue         the LOG_MODE=queue handler; the timed thread only enqueues
+    queue_warning queue mode with the battle path's loggers at WARNING
+"""
+import argparse
+import logging
+from logging.handlers import QueueListener
+import os
+import queue
+import time
+from typing import Any, Optional
+from unittest.mock import patch
+
+from benchmarks.common import save_results
+from meal_max.models import battle_model
+from meal_max.models.battle_model import BattleModel
+from meal_max.models.kitchen_model import Meal
+from meal_max.utils.logger import LOG_FORMAT, _DeferredQueueHandler
+from meal_max.utils.random_providers import SeededRandomProvider
+
+
+SCENARIOS = ("disabled", "sync", "duplicated_5", "queue", "queue_warning")
+
+MEAL_1 = Meal(id=1, meal='Spaghetti', price=12.5, cuisine='Italian', difficulty='MED')
+MEAL_2 = Meal(id=2, meal='Tacos', price=8.0, cuisine='Mexican', difficulty='LOW')
+
+
+class _CountingFilter(logging.Filter):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def filter(self, record):
+        self.count += 1
+        return True
+
+
+def _battle_loggers() -> list[logging.Logger]:
+    # module loggers only; a handler on a parent package as well would see each record twice
+    return [logger for name, logger in logging.root.manager.loggerDict.items()
+            if name.startswith('meal_max') and isinstance(logger, logging.Logger)]
+
+
+def _run_battles(battles: int) -> float:
+    model = BattleModel(SeededRandomProvider(seed=1))
+    start = time.perf_counter()
+    for _ in range(battles):
+        model.prep_combatant(MEAL_1)
+        model.prep_combatant(MEAL_2)
+        model.battle()
+        model.clear_combatants()
+    return time.perf_counter() - start
+
+
+def run_scenario(scenario: str, battles: int, devnull) -> dict[str, Any]:
+    """Runs `battles` battles with the scenario's handlers on every meal_max logger.
+
+    Returns:
+        dict[str, Any]: Mean microseconds per battle, and the records emitted per battle.
+    """
+    loggers = _battle_loggers()
+    saved = [(logger, logger.level, list(logger.handlers)) for logger in loggers]
+    listener: Optional[QueueListener] = None
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    stream = logging.StreamHandler(devnull)
+    stream.setFormatter(formatter)
+    counter = _CountingFilter()
+
+    if scenario == "disabled":
+        handlers, level = [stream], logging.CRITICAL + 1
+    elif scenario == "sync":
+        handlers, level = [stream], logging.DEBUG
+    elif scenario == "duplicated_5":
+        handlers, level = [stream], logging.DEBUG
+        for _ in range(4):
+            duplicate = logging.StreamHandler(devnull)
+            duplicate.setFormatter(formatter)
+            handlers.append(duplicate)
+    elif scenario in ("queue", "queue_warning"):
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, stream)
+        listener.start()
+        handlers = [_DeferredQueueHandler(log_queue)]
+        level = logging.WARNING if scenario == "queue_warning" else logging.DEBUG
+    else:
+        raise ValueError(f"Unknown scenario: {scenario}.")
+
+    handlers[0].addFilter(counter)
+    try:
+        for logger in loggers:
+            logger.handlers = list(handlers)
+            logger.setLevel(level)
+        with patch.object(battle_model, 'record_battle_result', lambda winner_id, loser_id: None):
+            elapsed = _run_battles(battles)
+        drain_start = time.perf_counter()
+        if listener is not None:
+            listener.stop()
+        drain = time.perf_counter() - drain_start
+    finally:
+        for logger, saved_level, saved_handlers in saved:
+            logger.handlers = saved_handlers
+            logger.setLevel(saved_level)
+
+    return {
+        'mean_us': round(elapsed / battles * 1e6, 3),
+        'records_per_battle': counter.count / battles,
+        'listener_drain_seconds': round(drain, 3) if listener is not None else None,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark logging cost on the battle path.")
+    parser.add_argument("--battles", type=int, default=20000, help="battles per scenario")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--output", help="write the results to this JSON file as well as stdout")
+    args = parser.parse_args(argv)
+
+    with open(os.devnull, "w") as devnull:
+        run_scenario("sync", 100, devnull)  # warm up
+        scenarios = {scenario: run_scenario(scenario, args.battles, devnull) for scenario in args.scenarios}
+
+    baseline = scenarios.get("disabled")
+    for result in scenarios.values():
+        if baseline and result['records_per_battle']:
+            extra = result['mean_us'] - baseline['mean_us']
+            result['us_per_record'] = round(extra / result['records_per_battle'], 3)
+
+    save_results("logging", {'battles': args.battles, 'scenarios': scenarios}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Construction time and memory of Meal objects, for caches and simulations holding millions of them.
+
+    python -m benchmarks.meal_benchmark --meals 1000000 --output meal.json
+
+Layouts:
+    dict_dataclass  the plain @dataclass Meal had before, with a per-instance __dict__
+    validated       Meal(...), slotted, validating price and difficulty
+    from_row        Meal.from_row(row), the trusted path for rows read from the database
+
+Every layout is built from the same row tuples, so the strings are shared and
+the memory figures cover the instances alone. `in_cache` adds the LRUCache
+entries kitchen_model keeps per meal (one by id, one by name).
+"""
+import argparse
+from dataclasses import dataclass
+import gc
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Optional
+
+from benchmarks.common import meal_rows, quiet_logging, save_results
+from meal_max.models.kitchen_model import Meal
+from meal_max.utils.cache_utils import LRUCache
+
+
+@dataclass
+class DictMeal:
+    """The previous Meal layout, kept here as the baseline."""
+
+    id: int
+    meal: str
+    cuisine: str
+    price: float
+    difficulty: str
+
+    def __post_init__(self):
+        if self.price < 0:
+            raise ValueError("Price must be a positive value.")
+        if self.difficulty not in ['LOW', 'MED', 'HIGH']:
+            raise ValueError("Difficulty must be 'LOW', 'MED', or 'HIGH'.")
+
+
+LAYOUTS: dict[str, Callable[[tuple], Any]] = {
+    'dict_dataclass': lambda row: DictMeal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4]),
+    'validated': lambda row: Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4]),
+    'from_row': Meal.from_row,
+}
+
+
+def _rows(meals: int, seed: int) -> list[tuple]:
+    return [(meal_id, name, cuisine, price, difficulty, False)
+            for meal_id, (name, cuisine, price, difficulty, _, _) in enumerate(meal_rows(meals, seed), start=1)]
+
+
+def run_layout(layout: str, rows: list[tuple], in_cache: bool = False) -> dict[str, Any]:
+    """Builds one meal per row with the given layout and reports time and memory per meal.
+
+    Returns:
+        dict[str, Any]: Mean construction time, the instance size and the traced bytes per meal.
+    """
+    build = LAYOUTS[layout]
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    meals = [build(row) for row in rows]
+    elapsed = time.perf_counter() - start
+    if in_cache:
+        cache = LRUCache(2 * len(rows))
+        for meal in meals:
+            cache.put(('id', meal.id), meal)
+            cache.put(('name', meal.meal), meal)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # tracemalloc slows allocation, so the time comes from a second, untraced pass; the
+    # collector is paused as timeit does, or its passes over a million live objects dominate
+    del meals
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        meals = [build(row) for row in rows]
+        elapsed = min(elapsed, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    instance = meals[0]
+    instance_bytes = sys.getsizeof(instance) + (sys.getsizeof(instance.__dict__) if hasattr(instance, '__dict__') else 0)
+    return {
+        'meals': len(rows),
+        'construct_ns': round(elapsed / len(rows) * 1e9, 1),
+        'instance_bytes': instance_bytes,
+        'traced_bytes_per_meal': round(traced / len(rows), 1),
+        'traced_mb': round(traced / 2 ** 20, 1),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Meal construction time and memory.")
+    parser.add_argument("--meals", type=int, default=1000000, help="meals built per layout")
+    parser.add_argument("--layouts", nargs="+", choices=list(LAYOUTS), default=list(LAYOUTS))
+    parser.add_argument("--in-cache", action="store_true", help="also hold every meal in an LRUCache")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file as well as stdout")
+    args = parser.parse_args(argv)
+    if args.meals < 1:
+        parser.error("meals must be at least 1")
+
+    quiet_logging()
+    rows = _rows(args.meals, args.seed)
+    layouts = {layout: run_layout(layout, rows, args.in_cache) for layout in args.layouts}
+    save_results("meal", {'meals': args.meals, 'in_cache': args.in_cache, 'seed': args.seed, 'layouts': layouts},
+                 args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,5 +13,9 @@ else
     echo "Skipping database creation."
 fi
 
-# Start the Python application
-exec python app.py
+# Start the application, under uvicorn if USE_ASGI is true
+if [ "$USE_ASGI" = "true" ]; then
+    exec uvicorn asgi:application --host 0.0.0.0 --port 5000
+else
+    exec python app.py
+fi
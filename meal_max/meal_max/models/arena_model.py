@@ -0,0 +1,274 @@
+from collections import OrderedDict
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Any, List, Optional
+
+from meal_max.models.battle_model import BattleModel
+from meal_max.models.kitchen_model import Meal
+from meal_max.utils.logger import configure_logger
+from meal_max.utils.random_providers import RandomProvider, get_random_provider
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# arenas unused for this many seconds are dropped, along with their combatants
+ARENA_IDLE_TIMEOUT = float(os.getenv("ARENA_IDLE_TIMEOUT", "1800"))
+# beyond this many arenas the least recently used one is dropped
+ARENA_MAX_ARENAS = int(os.getenv("ARENA_MAX_ARENAS", "10000"))
+ARENA_ID_MAX_LENGTH = 64
+
+
+class Arena:
+    """One client's BattleModel, with a lock so its operations run one at a time.
+
+    Attributes:
+        arena_id (str): The arena's key in the registry.
+        battle_model (BattleModel): The arena's combatants and battle logic.
+        last_used (float): time.monotonic() of the last operation.
+        version (int): Changes whenever the combatants do; unique across the registry.
+        modified (float): time.time() of the last change to the combatants.
+    """
+
+    def __init__(self, arena_id: str, random_provider: RandomProvider, version: int):
+        self.arena_id = arena_id
+        self.battle_model = BattleModel(random_provider)
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+        self.version = version
+        self.modified = time.time()
+
+
+class ArenaRegistry:
+    """Thread-safe registry of battle arenas keyed by arena id.
+
+    Each arena has its own combatants and its own lock, so battles in
+    different arenas run in parallel and only calls on the same arena
+    wait for each other. The registry lock is held just long enough to
+    find or create an arena.
+
+    Arenas are kept in least-recently-used order. Idle ones are evicted
+    when the registry is next touched, and the least recently used is
+    evicted whenever `max_arenas` would be exceeded.
+    """
+
+    def __init__(self, max_arenas: int = 10000, idle_timeout: Optional[float] = 1800.0,
+                 random_provider: Optional[RandomProvider] = None):
+        """Initializes the registry.
+
+        Args:
+            max_arenas (int): Most arenas held at once.
+            idle_timeout (Optional[float]): Seconds an unused arena is kept, or None to keep it until evicted by size.
+            random_provider (Optional[RandomProvider]): Shared by every arena's BattleModel.
+                Defaults to the provider configured by RANDOM_PROVIDER.
+
+        Raises:
+            ValueError: If `max_arenas` is less than 1.
+        """
+        if max_arenas < 1:
+            raise ValueError(f"Invalid arena limit: {max_arenas}. Must be at least 1.")
+        self.max_arenas = max_arenas
+        self.idle_timeout = idle_timeout
+        self.random_provider = random_provider or get_random_provider()
+        self._arenas: OrderedDict[str, Arena] = OrderedDict()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._evicted = 0
+        # shared by every arena, so an arena recreated after eviction never reuses an old version;
+        # 0 is left for arenas not held, which are all empty
+        self._versions = itertools.count(1)
+        # time.time() an arena was last dropped, when any arena not held last became empty
+        self._dropped = time.time()
+
+    def prep_combatant(self, arena_id: str, meal: Meal) -> List[Meal]:
+        """Adds a combatant to an arena, creating the arena if needed.
+
+        Args:
+            arena_id (str): The arena to prep in.
+            meal (Meal): The combatant.
+
+        Returns:
+            List[Meal]: The arena's combatants after the addition.
+
+        Raises:
+            ValueError: If the arena id is invalid or the arena already has two combatants.
+        """
+        arena = self._get(arena_id)
+        with arena.lock:
+            arena.battle_model.prep_combatant(meal)
+            self._touch(arena)
+            return list(arena.battle_model.get_combatants())
+
+    def battle(self, arena_id: str, random_number: Optional[float] = None) -> str:
+        """Runs a battle between an arena's two combatants.
+
+        Args:
+            arena_id (str): The arena to battle in.
+            random_number (Optional[float]): A number already drawn for this battle; drawn
+                from the random provider if None.
+
+        Returns:
+            str: The name of the winning meal.
+
+        Raises:
+            ValueError: If the arena id is invalid or fewer than two combatants are prepped.
+            sqlite3.Error: If recording the result fails.
+        """
+        arena = self._get(arena_id)
+        with arena.lock:
+            try:
+                return arena.battle_model.battle(random_number)
+            finally:
+                # the loser is removed even if recording the result then fails
+                self._touch(arena)
+
+    def get_combatants(self, arena_id: str) -> List[Meal]:
+        """Returns an arena's combatants.
+
+        Args:
+            arena_id (str): The arena.
+
+        Returns:
+            List[Meal]: A copy of the arena's combatants; empty for an arena not yet used.
+                Reading does not create the arena.
+
+        Raises:
+            ValueError: If the arena id is invalid.
+        """
+        arena = self._find(arena_id)
+        if arena is None:
+            return []
+        with arena.lock:
+            return list(arena.battle_model.get_combatants())
+
+    def clear_combatants(self, arena_id: str) -> None:
+        """Clears an arena's combatants.
+
+        Args:
+            arena_id (str): The arena.
+
+        Raises:
+            ValueError: If the arena id is invalid.
+        """
+        arena = self._get(arena_id)
+        with arena.lock:
+            arena.battle_model.clear_combatants()
+            self._touch(arena)
+
+    def get_version(self, arena_id: str) -> tuple[int, float]:
+        """Returns the version of an arena's combatants and when they last changed.
+
+        Args:
+            arena_id (str): The arena.
+
+        Returns:
+            tuple[int, float]: The version, which changes whenever the combatants do, and the
+                time.time() of that change. An arena not held is empty, with version 0, and was
+                last changed when an arena was last dropped; it is not created.
+
+        Raises:
+            ValueError: If the arena id is invalid.
+        """
+        arena = self._find(arena_id)
+        if arena is None:
+            with self._lock:
+                return 0, self._dropped
+        with arena.lock:
+            return arena.version, arena.modified
+
+    def remove(self, arena_id: str) -> None:
+        """Drops an arena and its combatants.
+
+        Args:
+            arena_id (str): The arena.
+        """
+        with self._lock:
+            if self._arenas.pop(arena_id, None) is not None:
+                self._dropped = time.time()
+
+    def evict_idle(self) -> int:
+        """Drops every arena unused for longer than the idle timeout.
+
+        Returns:
+            int: The number of arenas dropped.
+        """
+        with self._lock:
+            return self._evict_idle(time.monotonic())
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the registry's size and lifetime counters.
+
+        Returns:
+            dict[str, Any]: A snapshot of the registry's metrics.
+        """
+        with self._lock:
+            return {
+                'arenas': len(self._arenas),
+                'max_arenas': self.max_arenas,
+                'idle_timeout': self.idle_timeout,
+                'created': self._created,
+                'evicted': self._evicted,
+            }
+
+    @staticmethod
+    def _validate_id(arena_id: str) -> None:
+        if not isinstance(arena_id, str) or not 0 < len(arena_id) <= ARENA_ID_MAX_LENGTH:
+            raise ValueError(f"Invalid arena id. Must be 1 to {ARENA_ID_MAX_LENGTH} characters.")
+
+    def _find(self, arena_id: str) -> Optional[Arena]:
+        """Returns the arena if it is held, without creating it, so reads of unknown ids cannot evict real arenas."""
+        self._validate_id(arena_id)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            arena = self._arenas.get(arena_id)
+            if arena is not None:
+                self._arenas.move_to_end(arena_id)
+                arena.last_used = now
+            return arena
+
+    def _get(self, arena_id: str) -> Arena:
+        self._validate_id(arena_id)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            arena = self._arenas.get(arena_id)
+            if arena is None:
+                arena = Arena(arena_id, self.random_provider, next(self._versions))
+                self._arenas[arena_id] = arena
+                self._created += 1
+                while len(self._arenas) > self.max_arenas:
+                    evicted_id, _ = self._arenas.popitem(last=False)
+                    self._evicted += 1
+                    self._dropped = time.time()
+                    logger.info("Evicted least recently used arena %s", evicted_id)
+            else:
+                self._arenas.move_to_end(arena_id)
+            arena.last_used = now
+            return arena
+
+    def _touch(self, arena: Arena) -> None:
+        """Gives an arena a new version after its combatants change. Caller holds the arena's lock."""
+        arena.version = next(self._versions)
+        arena.modified = time.time()
+
+    def _evict_idle(self, now: float) -> int:
+        """Drops idle arenas from the least recently used end. Caller holds the lock."""
+        if self.idle_timeout is None:
+            return 0
+        evicted = 0
+        while self._arenas:
+            arena_id, arena = next(iter(self._arenas.items()))
+            if now - arena.last_used < self.idle_timeout:
+                break
+            del self._arenas[arena_id]
+            evicted += 1
+        if evicted:
+            self._evicted += evicted
+            self._dropped = time.time()
+            logger.info("Evicted %d idle arenas", evicted)
+        return evicted
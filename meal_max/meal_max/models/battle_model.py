@@ -1,15 +1,27 @@
 import logging
-from typing import List
+import time
+from typing import List, Optional, Sequence
 
-from meal_max.models.kitchen_model import Meal, update_meal_stats
+import numpy as np
+
+from meal_max.models.kitchen_model import Meal, record_battle_result
 from meal_max.utils.logger import configure_logger
-from meal_max.utils.random_utils import get_random
+from meal_max.utils.metrics import timed
+from meal_max.utils.random_providers import RandomProvider, get_random_provider
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+DIFFICULTY_MODIFIERS = {"HIGH": 1, "MED": 2, "LOW": 3}
+# difficulty codes for the batch API are indexes into this tuple
+DIFFICULTY_LEVELS = ("HIGH", "MED", "LOW")
+_MODIFIER_BY_CODE = np.array([DIFFICULTY_MODIFIERS[level] for level in DIFFICULTY_LEVELS], dtype=np.float64)
+# every random source serves two-decimal fractions, so a draw is one of these 100 values
+_RANDOM_GRID = np.arange(100) / 100
+
+
 class BattleModel:
     """Model representing a battle between meals.
 
@@ -17,20 +29,32 @@ class BattleModel:
     calculates battle scores, and updates the results of each battle.
     """
 
-    def __init__(self):
-        """Initializes the BattleModel instance with an empty combatants list."""
+    def __init__(self, random_provider: Optional[RandomProvider] = None):
+        """Initializes the BattleModel instance with an empty combatants list.
+
+        Args:
+            random_provider (Optional[RandomProvider]): Where battles draw their random
+                numbers from. Defaults to the provider configured by RANDOM_PROVIDER.
+        """
         self.combatants: List[Meal] = []
+        self.random_provider = random_provider or get_random_provider()
 
-    def battle(self) -> str:
+    @timed("battle_model.battle")
+    def battle(self, random_number: Optional[float] = None) -> str:
         """Initiates a battle between two combatants and determines a winner.
 
+        Args:
+            random_number (Optional[float]): A number already drawn for this battle, e.g. by an
+                async caller; drawn from the random provider if None.
+
         Returns:
             str: The name of the winning meal.
 
         Raises:
             ValueError: If there are fewer than two combatants prepped for battle.
         """
-        logger.info("Two meals enter, one meal leaves!")
+        start = time.perf_counter()
+        logger.info("Two meals enter, one meal leaves!", extra={'event': 'battle.start'})
 
         if len(self.combatants) < 2:
             logger.error("Not enough combatants to start a battle.")
@@ -39,19 +63,28 @@ class BattleModel:
         combatant_1 = self.combatants[0]
         combatant_2 = self.combatants[1]
 
-        logger.info("Battle started between %s and %s", combatant_1.meal, combatant_2.meal)
+        logger.info("Battle started between %s and %s", combatant_1.meal, combatant_2.meal,
+                    extra={'event': 'battle.combatants', 'meal_ids': [combatant_1.id, combatant_2.id]})
 
         score_1 = self.get_battle_score(combatant_1)
         score_2 = self.get_battle_score(combatant_2)
 
-        logger.info("Score for %s: %.3f", combatant_1.meal, score_1)
-        logger.info("Score for %s: %.3f", combatant_2.meal, score_2)
+        logger.info("Score for %s: %.3f", combatant_1.meal, score_1,
+                    extra={'event': 'battle.score', 'meal_id': combatant_1.id, 'score': score_1})
+        logger.info("Score for %s: %.3f", combatant_2.meal, score_2,
+                    extra={'event': 'battle.score', 'meal_id': combatant_2.id, 'score': score_2})
 
         delta = abs(score_1 - score_2) / 100
-        logger.info("Delta between scores: %.3f", delta)
+        logger.info("Delta between scores: %.3f", delta, extra={'event': 'battle.delta', 'delta': delta})
 
-        random_number = get_random()
-        logger.info("Random number from random.org: %.3f", random_number)
+        if random_number is None:
+            random_number = self.random_provider.get_random()
+            logger.info("Random number from %s: %.3f", self.random_provider.name, random_number,
+                        extra={'event': 'battle.random', 'random': random_number,
+                               'provider': self.random_provider.name})
+        else:
+            logger.info("Random number drawn by caller: %.3f", random_number,
+                        extra={'event': 'battle.random', 'random': random_number, 'provider': 'caller'})
 
         if delta > random_number:
             winner = combatant_1
@@ -60,13 +93,15 @@ class BattleModel:
             winner = combatant_2
             loser = combatant_1
 
-        logger.info("The winner is: %s", winner.meal)
-
-        update_meal_stats(winner.id, 'win')
-        update_meal_stats(loser.id, 'loss')
+        record_battle_result(winner.id, loser.id)
 
         self.combatants.remove(loser)
 
+        logger.info("The winner is: %s", winner.meal,
+                    extra={'event': 'battle.winner', 'winner_id': winner.id, 'loser_id': loser.id, 'delta': delta,
+                           'random': random_number,
+                           'latency_ms': round((time.perf_counter() - start) * 1000, 3)})
+
         return winner.meal
 
     def clear_combatants(self):
@@ -83,12 +118,13 @@ class BattleModel:
         Returns:
             float: The calculated score for the combatant.
         """
-        difficulty_modifier = {"HIGH": 1, "MED": 2, "LOW": 3}
         logger.info("Calculating battle score for %s: price=%.3f, cuisine=%s, difficulty=%s",
-                    combatant.meal, combatant.price, combatant.cuisine, combatant.difficulty)
+                    combatant.meal, combatant.price, combatant.cuisine, combatant.difficulty,
+                    extra={'event': 'battle.score_input', 'meal_id': combatant.id})
 
-        score = (combatant.price * len(combatant.cuisine)) - difficulty_modifier[combatant.difficulty]
-        logger.info("Battle score for %s: %.3f", combatant.meal, score)
+        score = (combatant.price * len(combatant.cuisine)) - DIFFICULTY_MODIFIERS[combatant.difficulty]
+        logger.info("Battle score for %s: %.3f", combatant.meal, score,
+                    extra={'event': 'battle.score', 'meal_id': combatant.id, 'score': score})
 
         return score
 
@@ -117,3 +153,105 @@ class BattleModel:
         logger.info("Adding combatant '%s' to combatants list", combatant_data.meal)
         self.combatants.append(combatant_data)
         logger.info("Current combatants list: %s", [combatant.meal for combatant in self.combatants])
+
+
+def encode_difficulties(difficulties: Sequence[str]) -> np.ndarray:
+    """Converts difficulty levels to the codes the batch scoring functions take.
+
+    Args:
+        difficulties (Sequence[str]): 'HIGH', 'MED' or 'LOW' for each combatant.
+
+    Returns:
+        np.ndarray: Integer codes, indexes into DIFFICULTY_LEVELS.
+
+    Raises:
+        ValueError: If any difficulty is not 'LOW', 'MED', or 'HIGH'.
+    """
+    try:
+        return np.array([DIFFICULTY_LEVELS.index(difficulty) for difficulty in difficulties], dtype=np.intp)
+    except ValueError:
+        raise ValueError("Difficulty must be 'LOW', 'MED', or 'HIGH'.")
+
+
+def meals_to_arrays(meals: Sequence[Meal]) -> tuple:
+    """Unpacks meals into the price, cuisine length and difficulty code arrays `get_battle_scores` takes.
+
+    Args:
+        meals (Sequence[Meal]): The combatants.
+
+    Returns:
+        tuple: (prices, cuisine_lengths, difficulty_codes) arrays.
+    """
+    prices = np.array([meal.price for meal in meals], dtype=np.float64)
+    cuisine_lengths = np.array([len(meal.cuisine) for meal in meals], dtype=np.float64)
+    return prices, cuisine_lengths, encode_difficulties([meal.difficulty for meal in meals])
+
+
+def get_battle_scores(prices, cuisine_lengths, difficulty_codes) -> np.ndarray:
+    """Calculates many battle scores in one pass.
+
+    Gives exactly the same values as `BattleModel.get_battle_score`:
+    (price * len(cuisine)) - modifier, in float64.
+
+    Args:
+        prices (array-like): Meal prices.
+        cuisine_lengths (array-like): len(cuisine) for each meal.
+        difficulty_codes (array-like): Indexes into DIFFICULTY_LEVELS (see `encode_difficulties`).
+
+    Returns:
+        np.ndarray: The scores.
+
+    Raises:
+        ValueError: If the arrays differ in shape or a difficulty code is out of range.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    cuisine_lengths = np.asarray(cuisine_lengths, dtype=np.float64)
+    difficulty_codes = np.asarray(difficulty_codes, dtype=np.intp)
+    if not prices.shape == cuisine_lengths.shape == difficulty_codes.shape:
+        raise ValueError("prices, cuisine_lengths and difficulty_codes must have the same shape.")
+    if difficulty_codes.size and (difficulty_codes.min() < 0 or difficulty_codes.max() >= len(DIFFICULTY_LEVELS)):
+        raise ValueError(f"Difficulty codes must be between 0 and {len(DIFFICULTY_LEVELS) - 1}.")
+    return prices * cuisine_lengths - _MODIFIER_BY_CODE[difficulty_codes]
+
+
+def get_win_probabilities(scores_1, scores_2) -> np.ndarray:
+    """Returns the chance the first combatant of each pair wins.
+
+    A battle goes to combatant 1 when delta / 100 exceeds the random draw,
+    and draws are uniform over 0.00, 0.01, ..., 0.99, so the probability is
+    the share of those 100 values below the delta.
+
+    Args:
+        scores_1 (array-like): Scores of the first combatants.
+        scores_2 (array-like): Scores of the second combatants.
+
+    Returns:
+        np.ndarray: Win probabilities for the first combatants, between 0 and 1.
+    """
+    deltas = np.abs(np.asarray(scores_1, dtype=np.float64) - np.asarray(scores_2, dtype=np.float64)) / 100
+    return np.searchsorted(_RANDOM_GRID, deltas, side='left') / len(_RANDOM_GRID)
+
+
+def decide_battles(scores_1, scores_2, randoms) -> np.ndarray:
+    """Decides many battles at once from pre-drawn random numbers.
+
+    Applies the `BattleModel.battle` rule to each pair: combatant 1 wins
+    when abs(score_1 - score_2) / 100 > random.
+
+    Args:
+        scores_1 (array-like): Scores of the first combatants.
+        scores_2 (array-like): Scores of the second combatants.
+        randoms (array-like): One random number between 0 and 1 per battle.
+
+    Returns:
+        np.ndarray: Boolean array, True where the first combatant wins.
+
+    Raises:
+        ValueError: If the arrays differ in shape.
+    """
+    scores_1 = np.asarray(scores_1, dtype=np.float64)
+    scores_2 = np.asarray(scores_2, dtype=np.float64)
+    randoms = np.asarray(randoms, dtype=np.float64)
+    if not scores_1.shape == scores_2.shape == randoms.shape:
+        raise ValueError("scores_1, scores_2 and randoms must have the same shape.")
+    return np.abs(scores_1 - scores_2) / 100 > randoms
@@ -2,20 +2,50 @@ from dataclasses import dataclass
 import logging
 import os
 import sqlite3
-from typing import Any
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
 
+from meal_max.models.leaderboard_model import decode_cursor, encode_cursor, leaderboard
+from meal_max.utils.cache_utils import LRUCache
 from meal_max.utils.sql_utils import get_db_connection
 from meal_max.utils.logger import configure_logger
+from meal_max.utils.metrics import timed
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
-@dataclass
+# read-through cache of Meal objects keyed by ('id', meal_id) and ('name', meal_name); size 0 disables it.
+# The cache is per process, so MEAL_CACHE_TTL bounds how long another worker's delete can go unseen.
+MEAL_CACHE_SIZE = int(os.getenv("MEAL_CACHE_SIZE", "1024"))
+MEAL_CACHE_TTL = float(os.getenv("MEAL_CACHE_TTL", "300"))
+# with "false", Meal instances can be modified after construction
+MEAL_FROZEN = os.getenv("MEAL_FROZEN", "true").lower() == "true"
+# most ids or names one /api/get-meals request may ask for
+MEAL_LOOKUP_MAX = int(os.getenv("MEAL_LOOKUP_MAX", "1000"))
+# rows fetched per round trip when streaming exports
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+# columns of a meals export, in order; a CSV export can be fed back to /api/create-meals
+MEAL_EXPORT_FIELDS = ('id', 'meal', 'cuisine', 'price', 'difficulty', 'battles', 'wins')
+# columns of a leaderboard export, in order
+LEADERBOARD_EXPORT_FIELDS = ('id', 'meal', 'cuisine', 'price', 'difficulty', 'battles', 'wins', 'win_pct')
+
+meal_cache: Optional[LRUCache] = LRUCache(MEAL_CACHE_SIZE, MEAL_CACHE_TTL) if MEAL_CACHE_SIZE > 0 else None
+
+
+DIFFICULTIES = frozenset(('LOW', 'MED', 'HIGH'))
+
+
+@dataclass(frozen=MEAL_FROZEN)
 class Meal:
     """Represents a meal with specific attributes.
 
+    Meals are slotted, so they carry no per-instance `__dict__`, and frozen
+    unless MEAL_FROZEN is false, since cached meals are shared between callers.
+
     Attributes:
         id (int): The unique identifier for the meal.
         meal (str): The name of the meal.
@@ -24,6 +54,8 @@ class Meal:
         difficulty (str): The preparation difficulty level of the meal, must be 'LOW', 'MED', or 'HIGH'.
     """
 
+    __slots__ = ('id', 'meal', 'cuisine', 'price', 'difficulty')
+
     id: int
     meal: str
     cuisine: str
@@ -38,10 +70,114 @@ class Meal:
         """
         if self.price < 0:
             raise ValueError("Price must be a positive value.")
-        if self.difficulty not in ['LOW', 'MED', 'HIGH']:
+        if self.difficulty not in DIFFICULTIES:
             raise ValueError("Difficulty must be 'LOW', 'MED', or 'HIGH'.")
 
+    @classmethod
+    def from_row(cls, row: tuple) -> 'Meal':
+        """Builds a meal from a meals table row without validating it again.
+
+        Only for rows read from the database, which were validated when they
+        were inserted; anything else should go through the constructor.
+
+        Args:
+            row (tuple): A row starting with id, meal, cuisine, price and difficulty.
+
+        Returns:
+            Meal: The meal.
+        """
+        meal = _new_meal(cls)
+        _set_id(meal, row[0])
+        _set_meal(meal, row[1])
+        _set_cuisine(meal, row[2])
+        _set_price(meal, row[3])
+        _set_difficulty(meal, row[4])
+        return meal
+
+    def __reduce__(self):
+        # the default slot-by-slot unpickling would trip over the frozen __setattr__
+        return (type(self), (self.id, self.meal, self.cuisine, self.price, self.difficulty))
+
+
+# the slot descriptors write straight to the instance, bypassing __init__ and the frozen __setattr__
+_new_meal = object.__new__
+_set_id = Meal.id.__set__
+_set_meal = Meal.meal.__set__
+_set_cuisine = Meal.cuisine.__set__
+_set_price = Meal.price.__set__
+_set_difficulty = Meal.difficulty.__set__
+
+
+# bumped after every committed write, so readers can tell whether anything changed since they last looked.
+# Writers bump it last, once the meal cache and leaderboard reflect the write: a reader that sees the new
+# version must never be served the old data under it. Like the meal cache it is per process.
+_data_version = 0
+_data_modified = time.time()
+_data_version_lock = threading.Lock()
+
+
+def get_data_version() -> tuple[int, float]:
+    """Returns the current data version and when it last changed.
+
+    The version goes up after every committed change to the meals table made
+    by this process: meals created, deleted or cleared, and battle stats updated.
+    Reading it does not touch the database.
+
+    Returns:
+        tuple[int, float]: The version, and the time.time() of the write that set it
+            (or of the module's import, before any write).
+    """
+    with _data_version_lock:
+        return _data_version, _data_modified
+
+
+def _bump_data_version(invalidate: Callable[[], None] = lambda: None) -> None:
+    """Bumps the data version, dropping the write's stale cache entries with `invalidate` in the same step.
+
+    `_cache_meal` checks the version under the same lock, so a meal read before
+    the write is either dropped by `invalidate` or never cached at all.
+    """
+    global _data_version, _data_modified
+    with _data_version_lock:
+        if meal_cache is not None:
+            invalidate()
+        _data_version += 1
+        _data_modified = time.time()
+
+
+def _cache_meal(meal: Meal, version: int) -> None:
+    """Stores a meal in the cache under both its id and its name, unless the data changed since `version`.
+
+    Args:
+        meal (Meal): The meal, as read from the database.
+        version (int): The data version from before the meal was read.
+    """
+    if meal_cache is None:
+        return
+    with _data_version_lock:
+        # a write committed since the read may already have invalidated this meal
+        if _data_version != version:
+            return
+        meal_cache.put(('id', meal.id), meal)
+        meal_cache.put(('name', meal.meal), meal)
+
+
+def _invalidate_meal(meal_id: Optional[int] = None, meal_name: Optional[str] = None) -> None:
+    """Drops every cached entry for the meal with the given id or name."""
+    if meal_cache is not None:
+        meal_cache.invalidate_where(lambda cached: cached.id == meal_id or cached.meal == meal_name)
 
+
+def get_meal_cache_stats() -> Optional[dict[str, Any]]:
+    """Returns the meal cache's hit/miss/eviction counters, or None if caching is disabled.
+
+    Returns:
+        Optional[dict[str, Any]]: See `LRUCache.stats`.
+    """
+    return meal_cache.stats() if meal_cache is not None else None
+
+
+@timed("kitchen_model.create_meal")
 def create_meal(meal: str, cuisine: str, price: float, difficulty: str) -> None:
     """Adds a new meal to the database.
 
@@ -69,6 +205,7 @@ def create_meal(meal: str, cuisine: str, price: float, difficulty: str) -> None:
                 VALUES (?, ?, ?, ?)
             """, (meal, cuisine, price, difficulty))
             conn.commit()
+            _bump_data_version(lambda: meal_cache.invalidate(('name', meal)))
             logger.info("Meal successfully added to the database: %s", meal)
 
     except sqlite3.IntegrityError:
@@ -80,6 +217,154 @@ def create_meal(meal: str, cuisine: str, price: float, difficulty: str) -> None:
         raise e
 
 
+# keeps `IN (...)` lookups under SQLite's default limit of 999 bound parameters
+BULK_CHUNK_SIZE = 500
+
+
+def _validate_bulk_row(row: Any) -> tuple[str, str, float, str]:
+    """Validates and normalizes one row of a bulk import.
+
+    Applies the same rules as the single-meal endpoint, including at most two decimal places for price.
+
+    Args:
+        row (Any): A mapping with meal, cuisine, price and difficulty.
+
+    Returns:
+        tuple[str, str, float, str]: The (meal, cuisine, price, difficulty) values to insert.
+
+    Raises:
+        ValueError: If the row is malformed or any field is invalid.
+    """
+    if not isinstance(row, Mapping):
+        raise ValueError("Row must be an object with meal, cuisine, price and difficulty")
+
+    meal = row.get('meal')
+    cuisine = row.get('cuisine')
+    price = row.get('price')
+    difficulty = row.get('difficulty')
+
+    if not meal or not isinstance(meal, str):
+        raise ValueError("Meal name is required")
+    if not cuisine or not isinstance(cuisine, str):
+        raise ValueError("Cuisine is required")
+    if isinstance(price, bool):
+        raise ValueError(f"Invalid price: {price}. Price must be a positive number.")
+    try:
+        price = float(price)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid price: {price}. Price must be a positive number.")
+    if price <= 0:
+        raise ValueError(f"Invalid price: {price}. Price must be a positive number.")
+    if round(price, 2) != price:
+        raise ValueError(f"Invalid price: {price}. Price must have at most two decimal places.")
+    if difficulty not in ['LOW', 'MED', 'HIGH']:
+        raise ValueError(f"Invalid difficulty level: {difficulty}. Must be 'LOW', 'MED', or 'HIGH'.")
+
+    return meal, cuisine, price, difficulty
+
+
+@timed("kitchen_model.create_meals_bulk")
+def create_meals_bulk(meals: Iterable[Any], chunk_size: int = BULK_CHUNK_SIZE) -> list[dict[str, Any]]:
+    """Adds many meals to the database over a single connection.
+
+    Rows are validated up front, then inserted with `executemany` in chunks of
+    `chunk_size`, each chunk committed as one transaction. `meals` is consumed
+    lazily, so a streamed upload never has to be held in memory.
+
+    Args:
+        meals (Iterable[Any]): Mappings with meal, cuisine, price and difficulty.
+        chunk_size (int): How many rows to insert per transaction.
+
+    Returns:
+        list[dict[str, Any]]: One result per input row, in order, with its `index`,
+            `meal` name and a `status` of 'inserted', 'duplicate' or 'invalid'
+            (invalid rows also carry an `error`).
+
+    Raises:
+        ValueError: If `chunk_size` is not positive.
+        sqlite3.Error: For any database errors.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Invalid chunk size: {chunk_size}. Must be at least 1.")
+
+    results: list[dict[str, Any]] = []
+    seen: set[str] = set()
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            chunk: list[tuple[int, tuple[str, str, float, str]]] = []
+
+            for index, row in enumerate(meals):
+                name = row.get('meal') if isinstance(row, Mapping) else None
+                try:
+                    values = _validate_bulk_row(row)
+                except ValueError as e:
+                    results.append({'index': index, 'meal': name, 'status': 'invalid', 'error': str(e)})
+                    continue
+
+                # a name repeated within the upload is a duplicate of its first occurrence
+                if values[0] in seen:
+                    results.append({'index': index, 'meal': name, 'status': 'duplicate'})
+                    continue
+                seen.add(values[0])
+
+                result = {'index': index, 'meal': name, 'status': 'inserted'}
+                results.append(result)
+                chunk.append((len(results) - 1, values))
+                if len(chunk) >= chunk_size:
+                    _insert_bulk_chunk(conn, cursor, chunk, results)
+                    chunk = []
+
+            if chunk:
+                _insert_bulk_chunk(conn, cursor, chunk, results)
+
+        inserted = sum(1 for result in results if result['status'] == 'inserted')
+        logger.info("Bulk import processed %d rows, %d inserted", len(results), inserted)
+        return results
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+
+def _insert_bulk_chunk(conn: sqlite3.Connection, cursor: sqlite3.Cursor,
+                       chunk: list[tuple[int, tuple[str, str, float, str]]],
+                       results: list[dict[str, Any]]) -> None:
+    """Inserts one chunk of validated rows and commits it, marking existing names as duplicates."""
+    names = [values[0] for _, values in chunk]
+    placeholders = ", ".join("?" for _ in names)
+    cursor.execute(f"SELECT meal FROM meals WHERE meal IN ({placeholders})", names)
+    existing = {row[0] for row in cursor.fetchall()}
+
+    rows = []
+    for result_index, values in chunk:
+        if values[0] in existing:
+            results[result_index]['status'] = 'duplicate'
+        else:
+            rows.append((result_index, values))
+
+    insert_sql = """
+        INSERT INTO meals (meal, cuisine, price, difficulty)
+        VALUES (?, ?, ?, ?)
+    """
+    try:
+        cursor.executemany(insert_sql, [values for _, values in rows])
+        conn.commit()
+        _bump_data_version()
+    except sqlite3.IntegrityError:
+        # another writer inserted one of these names since the lookup; fall back to row by row
+        conn.rollback()
+        for result_index, values in rows:
+            try:
+                cursor.execute(insert_sql, values)
+            except sqlite3.IntegrityError:
+                results[result_index]['status'] = 'duplicate'
+        conn.commit()
+        _bump_data_version()
+
+
+@timed("kitchen_model.clear_meals")
 def clear_meals() -> None:
     """Recreates the meals table, effectively deleting all meals.
 
@@ -93,13 +378,16 @@ def clear_meals() -> None:
             cursor = conn.cursor()
             cursor.executescript(create_table_script)
             conn.commit()
-            logger.info("Meals cleared successfully.")
+        leaderboard.invalidate()
+        _bump_data_version(meal_cache.clear if meal_cache is not None else lambda: None)
+        logger.info("Meals cleared successfully.")
 
     except sqlite3.Error as e:
         logger.error("Database error while clearing meals: %s", str(e))
         raise e
 
 
+@timed("kitchen_model.delete_meal")
 def delete_meal(meal_id: int) -> None:
     """Marks a meal as deleted in the database.
 
@@ -125,67 +413,217 @@ def delete_meal(meal_id: int) -> None:
 
             cursor.execute("UPDATE meals SET deleted = TRUE WHERE id = ?", (meal_id,))
             conn.commit()
-            logger.info("Meal with ID %s marked as deleted.", meal_id)
+        # the leaderboard reloads under its lock while holding a pooled connection, so it is only
+        # updated once this connection is back in the pool
+        leaderboard.remove(meal_id)
+        _bump_data_version(lambda: _invalidate_meal(meal_id=meal_id))
+        logger.info("Meal with ID %s marked as deleted.", meal_id)
 
     except sqlite3.Error as e:
         logger.error("Database error: %s", str(e))
         raise e
 
 
-def get_leaderboard(sort_by: str = "wins") -> list[dict[str, Any]]:
+@timed("kitchen_model.get_leaderboard")
+def get_leaderboard(sort_by: str = "wins", limit: Optional[int] = None, offset: int = 0,
+                    cursor: Optional[str] = None, cuisine: Optional[str] = None,
+                    difficulty: Optional[str] = None) -> list[dict[str, Any]]:
     """Retrieves the leaderboard of meals based on battle performance.
 
+    Ties are broken by id. Pages can be fetched with `limit`/`offset`, or with
+    `cursor` for keyset pagination, which costs the same however deep the page
+    is. The partial leaderboard indexes let SQLite read the top rows in order
+    and stop after `limit`, so the top 10 costs the same at any table size.
+
     Args:
         sort_by (str): Sorting criterion for leaderboard, either 'wins' or 'win_pct'.
+        limit (Optional[int]): Maximum number of meals to return; all of them if None.
+        offset (int): Number of meals to skip before the first one returned.
+        cursor (Optional[str]): Return only meals ranked after the meal this cursor was made from
+            (see `leaderboard_model.encode_cursor`).
+        cuisine (Optional[str]): Only include meals of this cuisine.
+        difficulty (Optional[str]): Only include meals of this difficulty.
 
     Returns:
         list[dict[str, Any]]: A sorted list of meals with battle statistics.
 
     Raises:
-        ValueError: If `sort_by` is not 'wins' or 'win_pct'.
+        ValueError: If `sort_by`, `limit`, `offset` or `cursor` is invalid.
         sqlite3.Error: For any database errors.
     """
-    query = """
-        SELECT id, meal, cuisine, price, difficulty, battles, wins, (wins * 1.0 / battles) AS win_pct
-        FROM meals WHERE deleted = false AND battles > 0
-    """
+    query, params = _leaderboard_query(sort_by, limit, offset, cursor, cuisine, difficulty)
+
+    try:
+        with get_db_connection() as conn:
+            db_cursor = conn.cursor()
+            db_cursor.execute(query, params)
+            rows = db_cursor.fetchall()
+
+        entries = [_leaderboard_entry(row) for row in rows]
+
+        logger.info("Leaderboard retrieved successfully")
+        return entries
 
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+
+def _leaderboard_query(sort_by: str, limit: Optional[int] = None, offset: int = 0, cursor: Optional[str] = None,
+                       cuisine: Optional[str] = None, difficulty: Optional[str] = None) -> tuple[str, list[Any]]:
+    """Builds the leaderboard query and its parameters; see `get_leaderboard` for the arguments.
+
+    Raises:
+        ValueError: If `sort_by`, `limit`, `offset` or `cursor` is invalid.
+    """
     if sort_by == "win_pct":
-        query += " ORDER BY win_pct DESC"
+        score = "(wins * 1.0 / battles)"
     elif sort_by == "wins":
-        query += " ORDER BY wins DESC"
+        score = "wins"
     else:
         logger.error("Invalid sort_by parameter: %s", sort_by)
         raise ValueError("Invalid sort_by parameter: %s" % sort_by)
+    if limit is not None and limit < 0:
+        raise ValueError(f"Invalid limit: {limit}. Must be a non-negative integer.")
+    if offset < 0:
+        raise ValueError(f"Invalid offset: {offset}. Must be a non-negative integer.")
 
+    # the WHERE terms must match the partial indexes' exactly for SQLite to use them
+    query = """
+        SELECT id, meal, cuisine, price, difficulty, battles, wins, (wins * 1.0 / battles) AS win_pct
+        FROM meals WHERE deleted = FALSE AND battles > 0
+    """
+    params: list[Any] = []
+    if cuisine is not None:
+        query += " AND cuisine = ?"
+        params.append(cuisine)
+    if difficulty is not None:
+        query += " AND difficulty = ?"
+        params.append(difficulty)
+    if cursor is not None:
+        after_score, after_id = decode_cursor(cursor)
+        query += f" AND ({score} < ? OR ({score} = ? AND id > ?))"
+        params.extend([after_score, after_score, after_id])
+
+    query += f" ORDER BY {score} DESC, id ASC"
+    if limit is not None or offset:
+        query += " LIMIT ? OFFSET ?"
+        params.extend([limit if limit is not None else -1, offset])
+    return query, params
+
+
+def _leaderboard_entry(row: tuple) -> dict[str, Any]:
+    return {
+        'id': row[0],
+        'meal': row[1],
+        'cuisine': row[2],
+        'price': row[3],
+        'difficulty': row[4],
+        'battles': row[5],
+        'wins': row[6],
+        'win_pct': round(row[7] * 100, 1)  # Convert to percentage
+    }
+
+
+def _meal_entry(row: tuple) -> dict[str, Any]:
+    return dict(zip(MEAL_EXPORT_FIELDS, row))
+
+
+def _export_batch_size(batch_size: Optional[int]) -> int:
+    if batch_size is None:
+        return EXPORT_BATCH_SIZE
+    if batch_size < 1:
+        raise ValueError(f"Invalid batch_size: {batch_size}. Must be a positive integer.")
+    return batch_size
+
+
+def _iter_rows(page_query: Callable[[Optional[dict[str, Any]]], tuple[str, list[Any]]],
+               convert: Callable[[tuple], dict[str, Any]], batch_size: int) -> Iterator[dict[str, Any]]:
+    """Yields the converted rows of a keyset-paginated query, `batch_size` rows at a time.
+
+    `page_query(last)` returns the query and parameters for the `batch_size`
+    rows after the entry `last`, or the first rows if it is None. Each batch
+    checks a connection out of the pool and back in, so a slow reader holds
+    neither a pooled connection nor a read snapshot (which would keep the WAL
+    from checkpointing) between batches. A row changed between batches
+    appears at most once, at its position when its batch was read.
+    """
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-
-        leaderboard = []
-        for row in rows:
-            meal = {
-                'id': row[0],
-                'meal': row[1],
-                'cuisine': row[2],
-                'price': row[3],
-                'difficulty': row[4],
-                'battles': row[5],
-                'wins': row[6],
-                'win_pct': round(row[7] * 100, 1)  # Convert to percentage
-            }
-            leaderboard.append(meal)
-
-        logger.info("Leaderboard retrieved successfully")
-        return leaderboard
+        last = None
+        count = 0
+        while True:
+            query, params = page_query(last)
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+            entries = [convert(row) for row in rows]
+            count += len(entries)
+            yield from entries
+            if len(rows) < batch_size:
+                break
+            last = entries[-1]
+        logger.info("Streamed %d rows", count)
 
     except sqlite3.Error as e:
         logger.error("Database error: %s", str(e))
         raise e
 
 
+def iter_meals(batch_size: Optional[int] = None) -> Iterator[dict[str, Any]]:
+    """Iterates over every active meal in id order without loading the table into memory.
+
+    Args:
+        batch_size (Optional[int]): Rows fetched per round trip; EXPORT_BATCH_SIZE if None.
+
+    Returns:
+        Iterator[dict[str, Any]]: One dict per meal, with the MEAL_EXPORT_FIELDS keys.
+            Each batch is read on demand, resuming after the last id, with its own
+            short-lived connection.
+
+    Raises:
+        ValueError: If `batch_size` is not positive.
+        sqlite3.Error: For any database errors.
+    """
+    batch_size = _export_batch_size(batch_size)
+    query = f"SELECT {', '.join(MEAL_EXPORT_FIELDS)} FROM meals WHERE deleted = FALSE AND id > ? ORDER BY id LIMIT ?"
+    return _iter_rows(lambda last: (query, [last['id'] if last else 0, batch_size]), _meal_entry, batch_size)
+
+
+def iter_leaderboard(sort_by: str = "wins", cuisine: Optional[str] = None, difficulty: Optional[str] = None,
+                     batch_size: Optional[int] = None) -> Iterator[dict[str, Any]]:
+    """Iterates over the whole leaderboard without loading it into memory.
+
+    The rows and their order are those of `get_leaderboard` with no limit.
+    Each batch is a `get_leaderboard` page resuming from the previous one's
+    cursor, read from the leaderboard indexes already sorted.
+
+    Args:
+        sort_by (str): Sorting criterion for leaderboard, either 'wins' or 'win_pct'.
+        cuisine (Optional[str]): Only include meals of this cuisine.
+        difficulty (Optional[str]): Only include meals of this difficulty.
+        batch_size (Optional[int]): Rows fetched per round trip; EXPORT_BATCH_SIZE if None.
+
+    Returns:
+        Iterator[dict[str, Any]]: One leaderboard entry per meal. Each batch is read on demand
+            with its own short-lived connection.
+
+    Raises:
+        ValueError: If `sort_by` or `batch_size` is invalid.
+        sqlite3.Error: For any database errors.
+    """
+    batch_size = _export_batch_size(batch_size)
+    # checks sort_by now rather than on the first next()
+    _leaderboard_query(sort_by)
+
+    def page_query(last: Optional[dict[str, Any]]) -> tuple[str, list[Any]]:
+        return _leaderboard_query(sort_by, limit=batch_size, cursor=encode_cursor(last, sort_by) if last else None,
+                                  cuisine=cuisine, difficulty=difficulty)
+
+    return _iter_rows(page_query, _leaderboard_entry, batch_size)
+
+
+@timed("kitchen_model.get_meal_by_id")
 def get_meal_by_id(meal_id: int) -> Meal:
     """Retrieves a meal by its ID.
 
@@ -193,12 +631,18 @@ def get_meal_by_id(meal_id: int) -> Meal:
         meal_id (int): The unique identifier of the meal.
 
     Returns:
-        Meal: The meal with the specified ID.
+        Meal: The meal with the specified ID. Repeat lookups are served from the meal cache.
 
     Raises:
         ValueError: If the meal is not found or has been deleted.
         sqlite3.Error: For any database errors.
     """
+    if meal_cache is not None:
+        cached = meal_cache.get(('id', meal_id))
+        if cached is not None:
+            return cached
+
+    version, _ = get_data_version()
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
@@ -209,7 +653,9 @@ def get_meal_by_id(meal_id: int) -> Meal:
                 if row[5]:
                     logger.info("Meal with ID %s has been deleted", meal_id)
                     raise ValueError(f"Meal with ID {meal_id} has been deleted")
-                return Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4])
+                meal = Meal.from_row(row)
+                _cache_meal(meal, version)
+                return meal
             else:
                 logger.info("Meal with ID %s not found", meal_id)
                 raise ValueError(f"Meal with ID {meal_id} not found")
@@ -219,6 +665,7 @@ def get_meal_by_id(meal_id: int) -> Meal:
         raise e
 
 
+@timed("kitchen_model.get_meal_by_name")
 def get_meal_by_name(meal_name: str) -> Meal:
     """Retrieves a meal by its name.
 
@@ -226,12 +673,18 @@ def get_meal_by_name(meal_name: str) -> Meal:
         meal_name (str): The name of the meal to retrieve.
 
     Returns:
-        Meal: The meal with the specified name.
+        Meal: The meal with the specified name. Repeat lookups are served from the meal cache.
 
     Raises:
         ValueError: If the meal is not found or has been deleted.
         sqlite3.Error: For any database errors.
     """
+    if meal_cache is not None:
+        cached = meal_cache.get(('name', meal_name))
+        if cached is not None:
+            return cached
+
+    version, _ = get_data_version()
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
@@ -242,7 +695,9 @@ def get_meal_by_name(meal_name: str) -> Meal:
                 if row[5]:
                     logger.info("Meal with name %s has been deleted", meal_name)
                     raise ValueError(f"Meal with name {meal_name} has been deleted")
-                return Meal(id=row[0], meal=row[1], cuisine=row[2], price=row[3], difficulty=row[4])
+                meal = Meal.from_row(row)
+                _cache_meal(meal, version)
+                return meal
             else:
                 logger.info("Meal with name %s not found", meal_name)
                 raise ValueError(f"Meal with name {meal_name} not found")
@@ -252,6 +707,163 @@ def get_meal_by_name(meal_name: str) -> Meal:
         raise e
 
 
+def _lookup_meals(column: str, values: list) -> tuple[dict[Any, Meal], list, list]:
+    """Resolves meals by id or name, serving cached meals first and reading the rest in chunks.
+
+    Args:
+        column (str): 'id' or 'meal'.
+        values (list): The ids or names; duplicates are looked up once.
+
+    Returns:
+        tuple[dict[Any, Meal], list, list]: The active meals keyed by the looked-up value, then
+            the values not found and the values whose meal has been deleted, in input order.
+
+    Raises:
+        sqlite3.Error: For any database errors.
+    """
+    cache_kind = 'id' if column == 'id' else 'name'
+    meals: dict[Any, Meal] = {}
+    if meal_cache is not None:
+        for value in values:
+            cached = meal_cache.get((cache_kind, value))
+            if cached is not None:
+                meals[value] = cached
+    pending = list(dict.fromkeys(value for value in values if value not in meals))
+
+    rows: dict[Any, tuple] = {}
+    version, _ = get_data_version()
+    if pending:
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                # chunked like create_meals_bulk, to stay under SQLite's bound-parameter limit
+                for start in range(0, len(pending), BULK_CHUNK_SIZE):
+                    chunk = pending[start:start + BULK_CHUNK_SIZE]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    cursor.execute(
+                        f"SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE {column} IN ({placeholders})",
+                        chunk
+                    )
+                    index = 0 if column == 'id' else 1
+                    rows.update((row[index], row) for row in cursor.fetchall())
+
+        except sqlite3.Error as e:
+            logger.error("Database error: %s", str(e))
+            raise e
+
+    missing, deleted = [], []
+    for value in pending:
+        row = rows.get(value)
+        if row is None:
+            missing.append(value)
+        elif row[5]:
+            deleted.append(value)
+        else:
+            meal = Meal.from_row(row)
+            _cache_meal(meal, version)
+            meals[value] = meal
+    return meals, missing, deleted
+
+
+@timed("kitchen_model.find_meals")
+def find_meals(meal_ids: Optional[list[int]] = None, meal_names: Optional[list[str]] = None) -> dict[str, Any]:
+    """Resolves a list of meal ids or names, reporting the ones that could not be resolved.
+
+    Unlike `get_meals_by_ids` and `get_meals_by_names`, missing and deleted
+    meals are reported rather than raised.
+
+    Args:
+        meal_ids (Optional[list[int]]): The ids to look up.
+        meal_names (Optional[list[str]]): The names to look up, if no ids are given.
+
+    Returns:
+        dict[str, Any]: `meals`, the active meals in input order (each once), plus `missing`
+            and `deleted`, the ids or names that were not found or have been deleted.
+
+    Raises:
+        ValueError: If neither or both of `meal_ids` and `meal_names` are given, or they are
+            not a list of integers or strings.
+        sqlite3.Error: For any database errors.
+    """
+    if (meal_ids is None) == (meal_names is None):
+        raise ValueError("Provide either meal ids or meal names.")
+    if meal_ids is not None:
+        _validate_lookup(meal_ids, int, "meal_ids must be a list of integer meal ids.")
+        column, values = 'id', meal_ids
+    else:
+        _validate_lookup(meal_names, str, "meal_names must be a list of meal names.")
+        column, values = 'meal', meal_names
+
+    meals, missing, deleted = _lookup_meals(column, values)
+    logger.info("Looked up %d meals: %d found, %d missing, %d deleted",
+                len(values), len(meals), len(missing), len(deleted))
+    return {
+        'meals': [meals[value] for value in dict.fromkeys(values) if value in meals],
+        'missing': missing,
+        'deleted': deleted,
+    }
+
+
+def _validate_lookup(values: Any, kind: type, message: str) -> None:
+    # bool is an int subclass, but True is not a meal id
+    if not isinstance(values, list) or not all(isinstance(value, kind) and not isinstance(value, bool)
+                                               for value in values):
+        raise ValueError(message)
+
+
+@timed("kitchen_model.get_meals_by_ids")
+def get_meals_by_ids(meal_ids: list[int]) -> list[Meal]:
+    """Retrieves several meals by ID, reading the uncached ones in as few queries as possible.
+
+    Args:
+        meal_ids (list[int]): The unique identifiers of the meals.
+
+    Returns:
+        list[Meal]: The meals, in the order their ids were given. Cached meals are not re-read.
+
+    Raises:
+        ValueError: If any meal is not found or has been deleted.
+        sqlite3.Error: For any database errors.
+    """
+    meals, _, deleted = _lookup_meals('id', meal_ids)
+    for meal_id in meal_ids:
+        if meal_id in meals:
+            continue
+        if meal_id in deleted:
+            logger.info("Meal with ID %s has been deleted", meal_id)
+            raise ValueError(f"Meal with ID {meal_id} has been deleted")
+        logger.info("Meal with ID %s not found", meal_id)
+        raise ValueError(f"Meal with ID {meal_id} not found")
+    return [meals[meal_id] for meal_id in meal_ids]
+
+
+@timed("kitchen_model.get_meals_by_names")
+def get_meals_by_names(meal_names: list[str]) -> list[Meal]:
+    """Retrieves several meals by name, reading the uncached ones in as few queries as possible.
+
+    Args:
+        meal_names (list[str]): The names of the meals.
+
+    Returns:
+        list[Meal]: The meals, in the order their names were given. Cached meals are not re-read.
+
+    Raises:
+        ValueError: If any meal is not found or has been deleted.
+        sqlite3.Error: For any database errors.
+    """
+    meals, _, deleted = _lookup_meals('meal', meal_names)
+    for meal_name in meal_names:
+        if meal_name in meals:
+            continue
+        if meal_name in deleted:
+            logger.info("Meal with name %s has been deleted", meal_name)
+            raise ValueError(f"Meal with name {meal_name} has been deleted")
+        logger.info("Meal with name %s not found", meal_name)
+        raise ValueError(f"Meal with name {meal_name} not found")
+    return [meals[meal_name] for meal_name in meal_names]
+
+
+@timed("kitchen_model.update_meal_stats")
 def update_meal_stats(meal_id: int, result: str) -> None:
     """Updates the battle statistics for a meal based on battle result.
 
@@ -276,14 +888,135 @@ def update_meal_stats(meal_id: int, result: str) -> None:
                 logger.info("Meal with ID %s not found", meal_id)
                 raise ValueError(f"Meal with ID {meal_id} not found")
 
+            returning = " RETURNING id, meal, cuisine, price, difficulty, battles, wins"
             if result == 'win':
-                cursor.execute("UPDATE meals SET battles = battles + 1, wins = wins + 1 WHERE id = ?", (meal_id,))
+                cursor.execute("UPDATE meals SET battles = battles + 1, wins = wins + 1 WHERE id = ?" + returning,
+                               (meal_id,))
             elif result == 'loss':
-                cursor.execute("UPDATE meals SET battles = battles + 1 WHERE id = ?", (meal_id,))
+                cursor.execute("UPDATE meals SET battles = battles + 1 WHERE id = ?" + returning, (meal_id,))
             else:
                 raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
+            updated = cursor.fetchall()
+
+            conn.commit()
+        leaderboard.upsert(updated)
+        _bump_data_version()
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+
+@timed("kitchen_model.record_battle_result")
+def record_battle_result(winner_id: int, loser_id: int) -> None:
+    """Records the outcome of a battle for both meals in a single transaction.
+
+    Both rows are validated and updated by one UPDATE and committed once, so
+    a battle's stats are never left half-written. The updated rows are
+    returned by the same statement and applied to the in-memory leaderboard.
+
+    Args:
+        winner_id (int): The unique identifier of the winning meal.
+        loser_id (int): The unique identifier of the losing meal.
+
+    Raises:
+        ValueError: If the ids are the same, or either meal is not found or has been deleted.
+        sqlite3.Error: For any database errors.
+    """
+    if winner_id == loser_id:
+        raise ValueError(f"Invalid battle result: meal with ID {winner_id} cannot battle itself.")
+
+    start = time.perf_counter()
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE meals
+                SET battles = battles + 1, wins = wins + CASE WHEN id = ? THEN 1 ELSE 0 END
+                WHERE id IN (?, ?) AND deleted = FALSE
+                RETURNING id, meal, cuisine, price, difficulty, battles, wins
+            """, (winner_id, winner_id, loser_id))
+            updated = cursor.fetchall()
+
+            if len(updated) != 2:
+                conn.rollback()
+                cursor.execute("SELECT id, deleted FROM meals WHERE id IN (?, ?)", (winner_id, loser_id))
+                found = dict(cursor.fetchall())
+                for meal_id in (winner_id, loser_id):
+                    if meal_id not in found:
+                        logger.info("Meal with ID %s not found", meal_id)
+                        raise ValueError(f"Meal with ID {meal_id} not found")
+                    if found[meal_id]:
+                        logger.info("Meal with ID %s has been deleted", meal_id)
+                        raise ValueError(f"Meal with ID {meal_id} has been deleted")
+                raise ValueError(f"Battle result for meals {winner_id} and {loser_id} could not be recorded")
+
+            conn.commit()
+        # applied once the connection is back in the pool; see delete_meal
+        leaderboard.upsert(updated)
+        _bump_data_version()
+        logger.info("Recorded battle result: winner %s, loser %s", winner_id, loser_id,
+                    extra={'event': 'kitchen.battle_recorded', 'winner_id': winner_id, 'loser_id': loser_id,
+                           'latency_ms': round((time.perf_counter() - start) * 1000, 3)})
+
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+
+@timed("kitchen_model.record_battle_results")
+def record_battle_results(results: list[tuple[int, int]]) -> None:
+    """Records the outcomes of many battles in a single transaction.
+
+    Results are summed per meal first, so each meal's row is updated once
+    however many battles it fought, and the whole batch is committed once.
+    If any meal is missing or deleted nothing is recorded.
+
+    Args:
+        results (list[tuple[int, int]]): (winner_id, loser_id) pairs.
+
+    Raises:
+        ValueError: If a meal is paired with itself, or any meal is not found or has been deleted.
+        sqlite3.Error: For any database errors.
+    """
+    deltas: dict[int, list[int]] = {}
+    for winner_id, loser_id in results:
+        if winner_id == loser_id:
+            raise ValueError(f"Invalid battle result: meal with ID {winner_id} cannot battle itself.")
+        deltas.setdefault(winner_id, [0, 0])
+        deltas.setdefault(loser_id, [0, 0])
+        deltas[winner_id][0] += 1
+        deltas[winner_id][1] += 1
+        deltas[loser_id][0] += 1
+    if not deltas:
+        return
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            updated = []
+            for meal_id, (battles, wins) in deltas.items():
+                cursor.execute("""
+                    UPDATE meals SET battles = battles + ?, wins = wins + ?
+                    WHERE id = ? AND deleted = FALSE
+                    RETURNING id, meal, cuisine, price, difficulty, battles, wins
+                """, (battles, wins, meal_id))
+                row = cursor.fetchone()
+                if row is None:
+                    conn.rollback()
+                    cursor.execute("SELECT deleted FROM meals WHERE id = ?", (meal_id,))
+                    if cursor.fetchone() is None:
+                        logger.info("Meal with ID %s not found", meal_id)
+                        raise ValueError(f"Meal with ID {meal_id} not found")
+                    logger.info("Meal with ID %s has been deleted", meal_id)
+                    raise ValueError(f"Meal with ID {meal_id} has been deleted")
+                updated.append(row)
 
             conn.commit()
+        # applied once the connection is back in the pool; see delete_meal
+        leaderboard.upsert(updated)
+        _bump_data_version()
+        logger.info("Recorded %d battle results for %d meals", len(results), len(updated))
 
     except sqlite3.Error as e:
         logger.error("Database error: %s", str(e))
@@ -0,0 +1,234 @@
+import base64
+from bisect import bisect_left, bisect_right, insort
+import binascii
+import json
+import logging
+import threading
+from typing import Any, Iterable, Optional
+
+from meal_max.utils.logger import configure_logger
+from meal_max.utils.sql_utils import get_db_connection
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+SORT_ORDERS = ("wins", "win_pct")
+
+
+def encode_cursor(entry: dict[str, Any], sort_by: str = "wins") -> str:
+    """Builds an opaque keyset-pagination cursor pointing just after a leaderboard entry.
+
+    The score is recomputed from wins and battles rather than taken from the
+    rounded `win_pct`, so it compares exactly against the value SQLite computes.
+
+    Args:
+        entry (dict[str, Any]): A leaderboard entry, as returned by `get_leaderboard`.
+        sort_by (str): The sort order the cursor is for, either 'wins' or 'win_pct'.
+
+    Returns:
+        str: A URL-safe cursor string.
+    """
+    score = entry['wins'] if sort_by == "wins" else entry['wins'] / entry['battles']
+    return base64.urlsafe_b64encode(json.dumps([score, entry['id']]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+    """Reads the (score, id) position back out of a cursor made by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor string.
+
+    Returns:
+        tuple[float, int]: The score and id of the last entry on the previous page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        score, meal_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(score, (int, float)) or not isinstance(meal_id, int):
+            raise TypeError
+    except (binascii.Error, ValueError, TypeError):
+        raise ValueError(f"Invalid leaderboard cursor: {cursor}")
+    return score, meal_id
+
+
+class Leaderboard:
+    """An in-memory leaderboard kept up to date as battle results are recorded.
+
+    Every meal with at least one battle is held once, with a sorted list of
+    rank keys per sort order. A key is (-score, id), so ascending key order
+    is the leaderboard order and ties break by id. Top-N reads are a slice
+    and rank lookups a binary search; an update moves one key in each list.
+
+    The board is loaded from the meals table on first use and after
+    `invalidate`. It only sees results recorded by this process, so each
+    worker keeps its own copy.
+    """
+
+    def __init__(self):
+        self._entries: dict[int, dict[str, Any]] = {}
+        self._keys: dict[str, list[tuple[float, int]]] = {sort_by: [] for sort_by in SORT_ORDERS}
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def get_leaderboard(self, sort_by: str = "wins", limit: Optional[int] = None, offset: int = 0,
+                        cursor: Optional[str] = None) -> list[dict[str, Any]]:
+        """Returns the leaderboard in rank order.
+
+        Args:
+            sort_by (str): Sorting criterion, either 'wins' or 'win_pct'.
+            limit (Optional[int]): Return at most `limit` meals; all of them if None.
+            offset (int): Number of meals to skip before the first one returned.
+            cursor (Optional[str]): Start after the meal this cursor was made from (see `encode_cursor`).
+
+        Returns:
+            list[dict[str, Any]]: Meals with battle statistics, as returned by `kitchen_model.get_leaderboard`.
+
+        Raises:
+            ValueError: If `sort_by` or `cursor` is invalid.
+            sqlite3.Error: If the board has to be loaded and the query fails.
+        """
+        self._validate_sort(sort_by)
+        start = offset
+        if cursor is not None:
+            after_score, after_id = decode_cursor(cursor)
+            after_key = (-after_score, after_id)
+        with self._lock:
+            self._ensure_loaded()
+            keys = self._keys[sort_by]
+            if cursor is not None:
+                start += bisect_right(keys, after_key)
+            end = start + limit if limit is not None else len(keys)
+            selected = keys[start:end]
+            return [self._to_dict(self._entries[meal_id]) for _, meal_id in selected]
+
+    def get_rank(self, meal_id: int, sort_by: str = "wins") -> dict[str, Any]:
+        """Returns a meal's 1-based position on the leaderboard.
+
+        Args:
+            meal_id (int): The unique identifier of the meal.
+            sort_by (str): Sorting criterion, either 'wins' or 'win_pct'.
+
+        Returns:
+            dict[str, Any]: The meal's leaderboard entry plus its `rank` and the board's `total`.
+
+        Raises:
+            ValueError: If `sort_by` is invalid or the meal has no battles on record.
+            sqlite3.Error: If the board has to be loaded and the query fails.
+        """
+        self._validate_sort(sort_by)
+        with self._lock:
+            self._ensure_loaded()
+            keys = self._keys[sort_by]
+            entry = self._entries.get(meal_id)
+            if entry is None:
+                raise ValueError(f"Meal with ID {meal_id} is not on the leaderboard")
+            rank = bisect_left(keys, self._key(sort_by, entry)) + 1
+            return {**self._to_dict(entry), 'rank': rank, 'total': len(keys)}
+
+    def upsert(self, rows: Iterable[tuple]) -> None:
+        """Applies freshly updated meal rows to the board.
+
+        A row whose battle count is lower than the one already held is
+        ignored, so results applied out of commit order cannot roll a meal back.
+
+        Args:
+            rows (Iterable[tuple]): (id, meal, cuisine, price, difficulty, battles, wins) rows.
+        """
+        with self._lock:
+            if not self._loaded:
+                # the next read loads everything, including these rows
+                return
+            for row in rows:
+                current = self._entries.get(row[0])
+                if current is not None and current['battles'] > row[5]:
+                    continue
+                self._remove(row[0])
+                self._insert(row)
+
+    def remove(self, meal_id: int) -> None:
+        """Drops a meal from the board, e.g. after it is deleted.
+
+        Args:
+            meal_id (int): The unique identifier of the meal.
+        """
+        with self._lock:
+            self._remove(meal_id)
+
+    def invalidate(self) -> None:
+        """Discards the board so the next read reloads it from the database."""
+        with self._lock:
+            self._entries.clear()
+            for keys in self._keys.values():
+                keys.clear()
+            self._loaded = False
+
+    def _ensure_loaded(self) -> None:
+        """Loads every meal with battles from the database. Caller holds the lock."""
+        if self._loaded:
+            return
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, meal, cuisine, price, difficulty, battles, wins
+                FROM meals WHERE deleted = FALSE AND battles > 0
+            """)
+            rows = cursor.fetchall()
+
+        self._entries = {row[0]: self._entry(row) for row in rows}
+        for sort_by in SORT_ORDERS:
+            self._keys[sort_by] = sorted(self._key(sort_by, entry) for entry in self._entries.values())
+        self._loaded = True
+        logger.info("Leaderboard loaded with %d meals", len(self._entries))
+
+    def _insert(self, row: tuple) -> None:
+        if row[5] <= 0:
+            return
+        entry = self._entry(row)
+        self._entries[entry['id']] = entry
+        for sort_by in SORT_ORDERS:
+            insort(self._keys[sort_by], self._key(sort_by, entry))
+
+    def _remove(self, meal_id: int) -> None:
+        entry = self._entries.pop(meal_id, None)
+        if entry is None:
+            return
+        for sort_by in SORT_ORDERS:
+            keys = self._keys[sort_by]
+            del keys[bisect_left(keys, self._key(sort_by, entry))]
+
+    @staticmethod
+    def _validate_sort(sort_by: str) -> None:
+        if sort_by not in SORT_ORDERS:
+            logger.error("Invalid sort_by parameter: %s", sort_by)
+            raise ValueError("Invalid sort_by parameter: %s" % sort_by)
+
+    @staticmethod
+    def _entry(row: tuple) -> dict[str, Any]:
+        return {
+            'id': row[0],
+            'meal': row[1],
+            'cuisine': row[2],
+            # UPDATE ... RETURNING hands back a whole-number REAL as an int, where SELECT gives a float
+            'price': float(row[3]),
+            'difficulty': row[4],
+            'battles': row[5],
+            'wins': row[6],
+        }
+
+    @staticmethod
+    def _key(sort_by: str, entry: dict[str, Any]) -> tuple[float, int]:
+        if sort_by == "wins":
+            return (-entry['wins'], entry['id'])
+        return (-(entry['wins'] / entry['battles']), entry['id'])
+
+    @staticmethod
+    def _to_dict(entry: dict[str, Any]) -> dict[str, Any]:
+        return {**entry, 'win_pct': round(entry['wins'] / entry['battles'] * 100, 1)}
+
+
+# Shared by kitchen_model, which keeps it current as results are recorded
+leaderboard = Leaderboard()
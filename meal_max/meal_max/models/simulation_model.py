@@ -0,0 +1,195 @@
+"""Monte Carlo forecasts of battle outcomes between meals.
+
+Bouts are decided with the BattleModel scoring and decision rules but
+nothing is written to the database. Run from the command line with
+
+    python -m meal_max.models.simulation_model 1 2 3 --bouts 1000000
+"""
+import argparse
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, List, Optional
+
+import numpy as np
+
+from meal_max.models.battle_model import decide_battles, get_battle_scores, get_win_probabilities, meals_to_arrays
+from meal_max.models.kitchen_model import get_meals_by_ids
+from meal_max.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+SIMULATION_WORKERS = int(os.getenv("SIMULATION_WORKERS", str(os.cpu_count() or 1)))
+# bouts per pair drawn from one RNG stream; results depend on the seed and this, not on the number of workers
+SIMULATION_CHUNK_BOUTS = int(os.getenv("SIMULATION_CHUNK_BOUTS", "10000"))
+# upper bound on pairs * bouts for one simulation
+SIMULATION_MAX_TOTAL_BOUTS = int(os.getenv("SIMULATION_MAX_TOTAL_BOUTS", "500000000"))
+
+# random numbers held in memory at once by a task
+_BLOCK_DRAWS = 1_000_000
+
+# worker pool shared by every simulation in this process, created on first use
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _simulate_units(scores_1: np.ndarray, scores_2: np.ndarray, entropy: int,
+                    units: List[tuple[int, int, int]]) -> np.ndarray:
+    """Runs a task's (pair, chunk, bouts) units and counts the first combatant's wins per pair.
+
+    Runs in a worker process. Each unit draws from its own stream, keyed by
+    its pair and chunk under the simulation's seed, so how units are grouped
+    into tasks does not change the result.
+    """
+    wins = np.zeros(len(scores_1), dtype=np.int64)
+    for pair, chunk, bouts in units:
+        rng = np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(pair, chunk)))
+        for start in range(0, bouts, _BLOCK_DRAWS):
+            size = min(_BLOCK_DRAWS, bouts - start)
+            # two-decimal draws, as every RandomProvider serves
+            randoms = rng.integers(0, 100, size=size) / 100
+            wins[pair] += np.count_nonzero(decide_battles(np.full(size, scores_1[pair]),
+                                                          np.full(size, scores_2[pair]), randoms))
+    return wins
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Returns the shared process pool, replacing it if it has fewer than `workers` processes."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers < workers:
+            if _executor is not None:
+                # simulations already running on the old pool still finish
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(max_workers=workers)
+            _executor_workers = workers
+            logger.info("Created simulation pool with %d workers", workers)
+        return _executor
+
+
+def close_executor() -> None:
+    """Waits for running simulations to finish and shuts the shared process pool down."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        executor, _executor, _executor_workers = _executor, None, 0
+    if executor is not None:
+        executor.shutdown(wait=True)
+        logger.info("Simulation pool shut down.")
+
+
+atexit.register(close_executor)
+
+
+def simulate(meal_ids: List[int], bouts: int = 100000, seed: Optional[int] = None,
+             workers: Optional[int] = None) -> dict[str, Any]:
+    """Estimates how often each meal beats each other meal.
+
+    Every pair of meals fights `bouts` simulated bouts, split into units of
+    at most SIMULATION_CHUNK_BOUTS bouts of one pair, each with its own RNG
+    stream under `SeedSequence(seed)`. The units are shared out across
+    pairs and chunks into one task per worker and run on a process pool
+    that is reused between simulations, so even a single pair's bouts use
+    every worker. The same seed gives the same result whatever the number
+    of workers.
+
+    Args:
+        meal_ids (List[int]): The meals to compare.
+        bouts (int): Simulated bouts per pair of meals.
+        seed (Optional[int]): Seed for the simulation; a fresh one is drawn and returned if None.
+        workers (Optional[int]): Worker processes; SIMULATION_WORKERS if None, and 1 runs in-process.
+
+    Returns:
+        dict[str, Any]: The meals, bouts per pair, seed, elapsed time and two matrices
+            indexed like `meals`: `win_probabilities[i][j]` is the simulated chance meal i
+            beats meal j when prepped first, and `exact_win_probabilities` the same chance
+            computed from the decision rule. The diagonal is None. Prepped second, meal i
+            wins with one minus that chance.
+
+    Raises:
+        ValueError: If the meal ids, bouts or workers are invalid, or any meal is not
+            found or has been deleted.
+        sqlite3.Error: For any database errors.
+    """
+    workers = workers if workers is not None else SIMULATION_WORKERS
+    if not isinstance(meal_ids, list) or not all(type(meal_id) is int for meal_id in meal_ids):
+        raise ValueError("meal_ids must be a list of integer meal ids.")
+    if len(meal_ids) < 2 or len(set(meal_ids)) != len(meal_ids):
+        raise ValueError("A simulation needs at least two different meals.")
+    # bool is an int subclass, so True would otherwise pass as 1
+    if type(bouts) is not int or bouts < 1:
+        raise ValueError(f"Invalid bouts: {bouts}. Must be a positive integer.")
+    if type(workers) is not int or workers < 1:
+        raise ValueError(f"Invalid workers: {workers}. Must be a positive integer.")
+    num_pairs = len(meal_ids) * (len(meal_ids) - 1) // 2
+    if num_pairs * bouts > SIMULATION_MAX_TOTAL_BOUTS:
+        raise ValueError(f"Simulation too large: {num_pairs} pairs x {bouts} bouts exceeds "
+                         f"{SIMULATION_MAX_TOTAL_BOUTS} bouts.")
+
+    meals = get_meals_by_ids(meal_ids)
+    scores = get_battle_scores(*meals_to_arrays(meals))
+    first, second = np.triu_indices(len(meals), k=1)
+    scores_1, scores_2 = scores[first], scores[second]
+
+    seed_sequence = np.random.SeedSequence(seed)
+    units = [(pair, chunk, min(SIMULATION_CHUNK_BOUTS, bouts - start))
+             for pair in range(num_pairs)
+             for chunk, start in enumerate(range(0, bouts, SIMULATION_CHUNK_BOUTS))]
+    tasks = [units[i::workers] for i in range(min(workers, len(units)))]
+    logger.info("Simulating %d bouts for each of %d pairs in %d tasks on %d workers",
+                bouts, num_pairs, len(tasks), workers)
+
+    start = time.perf_counter()
+    if len(tasks) == 1:
+        results = [_simulate_units(scores_1, scores_2, seed_sequence.entropy, tasks[0])]
+    else:
+        executor = _get_executor(len(tasks))
+        results = list(executor.map(_simulate_units, [scores_1] * len(tasks), [scores_2] * len(tasks),
+                                    [seed_sequence.entropy] * len(tasks), tasks))
+    wins = np.sum(results, axis=0)
+    elapsed = time.perf_counter() - start
+    logger.info("Simulated %d bouts in %.3fs", num_pairs * bouts, elapsed)
+
+    # the rule only depends on the score difference, so meal j prepped first against meal i
+    # wins exactly as often as meal i prepped first against meal j
+    simulated = np.full((len(meals), len(meals)), np.nan)
+    simulated[first, second] = simulated[second, first] = wins / bouts
+    exact = np.full((len(meals), len(meals)), np.nan)
+    exact[first, second] = exact[second, first] = get_win_probabilities(scores_1, scores_2)
+
+    return {
+        'meals': [{'id': meal.id, 'meal': meal.meal} for meal in meals],
+        'bouts_per_pair': bouts,
+        'seed': seed_sequence.entropy,
+        'elapsed_seconds': round(elapsed, 3),
+        'win_probabilities': _to_matrix(simulated),
+        'exact_win_probabilities': _to_matrix(exact),
+    }
+
+
+def _to_matrix(values: np.ndarray) -> list[list[Optional[float]]]:
+    return [[None if math.isnan(value) else value for value in row] for row in values.tolist()]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Forecast win probabilities between meals without recording battles.")
+    parser.add_argument("meal_ids", type=int, nargs="+", help="ids of the meals to compare")
+    parser.add_argument("--bouts", type=int, default=100000, help="simulated bouts per pair of meals")
+    parser.add_argument("--seed", type=int, default=None, help="seed, for a reproducible run")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    args = parser.parse_args(argv)
+
+    result = simulate(args.meal_ids, bouts=args.bouts, seed=args.seed, workers=args.workers)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
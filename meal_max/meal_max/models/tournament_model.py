@@ -0,0 +1,298 @@
+import logging
+import math
+import os
+from typing import Any, Callable, List, Optional
+
+from meal_max.models.battle_model import get_battle_scores, meals_to_arrays
+from meal_max.models.kitchen_model import Meal, get_meals_by_ids, record_battle_results
+from meal_max.utils.logger import configure_logger
+from meal_max.utils.random_providers import RandomProvider, get_random_provider
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+TOURNAMENT_FORMATS = ("round_robin", "single_elimination", "double_elimination", "swiss")
+# round robin plays every pair, so the bout count grows with the square of this
+TOURNAMENT_MAX_MEALS = int(os.getenv("TOURNAMENT_MAX_MEALS", "256"))
+
+# play(round_number, meal_1, meal_2) -> (winner, loser)
+Play = Callable[[int, Meal, Meal], tuple]
+
+
+class TournamentModel:
+    """Model running a whole tournament between meals in a single call.
+
+    The meals are fetched with one query, every random number the format
+    can need is drawn up front in one batch, the bouts are decided
+    in-process with the same rule as `BattleModel.battle`, and all the
+    resulting stat updates are committed in one transaction.
+
+    Meals are seeded in the order their ids are given, first id first.
+    """
+
+    def __init__(self, random_provider: Optional[RandomProvider] = None):
+        """Initializes the TournamentModel.
+
+        Args:
+            random_provider (Optional[RandomProvider]): Where bouts draw their random
+                numbers from. Defaults to the provider configured by RANDOM_PROVIDER.
+        """
+        self.random_provider = random_provider or get_random_provider()
+
+    def run(self, meal_ids: List[int], tournament_format: str = "round_robin",
+            rounds: Optional[int] = None) -> dict[str, Any]:
+        """Runs a tournament and records every bout's result.
+
+        Args:
+            meal_ids (List[int]): The meals taking part, in seed order.
+            tournament_format (str): One of 'round_robin', 'single_elimination',
+                'double_elimination' or 'swiss'.
+            rounds (Optional[int]): Number of Swiss rounds; defaults to ceil(log2(len(meal_ids))).
+                Only valid for 'swiss'.
+
+        Returns:
+            dict[str, Any]: The format, number of rounds, every bout in order
+                ({'round', 'meal_1', 'meal_2', 'winner', 'loser'} by id), the final
+                standings and the champion.
+
+        Raises:
+            ValueError: If the format, meal ids or rounds are invalid, or any meal
+                is not found or has been deleted.
+            sqlite3.Error: For any database errors.
+        """
+        rounds = self._validate(meal_ids, tournament_format, rounds)
+        logger.info("Starting %s tournament between %d meals", tournament_format, len(meal_ids))
+
+        meals = get_meals_by_ids(meal_ids)
+        scores = {meal.id: score for meal, score in zip(meals, get_battle_scores(*meals_to_arrays(meals)).tolist())}
+        draws = iter(self.random_provider.get_randoms(self._draws_needed(tournament_format, len(meals), rounds)))
+        bouts: list[dict[str, Any]] = []
+
+        def play(round_number: int, meal_1: Meal, meal_2: Meal) -> tuple:
+            # the same rule as BattleModel.battle, with meal_1 as the first combatant
+            delta = abs(scores[meal_1.id] - scores[meal_2.id]) / 100
+            winner, loser = (meal_1, meal_2) if delta > next(draws) else (meal_2, meal_1)
+            bouts.append({'round': round_number, 'meal_1': meal_1.id, 'meal_2': meal_2.id,
+                          'winner': winner.id, 'loser': loser.id})
+            return winner, loser
+
+        if tournament_format == "round_robin":
+            ranking, byes = _run_round_robin(meals, play), {}
+        elif tournament_format == "swiss":
+            ranking, byes = _run_swiss(meals, play, rounds)
+        elif tournament_format == "single_elimination":
+            ranking, byes = _run_single_elimination(meals, play), {}
+        else:
+            ranking, byes = _run_double_elimination(meals, play), {}
+
+        record_battle_results([(bout['winner'], bout['loser']) for bout in bouts])
+
+        wins = {meal.id: 0 for meal in meals}
+        losses = {meal.id: 0 for meal in meals}
+        for bout in bouts:
+            wins[bout['winner']] += 1
+            losses[bout['loser']] += 1
+        standings = [
+            {'rank': rank, 'id': meal.id, 'meal': meal.meal, 'wins': wins[meal.id], 'losses': losses[meal.id],
+             'byes': byes.get(meal.id, 0)}
+            for rank, meal in enumerate(ranking, start=1)
+        ]
+
+        logger.info("%s tournament won by %s after %d bouts", tournament_format, ranking[0].meal, len(bouts))
+        return {
+            'format': tournament_format,
+            'rounds': max((bout['round'] for bout in bouts), default=0),
+            'bouts': bouts,
+            'standings': standings,
+            'champion': {'id': ranking[0].id, 'meal': ranking[0].meal},
+        }
+
+    @staticmethod
+    def _validate(meal_ids: List[int], tournament_format: str, rounds: Optional[int]) -> Optional[int]:
+        if tournament_format not in TOURNAMENT_FORMATS:
+            logger.error("Invalid tournament format: %s", tournament_format)
+            raise ValueError(f"Invalid tournament format: {tournament_format}. Must be one of {TOURNAMENT_FORMATS}.")
+        if not isinstance(meal_ids, list) or not all(type(meal_id) is int for meal_id in meal_ids):
+            raise ValueError("meal_ids must be a list of integer meal ids.")
+        if len(meal_ids) < 2:
+            raise ValueError("A tournament needs at least two meals.")
+        if len(meal_ids) > TOURNAMENT_MAX_MEALS:
+            raise ValueError(f"A tournament can have at most {TOURNAMENT_MAX_MEALS} meals.")
+        if len(set(meal_ids)) != len(meal_ids):
+            raise ValueError("Each meal can only enter a tournament once.")
+
+        if tournament_format != "swiss":
+            if rounds is not None:
+                raise ValueError("rounds can only be set for a swiss tournament.")
+            return None
+        if rounds is None:
+            return math.ceil(math.log2(len(meal_ids)))
+        # bool is an int subclass, so True would otherwise pass as 1
+        if type(rounds) is not int or not 1 <= rounds < len(meal_ids):
+            raise ValueError(f"Invalid rounds: {rounds}. Must be between 1 and {len(meal_ids) - 1}.")
+        return rounds
+
+    @staticmethod
+    def _draws_needed(tournament_format: str, num_meals: int, rounds: Optional[int]) -> int:
+        """Returns the most random numbers a tournament of this shape can use."""
+        if tournament_format == "round_robin":
+            return num_meals * (num_meals - 1) // 2
+        if tournament_format == "single_elimination":
+            return num_meals - 1
+        if tournament_format == "double_elimination":
+            # every meal but the champion loses twice, plus a possible grand final rematch
+            return 2 * num_meals - 1
+        return rounds * (num_meals // 2)
+
+
+def _pair_off(meals: List[Meal]) -> list[tuple]:
+    """Pairs the highest seed with the lowest, the second with the second lowest and so on."""
+    return [(meals[i], meals[-1 - i]) for i in range(len(meals) // 2)]
+
+
+def _run_round_robin(meals: List[Meal], play: Play) -> List[Meal]:
+    """Every meal meets every other meal once, scheduled with the circle method."""
+    seed = {meal.id: index for index, meal in enumerate(meals)}
+    wins = {meal.id: 0 for meal in meals}
+    slots: list[Optional[Meal]] = list(meals) + ([None] if len(meals) % 2 else [])
+
+    for round_number in range(1, len(slots)):
+        for meal_1, meal_2 in _pair_off(slots):
+            if meal_1 is not None and meal_2 is not None:
+                winner, _ = play(round_number, meal_1, meal_2)
+                wins[winner.id] += 1
+        # keep the first slot fixed and rotate the rest
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+
+    return sorted(meals, key=lambda meal: (-wins[meal.id], seed[meal.id]))
+
+
+def _run_swiss(meals: List[Meal], play: Play, rounds: int) -> tuple:
+    """Each round pairs meals with equal or similar points, avoiding rematches where possible.
+
+    With an odd number of meals the lowest-ranked meal that has not had a bye
+    sits the round out and scores a point, which is not recorded as a battle.
+    """
+    seed = {meal.id: index for index, meal in enumerate(meals)}
+    points = {meal.id: 0 for meal in meals}
+    byes: dict[int, int] = {}
+    played = set()
+
+    for round_number in range(1, rounds + 1):
+        order = sorted(meals, key=lambda meal: (-points[meal.id], seed[meal.id]))
+        if len(order) % 2:
+            bye = next((meal for meal in reversed(order) if meal.id not in byes), order[-1])
+            order.remove(bye)
+            byes[bye.id] = byes.get(bye.id, 0) + 1
+            points[bye.id] += 1
+
+        for meal_1, meal_2 in _swiss_pairs(order, played):
+            played.add(frozenset((meal_1.id, meal_2.id)))
+            winner, _ = play(round_number, meal_1, meal_2)
+            points[winner.id] += 1
+
+    return sorted(meals, key=lambda meal: (-points[meal.id], seed[meal.id])), byes
+
+
+def _swiss_pairs(order: List[Meal], played: set, budget: int = 10000) -> list[tuple]:
+    """Pairs meals in standings order, each with the nearest meal it has not met yet.
+
+    Backtracks when a greedy choice leaves meals that can only be paired as
+    rematches. If no rematch-free pairing turns up within `budget` steps,
+    falls back to the greedy pairing and accepts the rematches.
+    """
+    steps = 0
+
+    def search(remaining: List[Meal]) -> Optional[list]:
+        nonlocal steps
+        if not remaining:
+            return []
+        meal_1, rest = remaining[0], remaining[1:]
+        for index, meal_2 in enumerate(rest):
+            steps += 1
+            if steps > budget:
+                return None
+            if frozenset((meal_1.id, meal_2.id)) in played:
+                continue
+            pairs = search(rest[:index] + rest[index + 1:])
+            if pairs is not None:
+                return [(meal_1, meal_2)] + pairs
+        return None
+
+    pairs = search(order)
+    if pairs is not None:
+        return pairs
+
+    pairs, remaining = [], list(order)
+    while remaining:
+        meal_1 = remaining.pop(0)
+        meal_2 = next((meal for meal in remaining if frozenset((meal_1.id, meal.id)) not in played), remaining[0])
+        remaining.remove(meal_2)
+        pairs.append((meal_1, meal_2))
+    return pairs
+
+
+def _run_single_elimination(meals: List[Meal], play: Play) -> List[Meal]:
+    """A knockout bracket, reseeded each round. Top seeds get byes when the field is not a power of two."""
+    seed = {meal.id: index for index, meal in enumerate(meals)}
+    alive = list(meals)
+    eliminated: list[List[Meal]] = []
+    round_number = 0
+
+    while len(alive) > 1:
+        round_number += 1
+        bracket_size = 1 << (len(alive) - 1).bit_length()
+        num_byes = bracket_size - len(alive)
+        advancing, losers = alive[:num_byes], []
+        for meal_1, meal_2 in _pair_off(alive[num_byes:]):
+            winner, loser = play(round_number, meal_1, meal_2)
+            advancing.append(winner)
+            losers.append(loser)
+        eliminated.append(losers)
+        alive = sorted(advancing, key=lambda meal: seed[meal.id])
+
+    return _elimination_ranking(alive, eliminated, seed)
+
+
+def _run_double_elimination(meals: List[Meal], play: Play) -> List[Meal]:
+    """A meal is out after its second loss.
+
+    Each round pairs unbeaten meals with each other and once-beaten meals
+    with each other. When one of each is left they meet in the grand final,
+    which is replayed if the unbeaten meal loses it.
+    """
+    seed = {meal.id: index for index, meal in enumerate(meals)}
+    losses = {meal.id: 0 for meal in meals}
+    alive = list(meals)
+    eliminated: list[List[Meal]] = []
+    round_number = 0
+
+    while len(alive) > 1:
+        round_number += 1
+        upper = [meal for meal in alive if losses[meal.id] == 0]
+        lower = [meal for meal in alive if losses[meal.id] == 1]
+        if len(upper) == 1 and len(lower) == 1:
+            pairs = [(upper[0], lower[0])]
+        else:
+            pairs = _pair_off(upper) + _pair_off(lower)
+
+        out = []
+        for meal_1, meal_2 in pairs:
+            _, loser = play(round_number, meal_1, meal_2)
+            losses[loser.id] += 1
+            if losses[loser.id] == 2:
+                out.append(loser)
+        eliminated.append(out)
+        alive = [meal for meal in alive if losses[meal.id] < 2]
+
+    return _elimination_ranking(alive, eliminated, seed)
+
+
+def _elimination_ranking(champion: List[Meal], eliminated: list, seed: dict[int, int]) -> List[Meal]:
+    """Ranks the champion first, then meals by how late they went out, ties broken by seed."""
+    ranking = list(champion)
+    for out in reversed(eliminated):
+        ranking.extend(sorted(out, key=lambda meal: seed[meal.id]))
+    return ranking
@@ -0,0 +1,282 @@
+import asyncio
+from collections import deque
+import logging
+import time
+from typing import Any, Optional
+
+import httpx
+
+from meal_max.utils import random_utils
+from meal_max.utils.logger import configure_logger
+from meal_max.utils.random_providers import (
+    RANDOM_BREAKER_COOLDOWN,
+    RANDOM_CALL_TIMEOUT,
+    RANDOM_FALLBACK,
+    RANDOM_PROVIDER,
+    RANDOM_SEED,
+    RandomProvider,
+    create_random_provider,
+)
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class AsyncRandomOrgClient:
+    """Draws random numbers from random.org without blocking the event loop.
+
+    Requests go through one httpx.AsyncClient, so TLS connections are kept
+    alive and reused. Numbers are fetched `batch_size` at a time and served
+    from memory. When the buffer runs dry a single request refills it with
+    enough numbers for every coroutine waiting on it, so a burst of draws
+    costs one round trip. Connection errors and 429/5xx responses are
+    retried with exponential backoff, as the sync session does.
+
+    If a refill fails or overruns `call_timeout` and a fallback provider is
+    set, every draw that was waiting on it is answered by the fallback, and
+    random.org is skipped for `cooldown` seconds, as CircuitBreakerProvider
+    does for the sync path. The first draw after the cool-down tries it again.
+    A refill that overruns keeps going in the background and tops up the buffer.
+
+    Attributes:
+        batch_size (int): Numbers fetched per request.
+        fallback (Optional[RandomProvider]): Local provider used when random.org fails.
+        retries (int): Retries after a connection error or 429/5xx response.
+        retry_backoff (float): Seconds before the second retry, doubling after each one.
+        call_timeout (Optional[float]): Seconds a draw waits on a refill, retries included, before
+            falling back; None waits for the request's own timeouts.
+        cooldown (float): Seconds random.org is skipped after a failed refill.
+    """
+
+    name = "random_org"
+
+    def __init__(self, batch_size: int = 100, fallback: Optional[RandomProvider] = None,
+                 max_connections: int = 10, connect_timeout: float = 3.05, read_timeout: float = 5.0,
+                 retries: int = 0, retry_backoff: float = 0.2, call_timeout: Optional[float] = None,
+                 cooldown: float = 30.0):
+        self.batch_size = max(1, min(batch_size, random_utils.MAX_BATCH_SIZE))
+        self.fallback = fallback
+        self.max_connections = max_connections
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.call_timeout = call_timeout
+        self.cooldown = cooldown
+        self._numbers: deque[float] = deque()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._refill_lock: Optional[asyncio.Lock] = None
+        self._waiting = 0
+        # refills are numbered from 1; a draw falls back if the refill it waited on failed
+        self._refills = 0
+        self._refilling = False
+        self._failed_refill = 0
+        self._opened_at: Optional[float] = None
+        self._late_fetches: set[asyncio.Task] = set()
+
+        self._hits = 0
+        self._misses = 0
+        self._fallbacks = 0
+        self._last_fetch_seconds: Optional[float] = None
+
+    async def fetch_random_numbers(self, num: int) -> list[float]:
+        """Fetches a batch of random decimal numbers from random.org.
+
+        Args:
+            num (int): How many numbers to fetch, between 1 and 10,000.
+
+        Returns:
+            list[float]: `num` random numbers between 0 and 1, with two decimal places.
+
+        Raises:
+            ValueError: If `num` is out of range or the response is not a list of decimal numbers.
+            RuntimeError: If the request to random.org fails or times out.
+        """
+        url = random_utils.random_org_url(num)
+        start = time.perf_counter()
+        try:
+            logger.info("Fetching random number from %s", url)
+            response = await self._get(url)
+            response.raise_for_status()
+        except httpx.TimeoutException:
+            random_utils.request_latency.observe(time.perf_counter() - start)
+            logger.error("Request to random.org timed out.")
+            raise RuntimeError("Request to random.org timed out.")
+        except httpx.HTTPError as e:
+            random_utils.request_latency.observe(time.perf_counter() - start)
+            logger.error("Request to random.org failed: %s", e)
+            raise RuntimeError("Request to random.org failed: %s" % e)
+
+        self._last_fetch_seconds = time.perf_counter() - start
+        random_utils.request_latency.observe(self._last_fetch_seconds)
+        random_numbers = random_utils.parse_random_numbers(response.text, num)
+        logger.info("Received %d random numbers", len(random_numbers))
+        return random_numbers
+
+    async def get_random(self) -> float:
+        """Returns a random number between 0 and 1, from the buffer when it has one.
+
+        Returns:
+            float: The random number.
+
+        Raises:
+            RuntimeError: If random.org fails and there is no fallback.
+            ValueError: If the response is invalid and there is no fallback.
+        """
+        if self._numbers:
+            self._hits += 1
+            return self._numbers.popleft()
+
+        self._misses += 1
+        if self._is_open():
+            return self._fall_back()
+        if self._refill_lock is None:
+            self._refill_lock = asyncio.Lock()
+        # the refill that will answer this draw: the one in flight, or else the next one
+        refill = self._refills if self._refilling else self._refills + 1
+        self._waiting += 1
+        try:
+            async with self._refill_lock:
+                # another coroutine may have refilled the buffer while this one waited
+                if not self._numbers:
+                    # every draw queued behind a failed refill falls back at once rather than retrying it
+                    if self._failed_refill >= refill or self._is_open():
+                        return self._fall_back()
+                    num = min(max(self.batch_size, self._waiting), random_utils.MAX_BATCH_SIZE)
+                    self._refills += 1
+                    self._refilling = True
+                    try:
+                        self._numbers.extend(await self._fetch_within_timeout(num))
+                    except (RuntimeError, ValueError) as e:
+                        if self.fallback is None:
+                            raise
+                        self._failed_refill = self._refills
+                        self._opened_at = time.monotonic()
+                        logger.error("random.org failed (%s), falling back to %s for %.1fs", e,
+                                     self.fallback.name, self.cooldown)
+                        return self._fall_back()
+                    finally:
+                        self._refilling = False
+                    if self._opened_at is not None:
+                        logger.info("random.org recovered")
+                        self._opened_at = None
+                return self._numbers.popleft()
+        finally:
+            self._waiting -= 1
+
+    async def aclose(self) -> None:
+        """Cancels refills still running in the background and closes the pooled HTTP connections."""
+        for task in list(self._late_fetches):
+            task.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the buffer depth and draw counters.
+
+        Returns:
+            dict[str, Any]: A snapshot of the client's metrics.
+        """
+        return {
+            'depth': len(self._numbers),
+            'batch_size': self.batch_size,
+            'state': 'open' if self._opened_at is not None else 'closed',
+            'hits': self._hits,
+            'misses': self._misses,
+            'fallbacks': self._fallbacks,
+            'last_fetch_seconds': self._last_fetch_seconds,
+        }
+
+    def _is_open(self) -> bool:
+        """Whether random.org is being skipped after a failure; never true without a fallback."""
+        return self._opened_at is not None and time.monotonic() - self._opened_at < self.cooldown
+
+    def _fall_back(self) -> float:
+        self._fallbacks += 1
+        return self.fallback.get_random()
+
+    async def _fetch_within_timeout(self, num: int) -> list[float]:
+        if self.call_timeout is None:
+            return await self.fetch_random_numbers(num)
+        task = asyncio.ensure_future(self.fetch_random_numbers(num))
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), self.call_timeout)
+        except asyncio.TimeoutError:
+            # the request keeps going in the background, and its numbers are kept if it succeeds
+            self._late_fetches.add(task)
+            task.add_done_callback(self._keep_late_numbers)
+            raise RuntimeError("Request to random.org exceeded %.3fs." % self.call_timeout)
+
+    def _keep_late_numbers(self, task: asyncio.Task) -> None:
+        self._late_fetches.discard(task)
+        if not task.cancelled() and task.exception() is None:
+            self._numbers.extend(task.result())
+
+    async def _get(self, url: str) -> httpx.Response:
+        """GETs `url`, retrying connection errors and 429/5xx responses with exponential backoff."""
+        client = self._get_client()
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            last = attempt == self.retries
+            try:
+                response = await client.get(url)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                # read timeouts are not retried, so a slow upstream fails within read_timeout
+                if last:
+                    raise
+                logger.warning("Retrying random.org after %s", e)
+                continue
+            if last or response.status_code not in random_utils.RETRY_STATUSES:
+                return response
+            logger.warning("Retrying random.org after a %d response", response.status_code)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_connections)
+            timeout = httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+            self._client = httpx.AsyncClient(limits=limits, timeout=timeout)
+        return self._client
+
+
+class AsyncLocalRandomClient:
+    """Async wrapper for the local and seeded providers, which never wait on I/O."""
+
+    def __init__(self, provider: RandomProvider):
+        self.provider = provider
+        self.name = provider.name
+
+    async def get_random(self) -> float:
+        return self.provider.get_random()
+
+    async def aclose(self) -> None:
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        return {}
+
+
+def create_async_random_client():
+    """Builds the async counterpart of the provider RANDOM_PROVIDER selects.
+
+    Returns:
+        AsyncRandomOrgClient | AsyncLocalRandomClient: A client with an async `get_random`.
+
+    Raises:
+        ValueError: If RANDOM_PROVIDER or RANDOM_FALLBACK is not a known provider.
+    """
+    provider = create_random_provider(RANDOM_PROVIDER, RANDOM_SEED)
+    if provider.name != "random_org":
+        return AsyncLocalRandomClient(provider)
+    fallback = create_random_provider(RANDOM_FALLBACK, RANDOM_SEED) if RANDOM_FALLBACK != "none" else None
+    return AsyncRandomOrgClient(batch_size=random_utils.RANDOM_BUFFER_SIZE or 1, fallback=fallback,
+                                max_connections=random_utils.RANDOM_MAX_CONNECTIONS,
+                                connect_timeout=random_utils.RANDOM_CONNECT_TIMEOUT,
+                                read_timeout=random_utils.RANDOM_READ_TIMEOUT,
+                                retries=random_utils.RANDOM_RETRIES,
+                                retry_backoff=random_utils.RANDOM_RETRY_BACKOFF,
+                                call_timeout=RANDOM_CALL_TIMEOUT if fallback is not None else None,
+                                cooldown=RANDOM_BREAKER_COOLDOWN)
@@ -1,26 +1,275 @@
+import atexit
+from datetime import datetime, timezone
+import json
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import os
+import queue
+import random
 import sys
+import threading
+from typing import Optional
 
-from flask import current_app, has_request_context
+from flask import Flask
+from flask.logging import default_handler
 
 
-def configure_logger(logger):
-    logger.setLevel(logging.DEBUG)  # Set the desired logging level here
+# "sync" writes each record to stderr on the calling thread; "queue" hands records to a
+# background thread that formats and writes them
+LOG_MODE = os.getenv("LOG_MODE", "sync")
+# level for every module logger without an entry in LOG_LEVELS
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG")
+# per-module levels, e.g. "meal_max.models.battle_model=WARNING,meal_max.utils=INFO";
+# an entry also covers the modules below it
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+
+# "text" for the plain format below, "json" for one JSON object per line
+LOG_STYLE = os.getenv("LOG_STYLE", "text")
+# per-event sampling rates, e.g. "db.connection_released=0.01,battle.score=0.1"; records tagged
+# with an event are kept with that probability, and warnings and errors are always kept
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# attributes every LogRecord has; anything else on a record came from `extra`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_log_handler: Optional[logging.Handler] = None
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def parse_level(level: str) -> int:
+    """Converts a level name such as "INFO" to its number.
+
+    Raises:
+        ValueError: If the name is not a logging level.
+    """
+    number = logging.getLevelName(level.strip().upper())
+    if not isinstance(number, int):
+        raise ValueError(f"Invalid log level: {level}.")
+    return number
+
+
+def parse_module_levels(spec: str) -> dict[str, int]:
+    """Parses a LOG_LEVELS string of comma-separated `module=LEVEL` entries.
+
+    Args:
+        spec (str): The entries, e.g. "meal_max.models.battle_model=WARNING".
+
+    Returns:
+        dict[str, int]: The level for each module prefix.
+
+    Raises:
+        ValueError: If an entry is malformed or names an unknown level.
+    """
+    levels = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        module, sep, level = entry.partition("=")
+        if not sep or not module.strip():
+            raise ValueError(f"Invalid LOG_LEVELS entry: {entry.strip()}. Expected module=LEVEL.")
+        levels[module.strip()] = parse_level(level)
+    return levels
+
+
+def parse_sample_rates(spec: str) -> dict[str, float]:
+    """Parses a LOG_SAMPLE_RATES string of comma-separated `event=rate` entries.
+
+    Args:
+        spec (str): The entries, e.g. "battle.score=0.1".
+
+    Returns:
+        dict[str, float]: The sampling rate for each event.
+
+    Raises:
+        ValueError: If an entry is malformed or a rate is not between 0 and 1.
+    """
+    rates = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        event, sep, rate = entry.partition("=")
+        try:
+            value = float(rate)
+        except ValueError:
+            value = -1.0
+        if not sep or not event.strip() or not 0 <= value <= 1:
+            raise ValueError(f"Invalid LOG_SAMPLE_RATES entry: {entry.strip()}. Expected event=rate, "
+                             "with rate between 0 and 1.")
+        rates[event.strip()] = value
+    return rates
+
+
+_default_level = parse_level(LOG_LEVEL)
+_module_levels = parse_module_levels(LOG_LEVELS)
+_sample_rates = parse_sample_rates(LOG_SAMPLE_RATES)
+
+
+def get_log_level(name: str) -> int:
+    """Returns the configured level for a logger, from its closest LOG_LEVELS entry.
+
+    Args:
+        name (str): The logger name, usually a module's __name__.
+
+    Returns:
+        int: The logging level.
+    """
+    while name:
+        if name in _module_levels:
+            return _module_levels[name]
+        name = name.rpartition(".")[0]
+    return _default_level
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as a single-line JSON object.
+
+    The object has the time, level, logger and message, plus every field
+    passed through `extra`, such as `event`, `meal_id`, `score` or `latency_ms`.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
 
+
+class SamplingFilter(logging.Filter):
+    """Keeps a configured fraction of the records tagged with each event.
+
+    Records carry their event in `extra={'event': ...}`. Kept records of a
+    sampled event get a `sample_rate` attribute so counts can be scaled
+    back up. Untagged records, warnings and errors always pass.
+
+    Attributes:
+        rates (dict[str, float]): The sampling rate for each event.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._random = random.Random()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(getattr(record, 'event', None))
+        if rate is None or rate >= 1:
+            return True
+        if self._random.random() >= rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+
+def _create_stream_handler(stream=None) -> logging.Handler:
     # Create a console handler that logs to stderr
-    handler = logging.StreamHandler(sys.stderr)
+    handler = logging.StreamHandler(stream if stream is not None else sys.stderr)
     handler.setLevel(logging.DEBUG)
 
-    # Create a formatter with a timestamp
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # Create a formatter with a timestamp, or a JSON one
+    handler.setFormatter(JsonFormatter() if LOG_STYLE == "json" else logging.Formatter(LOG_FORMAT))
+    return handler
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queues records unformatted, so the listener thread does the formatting.
+
+    The stock QueueHandler formats each record before queueing it, which
+    keeps the cost on the logging thread. The queue here never leaves the
+    process, so records can go through as they are.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def get_queue_handler() -> QueueHandler:
+    """Returns the shared queue handler, starting its listener thread on first use.
+
+    Returns:
+        QueueHandler: A handler that only puts records on an in-memory queue.
+    """
+    global _queue_handler, _listener
+    if _queue_handler is None:
+        with _listener_lock:
+            if _queue_handler is None:
+                log_queue = queue.SimpleQueue()
+                _listener = QueueListener(log_queue, _create_stream_handler(), respect_handler_level=True)
+                _listener.start()
+                atexit.register(stop_log_listener)
+                _queue_handler = _DeferredQueueHandler(log_queue)
+    return _queue_handler
+
+
+def stop_log_listener() -> None:
+    """Writes out every queued record and stops the listener thread.
+
+    Called at exit; records logged after it are not written.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def get_log_handler() -> logging.Handler:
+    """Returns the handler every logger shares: the queue handler in queue mode, else one stderr handler.
+
+    Records are sampled per LOG_SAMPLE_RATES before they reach it, on the
+    logging thread, so dropped records are never queued or formatted.
+
+    Returns:
+        logging.Handler: The shared handler, created on first use.
+    """
+    global _log_handler
+    if _log_handler is None:
+        handler = get_queue_handler() if LOG_MODE == "queue" else None
+        with _listener_lock:
+            if _log_handler is None:
+                handler = handler or _create_stream_handler()
+                if _sample_rates:
+                    handler.addFilter(SamplingFilter(_sample_rates))
+                _log_handler = handler
+    return _log_handler
+
+
+def configure_logger(logger):
+    """Sets a logger's configured level and attaches the shared handler.
+
+    Safe to call any number of times: the handler is only attached once,
+    so repeated calls never duplicate log lines.
+
+    Args:
+        logger (logging.Logger): The logger to configure.
+    """
+    logger.setLevel(get_log_level(logger.name))
+    handler = get_log_handler()
+    if handler not in logger.handlers:
+        logger.addHandler(handler)
+
 
-    # Add the formatter to the handler
-    handler.setFormatter(formatter)
+def configure_app_logger(app: Flask) -> None:
+    """Routes the Flask app's log records through the shared handler.
 
-    # Add the handler to the logger
-    logger.addHandler(handler)
+    Replaces Flask's default stderr handler, so app and module records are
+    written by one handler in one format. Call once at startup.
 
-    if has_request_context():
-        app_logger = current_app.logger
-        for handler in app_logger.handlers:
-            logger.addHandler(handler)
\ No newline at end of file
+    Args:
+        app (Flask): The application.
+    """
+    app.logger.removeHandler(default_handler)
+    configure_logger(app.logger)
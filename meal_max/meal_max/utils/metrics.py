@@ -0,0 +1,289 @@
+from bisect import bisect_left
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Optional, Sequence
+
+
+# with "false", `timed` leaves functions undecorated and nothing is recorded
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# upper bounds, in seconds, of the default latency buckets
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# finer buckets for in-process work measured in microseconds
+FAST_LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+
+class LatencyHistogram:
+    """A thread-safe histogram of durations in fixed buckets.
+
+    Each observation is counted in the first bucket whose upper bound it
+    does not exceed, or in the overflow bucket past the last bound.
+
+    Attributes:
+        buckets (tuple[float, ...]): Sorted bucket upper bounds in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        if not buckets or list(buckets) != sorted(set(buckets)):
+            raise ValueError("Histogram buckets must be a non-empty, strictly increasing sequence.")
+
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._max: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Records one duration.
+
+        Args:
+            seconds (float): The duration.
+        """
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+            if self._max is None or seconds > self._max:
+                self._max = seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the bucket counts and totals.
+
+        Returns:
+            dict[str, Any]: `buckets` maps each upper bound (and "+Inf") to the number of
+                observations in that bucket alone; `count`, `sum`, `avg` and `max` cover all of them.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, maximum = self._sum, self._max
+        count = sum(counts)
+        labels = [str(bound) for bound in self.buckets] + ["+Inf"]
+        return {
+            'buckets': dict(zip(labels, counts)),
+            'count': count,
+            'sum': total,
+            'avg': total / count if count else 0.0,
+            'max': maximum,
+        }
+
+    def reset(self) -> None:
+        """Clears every observation."""
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._sum = 0.0
+            self._max = None
+
+    def _totals(self) -> tuple[list[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class Counter:
+    """A thread-safe counter with one value per combination of label values.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): The metric description.
+        labelnames (tuple[str, ...]): The label names, in order.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Adds `amount` to the value for the given label values.
+
+        Args:
+            labels (str): One value per label name.
+            amount (float): How much to add.
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def _render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in values]
+
+
+class Histogram:
+    """A latency histogram with one LatencyHistogram per combination of label values.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): The metric description.
+        labelnames (tuple[str, ...]): The label names, in order.
+        buckets (tuple[float, ...]): Bucket upper bounds in seconds.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._children: dict[tuple[str, ...], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *labels: str) -> LatencyHistogram:
+        """Returns the histogram for the given label values, creating it on first use.
+
+        Args:
+            labels (str): One value per label name.
+
+        Returns:
+            LatencyHistogram: The histogram to observe into.
+        """
+        child = self._children.get(labels)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labels, LatencyHistogram(self.buckets))
+        return child
+
+    def observe(self, seconds: float, *labels: str) -> None:
+        self.labels(*labels).observe(seconds)
+
+    def _render(self) -> list[str]:
+        with self._lock:
+            children = sorted(self._children.items())
+        lines = []
+        for key, child in children:
+            counts, total = child._totals()
+            cumulative = 0
+            for bound, count in zip(list(child.buckets) + ["+Inf"], counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames + ('le',), key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """A value read from a callback each time the metrics are rendered.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): The metric description.
+    """
+
+    def __init__(self, name: str, help: str, callback: Callable[[], Optional[float]]):
+        self.name = name
+        self.help = help
+        self._callback = callback
+
+    def _render(self) -> list[str]:
+        value = self._callback()
+        return [] if value is None else [f"{self.name} {_number(value)}"]
+
+
+class MetricsRegistry:
+    """Holds every metric and renders them in the Prometheus text exposition format.
+
+    Metrics are aggregated in process, so recording one costs a lock and a
+    dictionary lookup; nothing is formatted until `render` is called.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Returns the counter called `name`, creating it if needed."""
+        return self._register(name, lambda: Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        """Returns the histogram called `name`, creating it if needed."""
+        return self._register(name, lambda: Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, callback: Callable[[], Optional[float]]) -> Gauge:
+        """Registers a gauge read from `callback`; a None reading leaves it out of the output."""
+        return self._register(name, lambda: Gauge(name, help, callback))
+
+    def add_histogram(self, name: str, help: str, histogram: LatencyHistogram) -> None:
+        """Exposes an existing unlabeled LatencyHistogram under `name`."""
+        metric = Histogram(name, help, (), histogram.buckets)
+        metric._children[()] = histogram
+        self._register(name, lambda: metric)
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text format, version 0.0.4.
+
+        Returns:
+            str: The exposition text.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            kind = type(metric).__name__.lower()
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {kind}")
+            lines.extend(metric._render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, name: str, create: Callable[[], Any]) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = create()
+            return metric
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+registry = MetricsRegistry()
+
+call_duration = registry.histogram("meal_max_call_duration_seconds", "Time spent in instrumented functions.",
+                                   ("function",), FAST_LATENCY_BUCKETS)
+call_errors = registry.counter("meal_max_call_errors_total", "Instrumented calls that raised.", ("function",))
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """Decorates a function to record its duration and errors under `name`.
+
+    Args:
+        name (str): The value of the `function` label, e.g. "kitchen_model.get_meal_by_id".
+
+    Returns:
+        Callable: The decorator; it returns the function unchanged when METRICS_ENABLED is false.
+    """
+    def decorator(func: Callable) -> Callable:
+        if not METRICS_ENABLED:
+            return func
+        histogram = call_duration.labels(name)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                call_errors.inc(name)
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
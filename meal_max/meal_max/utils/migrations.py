@@ -0,0 +1,127 @@
+"""Versioned schema migrations for the meals database.
+
+Migrations are numbered SQL scripts in SQL_MIGRATIONS_PATH, named
+`NNN_description.sql`. The database's `PRAGMA user_version` records the
+last one applied, and each pending script runs in its own transaction
+together with the version bump, so a failed migration leaves the schema
+at the previous version.
+
+Run `python -m meal_max.utils.migrations` to bring DB_PATH up to date.
+"""
+import logging
+import os
+import re
+import sqlite3
+from typing import Optional
+
+from meal_max.utils.logger import configure_logger
+from meal_max.utils import sql_utils
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+SQL_MIGRATIONS_PATH = os.getenv("SQL_MIGRATIONS_PATH", "/app/sql/migrations")
+
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d+)_\w+\.sql$")
+
+
+def list_migrations(migrations_dir: Optional[str] = None) -> list[tuple[int, str]]:
+    """Lists the migration scripts in version order.
+
+    Args:
+        migrations_dir (Optional[str]): Directory holding the scripts; SQL_MIGRATIONS_PATH if None.
+
+    Returns:
+        list[tuple[int, str]]: (version, path) pairs, lowest version first.
+
+    Raises:
+        ValueError: If two scripts share a version number.
+    """
+    migrations_dir = migrations_dir or SQL_MIGRATIONS_PATH
+    migrations = {}
+    for filename in sorted(os.listdir(migrations_dir)):
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version}: {filename}")
+        migrations[version] = os.path.join(migrations_dir, filename)
+    return sorted(migrations.items())
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Returns the version of the last migration applied to a database.
+
+    Args:
+        conn (sqlite3.Connection): A connection to the database.
+
+    Returns:
+        int: The schema version, 0 for a database no migration has run on.
+    """
+    return conn.execute("PRAGMA user_version;").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection, migrations_dir: Optional[str] = None) -> list[int]:
+    """Applies every migration newer than the database's schema version.
+
+    Scripts should be idempotent (IF NOT EXISTS / IF EXISTS), since two
+    processes starting together may both see a migration as pending.
+
+    Args:
+        conn (sqlite3.Connection): A connection to the database.
+        migrations_dir (Optional[str]): Directory holding the scripts; SQL_MIGRATIONS_PATH if None.
+
+    Returns:
+        list[int]: The versions applied, in order; empty if the schema was already current.
+
+    Raises:
+        sqlite3.Error: If a migration fails. Earlier migrations stay applied.
+    """
+    current = get_schema_version(conn)
+    applied = []
+    for version, path in list_migrations(migrations_dir):
+        if version <= current:
+            continue
+        with open(path, "r") as fh:
+            script = fh.read()
+        logger.info("Applying migration %s", os.path.basename(path))
+        try:
+            conn.executescript(f"BEGIN;\n{script}\n;PRAGMA user_version = {version};\nCOMMIT;")
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error("Database error while applying migration %s: %s", os.path.basename(path), str(e))
+            raise e
+        applied.append(version)
+
+    if applied:
+        logger.info("Schema migrated from version %d to %d", current, applied[-1])
+    else:
+        logger.info("Schema is up to date at version %d", current)
+    return applied
+
+
+def migrate(db_path: Optional[str] = None, migrations_dir: Optional[str] = None) -> list[int]:
+    """Brings a database file up to the latest schema version.
+
+    Args:
+        db_path (Optional[str]): Path to the database; DB_PATH if None.
+        migrations_dir (Optional[str]): Directory holding the scripts; SQL_MIGRATIONS_PATH if None.
+
+    Returns:
+        list[int]: The versions applied, in order.
+
+    Raises:
+        sqlite3.Error: If a migration fails.
+    """
+    conn = sql_utils.open_connection(db_path or sql_utils.DB_PATH)
+    try:
+        return apply_migrations(conn, migrations_dir)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    migrate()
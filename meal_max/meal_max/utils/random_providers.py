@@ -0,0 +1,303 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import logging
+import os
+import random
+import secrets
+import threading
+import time
+from typing import Any, Optional
+
+from meal_max.utils import random_utils
+from meal_max.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# which source battles draw from: 'random_org', 'local' or 'seeded'
+RANDOM_PROVIDER = os.getenv("RANDOM_PROVIDER", "random_org")
+RANDOM_SEED = int(os.getenv("RANDOM_SEED", "0"))
+# where random.org draws fail over to: 'local', 'seeded' or 'none' to surface errors instead
+RANDOM_FALLBACK = os.getenv("RANDOM_FALLBACK", "local")
+
+# circuit breaker settings for the remote provider
+RANDOM_BREAKER_LATENCY = float(os.getenv("RANDOM_BREAKER_LATENCY", "0.5"))
+RANDOM_BREAKER_ERROR_RATE = float(os.getenv("RANDOM_BREAKER_ERROR_RATE", "0.5"))
+RANDOM_BREAKER_WINDOW = int(os.getenv("RANDOM_BREAKER_WINDOW", "20"))
+RANDOM_BREAKER_COOLDOWN = float(os.getenv("RANDOM_BREAKER_COOLDOWN", "30.0"))
+RANDOM_CALL_TIMEOUT = float(os.getenv("RANDOM_CALL_TIMEOUT", "1.0"))
+
+
+class RandomProvider(ABC):
+    """Interface for the sources of randomness a battle can draw from.
+
+    Every provider returns numbers between 0 and 1 with two decimal places,
+    the same distribution random.org's decimal-fractions endpoint serves.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def get_random(self) -> float:
+        """Returns a single random number between 0 and 1."""
+
+    def get_randoms(self, num: int) -> list[float]:
+        """Returns `num` random numbers between 0 and 1.
+
+        Args:
+            num (int): How many numbers to draw.
+
+        Returns:
+            list[float]: The drawn numbers.
+        """
+        return [self.get_random() for _ in range(num)]
+
+
+class RandomOrgProvider(RandomProvider):
+    """Draws from random.org through the shared prefetch buffer."""
+
+    name = "random_org"
+
+    def get_random(self) -> float:
+        return random_utils.get_random()
+
+    def get_randoms(self, num: int) -> list[float]:
+        # large draws go straight to random.org in full batches rather than draining the buffer
+        numbers = []
+        while len(numbers) < num:
+            numbers.extend(random_utils.fetch_random_numbers(min(num - len(numbers), random_utils.MAX_BATCH_SIZE)))
+        return numbers
+
+
+class LocalRandomProvider(RandomProvider):
+    """Draws from the operating system's CSPRNG (`secrets`, backed by os.urandom)."""
+
+    name = "local"
+
+    def get_random(self) -> float:
+        return secrets.randbelow(100) / 100
+
+
+class SeededRandomProvider(RandomProvider):
+    """Draws a reproducible sequence from a seeded PRNG.
+
+    Attributes:
+        seed (int): The seed the sequence starts from.
+    """
+
+    name = "seeded"
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def get_random(self) -> float:
+        with self._lock:
+            return self._rng.randrange(100) / 100
+
+
+class CircuitBreakerProvider(RandomProvider):
+    """Wraps a remote provider and fails over to a local one when it misbehaves.
+
+    Each call to the primary provider is recorded as a failure if it raises
+    or takes longer than `latency_threshold`. Once the failure rate over the
+    last `window` calls exceeds `error_rate_threshold` the breaker opens and
+    every draw goes to the fallback for `cooldown` seconds, after which a
+    single trial call decides whether to close it again. A draw that fails
+    or exceeds `call_timeout` is answered by the fallback, so a remote
+    outage never fails a battle and never holds it for longer than the timeout.
+
+    Attributes:
+        primary (RandomProvider): The provider used while the breaker is closed.
+        fallback (RandomProvider): The provider used while it is open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, primary: RandomProvider, fallback: RandomProvider,
+                 latency_threshold: float = 0.5, error_rate_threshold: float = 0.5,
+                 window: int = 20, cooldown: float = 30.0, call_timeout: Optional[float] = 1.0):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = f"{primary.name}+{fallback.name}"
+        self.latency_threshold = latency_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.call_timeout = call_timeout
+
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="random-provider")
+
+        self._primary_calls = 0
+        self._failures = 0
+        self._fallbacks = 0
+
+    @property
+    def state(self) -> str:
+        """The breaker state: 'closed', 'open' or 'half_open'."""
+        with self._lock:
+            return self._state
+
+    def get_random(self) -> float:
+        return self._draw(lambda provider: provider.get_random())
+
+    def get_randoms(self, num: int) -> list[float]:
+        return self._draw(lambda provider: provider.get_randoms(num))
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the breaker state and call counters.
+
+        Returns:
+            dict[str, Any]: A snapshot of the breaker's metrics.
+        """
+        with self._lock:
+            return {
+                'state': self._state,
+                'primary': self.primary.name,
+                'fallback': self.fallback.name,
+                'primary_calls': self._primary_calls,
+                'failures': self._failures,
+                'fallbacks': self._fallbacks,
+                'window_failure_rate': self._failure_rate(),
+            }
+
+    def _draw(self, call):
+        if not self._allow_primary():
+            with self._lock:
+                self._fallbacks += 1
+            return call(self.fallback)
+
+        start = time.perf_counter()
+        try:
+            if self.call_timeout is None:
+                result = call(self.primary)
+            else:
+                # a call that overruns keeps going in the background, e.g. to finish refilling the buffer
+                result = self._executor.submit(call, self.primary).result(timeout=self.call_timeout)
+        except FutureTimeoutError:
+            logger.warning("%s provider exceeded %.3fs, using %s", self.primary.name, self.call_timeout,
+                           self.fallback.name)
+            self._record(False)
+        except (RuntimeError, ValueError) as e:
+            logger.warning("%s provider failed (%s), using %s", self.primary.name, e, self.fallback.name)
+            self._record(False)
+        else:
+            self._record(time.perf_counter() - start <= self.latency_threshold)
+            return result
+
+        with self._lock:
+            self._fallbacks += 1
+        return call(self.fallback)
+
+    def _allow_primary(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                logger.info("Circuit breaker half-open, trying %s again", self.primary.name)
+                self._state = self.HALF_OPEN
+                return True
+            # while half-open only the single trial call goes to the primary
+            return False
+
+    def _record(self, ok: bool) -> None:
+        with self._lock:
+            self._primary_calls += 1
+            if not ok:
+                self._failures += 1
+
+            if self._state == self.HALF_OPEN:
+                if ok:
+                    logger.info("Circuit breaker closed, %s recovered", self.primary.name)
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+
+            self._outcomes.append(ok)
+            if len(self._outcomes) == self.window and self._failure_rate() > self.error_rate_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        """Opens the breaker. Caller holds the lock."""
+        logger.error("Circuit breaker open, falling back to %s for %.1fs", self.fallback.name, self.cooldown)
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+
+PROVIDERS = ("random_org", "local", "seeded")
+
+
+def create_random_provider(name: str, seed: int = 0) -> RandomProvider:
+    """Builds a provider by name.
+
+    Args:
+        name (str): One of 'random_org', 'local' or 'seeded'.
+        seed (int): The seed for the 'seeded' provider.
+
+    Returns:
+        RandomProvider: The requested provider.
+
+    Raises:
+        ValueError: If `name` is not a known provider.
+    """
+    if name == "random_org":
+        return RandomOrgProvider()
+    if name == "local":
+        return LocalRandomProvider()
+    if name == "seeded":
+        return SeededRandomProvider(seed)
+    raise ValueError(f"Invalid random provider: {name}. Must be one of {PROVIDERS}.")
+
+
+_provider: Optional[RandomProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_random_provider() -> RandomProvider:
+    """Returns the configured process-wide provider, creating it on first use.
+
+    random.org is wrapped in a circuit breaker that fails over to
+    RANDOM_FALLBACK unless that is set to 'none'.
+
+    Returns:
+        RandomProvider: The shared provider.
+
+    Raises:
+        ValueError: If RANDOM_PROVIDER or RANDOM_FALLBACK is not a known provider.
+    """
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                provider = create_random_provider(RANDOM_PROVIDER, RANDOM_SEED)
+                if isinstance(provider, RandomOrgProvider) and RANDOM_FALLBACK != "none":
+                    provider = CircuitBreakerProvider(
+                        provider,
+                        create_random_provider(RANDOM_FALLBACK, RANDOM_SEED),
+                        latency_threshold=RANDOM_BREAKER_LATENCY,
+                        error_rate_threshold=RANDOM_BREAKER_ERROR_RATE,
+                        window=RANDOM_BREAKER_WINDOW,
+                        cooldown=RANDOM_BREAKER_COOLDOWN,
+                        call_timeout=RANDOM_CALL_TIMEOUT,
+                    )
+                logger.info("Using random provider: %s", provider.name)
+                _provider = provider
+    return _provider
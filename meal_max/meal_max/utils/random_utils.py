@@ -1,42 +1,199 @@
+from collections import deque
 import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from meal_max.utils.logger import configure_logger
+from meal_max.utils.metrics import LatencyHistogram, registry, timed
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
-def get_random() -> float:
-    """Fetches a random decimal number from random.org.
+# base URL of the decimal-fractions endpoint; point it at a local stand-in for testing
+RANDOM_ORG_URL = os.getenv("RANDOM_ORG_URL", "https://www.random.org/decimal-fractions/")
+
+# how many numbers to fetch per random.org request; 0 fetches one number per call
+RANDOM_BUFFER_SIZE = int(os.getenv("RANDOM_BUFFER_SIZE", "100"))
+# a background refill starts once the buffer drops below this many numbers
+RANDOM_BUFFER_LOW_WATER = int(os.getenv("RANDOM_BUFFER_LOW_WATER", "20"))
+
+# random.org caps decimal-fractions requests at this many numbers
+MAX_BATCH_SIZE = 10000
+
+# keep-alive connections held open to random.org
+RANDOM_MAX_CONNECTIONS = int(os.getenv("RANDOM_MAX_CONNECTIONS", "10"))
+# seconds to establish a connection, and to wait for the response once connected
+RANDOM_CONNECT_TIMEOUT = float(os.getenv("RANDOM_CONNECT_TIMEOUT", "3.05"))
+RANDOM_READ_TIMEOUT = float(os.getenv("RANDOM_READ_TIMEOUT", "5"))
+# retries after a connection error or 429/5xx response, with exponential backoff; read timeouts
+# are not retried, so a slow upstream fails within RANDOM_READ_TIMEOUT and trips the circuit breaker
+RANDOM_RETRIES = int(os.getenv("RANDOM_RETRIES", "2"))
+RANDOM_RETRY_BACKOFF = float(os.getenv("RANDOM_RETRY_BACKOFF", "0.2"))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
 
-    Sends a request to random.org to retrieve a random decimal number with two decimal places.
+_http_lock = threading.Lock()
+_http_requests = 0
+_http_failures = 0
+_http_retries = 0
+request_latency = LatencyHistogram()
+registry.add_histogram("meal_max_random_org_request_seconds", "Duration of random.org requests, retries included.",
+                       request_latency)
+
+
+def get_session() -> requests.Session:
+    """Returns the process-wide random.org session, creating it on first use.
+
+    The session keeps up to RANDOM_MAX_CONNECTIONS connections alive, so
+    requests after the first skip the TCP and TLS handshakes. Connection
+    errors and 429/5xx responses are retried RANDOM_RETRIES times with
+    exponential backoff.
 
     Returns:
-        float: A random number between 0 and 1, with two decimal places.
+        requests.Session: The shared session.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=RANDOM_RETRIES,
+                    read=False,
+                    backoff_factor=RANDOM_RETRY_BACKOFF,
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=frozenset(["GET"]),
+                    # hand the last response back so raise_for_status reports its status
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=RANDOM_MAX_CONNECTIONS, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def close_session() -> None:
+    """Closes the shared session's pooled connections; the next request opens a new session."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_http_stats() -> dict[str, Any]:
+    """Returns request counts, connections opened and the latency histogram for random.org.
+
+    While keep-alive is working `connections_opened` stays near the pool
+    size however many requests are made.
+
+    Returns:
+        dict[str, Any]: A snapshot of the HTTP metrics.
+    """
+    with _http_lock:
+        stats = {'requests': _http_requests, 'failures': _http_failures, 'retries': _http_retries}
+    stats['connections_opened'] = _connections_opened()
+    stats['latency_seconds'] = request_latency.snapshot()
+    return stats
+
+
+def _connections_opened() -> int:
+    with _session_lock:
+        session = _session
+    if session is None:
+        return 0
+    pools = session.get_adapter(RANDOM_ORG_URL).poolmanager.pools
+    opened = 0
+    for key in pools.keys():
+        pool = pools.get(key)
+        if pool is not None:
+            opened += pool.num_connections
+    return opened
+
+
+def _record_request(seconds: float, failed: bool, retries: int) -> None:
+    global _http_requests, _http_failures, _http_retries
+    request_latency.observe(seconds)
+    with _http_lock:
+        _http_requests += 1
+        _http_failures += failed
+        _http_retries += retries
+
+
+def random_org_url(num: int) -> str:
+    """Builds the random.org request URL for `num` two-decimal fractions, one per line.
 
     Raises:
+        ValueError: If `num` is out of range.
+    """
+    if not 1 <= num <= MAX_BATCH_SIZE:
+        raise ValueError(f"Invalid batch size: {num}. Must be between 1 and {MAX_BATCH_SIZE}.")
+    return f"{RANDOM_ORG_URL}?num={num}&dec=2&col=1&format=plain&rnd=new"
+
+
+def parse_random_numbers(text: str, num: int) -> list[float]:
+    """Parses a plain-text random.org response.
+
+    Args:
+        text (str): The response body.
+        num (int): How many numbers were requested.
+
+    Returns:
+        list[float]: The numbers.
+
+    Raises:
+        ValueError: If the body is not exactly `num` decimal numbers.
+    """
+    try:
+        random_numbers = [float(value) for value in text.split()]
+    except ValueError:
+        raise ValueError("Invalid response from random.org: %s" % text.strip())
+    if len(random_numbers) != num:
+        raise ValueError("Invalid response from random.org: %s" % text.strip())
+    return random_numbers
+
+
+def fetch_random_numbers(num: int) -> list[float]:
+    """Fetches a batch of random decimal numbers from random.org.
+
+    Args:
+        num (int): How many numbers to fetch, between 1 and 10,000.
+
+    Returns:
+        list[float]: `num` random numbers between 0 and 1, with two decimal places.
+
+    Raises:
+        ValueError: If `num` is out of range or the response is not a list of decimal numbers.
         RuntimeError: If the request to random.org fails or times out.
-        ValueError: If the response from random.org is not a valid decimal number.
     """
-    url = "https://www.random.org/decimal-fractions/?num=1&dec=2&col=1&format=plain&rnd=new"
+    url = random_org_url(num)
+    start = time.perf_counter()
+    failed, retries = True, 0
 
     try:
         logger.info("Fetching random number from %s", url)
-        response = requests.get(url, timeout=5)
+        response = get_session().get(url, timeout=(RANDOM_CONNECT_TIMEOUT, RANDOM_READ_TIMEOUT))
+        retries = _retries_used(response)
 
         # Check if the request was successful
         response.raise_for_status()
 
-        random_number_str = response.text.strip()
+        random_numbers = parse_random_numbers(response.text, num)
+        failed = False
 
-        try:
-            random_number = float(random_number_str)
-        except ValueError:
-            raise ValueError("Invalid response from random.org: %s" % random_number_str)
-
-        logger.info("Received random number: %.3f", random_number)
-        return random_number
+        logger.info("Received %d random numbers", len(random_numbers))
+        return random_numbers
 
     except requests.exceptions.Timeout:
         logger.error("Request to random.org timed out.")
@@ -45,3 +202,198 @@ def get_random() -> float:
     except requests.exceptions.RequestException as e:
         logger.error("Request to random.org failed: %s", e)
         raise RuntimeError("Request to random.org failed: %s" % e)
+
+    finally:
+        _record_request(time.perf_counter() - start, failed, retries)
+
+
+def _retries_used(response: requests.Response) -> int:
+    retries = getattr(getattr(response, 'raw', None), 'retries', None)
+    history = getattr(retries, 'history', None)
+    return len(history) if isinstance(history, tuple) else 0
+
+
+class RandomBuffer:
+    """An in-process buffer of prefetched random numbers.
+
+    Numbers are fetched in batches and served from memory. Once the buffer
+    drops below its low-water mark a refill runs on a background thread, so
+    callers only wait on the network when the buffer runs dry (a miss).
+
+    Attributes:
+        batch_size (int): How many numbers each refill fetches.
+        low_water (int): Depth below which a background refill is started.
+    """
+
+    def __init__(self, batch_size: int, low_water: int,
+                 fetch: Callable[[int], list[float]] = fetch_random_numbers, background: bool = True):
+        if not 1 <= batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"Invalid batch size: {batch_size}. Must be between 1 and {MAX_BATCH_SIZE}.")
+
+        self.batch_size = batch_size
+        self.low_water = min(max(low_water, 0), batch_size)
+        self._fetch = fetch
+        self._background = background
+
+        self._numbers: deque[float] = deque()
+        self._cond = threading.Condition()
+        self._refilling = False
+
+        self._hits = 0
+        self._misses = 0
+        self._refills = 0
+        self._refill_errors = 0
+        self._last_refill_seconds = 0.0
+        self._total_refill_seconds = 0.0
+
+    def get(self) -> float:
+        """Returns the next buffered random number, refilling first if the buffer is empty.
+
+        Returns:
+            float: A random number between 0 and 1.
+
+        Raises:
+            RuntimeError: If the buffer is empty and the refill request fails.
+            ValueError: If the buffer is empty and random.org returns an invalid response.
+        """
+        with self._cond:
+            if self._numbers:
+                self._hits += 1
+            else:
+                self._misses += 1
+                logger.warning("Random number buffer empty, waiting for a refill")
+                while not self._numbers:
+                    if self._refilling:
+                        self._cond.wait()
+                    else:
+                        self._refilling = True
+                        self._cond.release()
+                        try:
+                            self._refill()
+                        finally:
+                            self._cond.acquire()
+            number = self._numbers.popleft()
+            start_background = (
+                self._background and not self._refilling and len(self._numbers) < self.low_water
+            )
+            if start_background:
+                self._refilling = True
+
+        if start_background:
+            threading.Thread(target=self._refill_quietly, name="random-buffer-refill", daemon=True).start()
+        return number
+
+    def refill(self) -> None:
+        """Fetches a batch synchronously, e.g. to warm the buffer at startup.
+
+        Does nothing if a refill is already in flight.
+
+        Raises:
+            RuntimeError: If the request to random.org fails or times out.
+            ValueError: If random.org returns an invalid response.
+        """
+        with self._cond:
+            if self._refilling:
+                return
+            self._refilling = True
+        self._refill()
+
+    def stats(self) -> dict[str, Any]:
+        """Returns buffer depth, hit/miss counts and refill latency.
+
+        Returns:
+            dict[str, Any]: A snapshot of the buffer's metrics.
+        """
+        with self._cond:
+            return {
+                'depth': len(self._numbers),
+                'batch_size': self.batch_size,
+                'low_water': self.low_water,
+                'hits': self._hits,
+                'misses': self._misses,
+                'refills': self._refills,
+                'refill_errors': self._refill_errors,
+                'refill_in_flight': self._refilling,
+                'last_refill_seconds': self._last_refill_seconds,
+                'avg_refill_seconds': self._total_refill_seconds / self._refills if self._refills else 0.0,
+            }
+
+    def _refill(self) -> None:
+        """Fetches one batch into the buffer. The caller must have set `_refilling`."""
+        start = time.perf_counter()
+        try:
+            numbers = self._fetch(self.batch_size)
+        except Exception:
+            with self._cond:
+                self._refill_errors += 1
+                self._refilling = False
+                self._cond.notify_all()
+            raise
+
+        elapsed = time.perf_counter() - start
+        with self._cond:
+            self._numbers.extend(numbers)
+            self._refills += 1
+            self._last_refill_seconds = elapsed
+            self._total_refill_seconds += elapsed
+            self._refilling = False
+            self._cond.notify_all()
+        logger.info("Refilled random number buffer with %d numbers in %.3fs", len(numbers), elapsed)
+
+    def _refill_quietly(self) -> None:
+        try:
+            self._refill()
+        except (RuntimeError, ValueError) as e:
+            # the next miss retries synchronously and surfaces the error to its caller
+            logger.error("Background refill of random number buffer failed: %s", e)
+
+
+_buffer: Optional[RandomBuffer] = None
+_buffer_lock = threading.Lock()
+
+
+def get_random_buffer() -> RandomBuffer:
+    """Returns the process-wide random number buffer, creating it on first use.
+
+    Returns:
+        RandomBuffer: The shared buffer.
+    """
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = RandomBuffer(min(RANDOM_BUFFER_SIZE, MAX_BATCH_SIZE), RANDOM_BUFFER_LOW_WATER)
+    return _buffer
+
+
+def get_random_buffer_stats() -> Optional[dict[str, Any]]:
+    """Returns the shared buffer's metrics, or None if buffering is disabled.
+
+    Returns:
+        Optional[dict[str, Any]]: See `RandomBuffer.stats`.
+    """
+    if RANDOM_BUFFER_SIZE <= 0:
+        return None
+    return get_random_buffer().stats()
+
+
+@timed("random_utils.get_random")
+def get_random() -> float:
+    """Returns a random decimal number from random.org.
+
+    Numbers come from the shared prefetch buffer, which fetches
+    `RANDOM_BUFFER_SIZE` numbers per request. With RANDOM_BUFFER_SIZE=0 each
+    call makes its own request for a single number.
+
+    Returns:
+        float: A random number between 0 and 1, with two decimal places.
+
+    Raises:
+        RuntimeError: If the request to random.org fails or times out.
+        ValueError: If the response from random.org is not a valid decimal number.
+    """
+    if RANDOM_BUFFER_SIZE <= 0:
+        random_number = fetch_random_numbers(1)[0]
+        logger.info("Received random number: %.3f", random_number)
+        return random_number
+    return get_random_buffer().get()
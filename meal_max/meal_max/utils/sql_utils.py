@@ -1,9 +1,16 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+import functools
 import logging
 import os
 import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
 
 from meal_max.utils.logger import configure_logger
+from meal_max.utils.metrics import FAST_LATENCY_BUCKETS, METRICS_ENABLED, registry
 
 
 logger = logging.getLogger(__name__)
@@ -13,6 +20,28 @@ configure_logger(logger)
 # load the db path from the environment with a default value
 DB_PATH = os.getenv("DB_PATH", "/app/sql/meal_max.db")
 
+# connection pool settings; set DB_POOL_DISABLED=true to open a fresh connection per call
+DB_POOL_DISABLED = os.getenv("DB_POOL_DISABLED", "false").lower() == "true"
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5.0"))
+DB_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "30.0"))
+# threads async callers hand blocking database work to; more than the pool size would only queue on the pool
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", str(DB_POOL_SIZE)))
+
+# PRAGMA profile applied to every new connection; DB_PRAGMA_PROFILE=default leaves SQLite's defaults alone
+DB_PRAGMA_PROFILE = os.getenv("DB_PRAGMA_PROFILE", "performance")
+DB_JOURNAL_MODE = os.getenv("DB_JOURNAL_MODE", "WAL")
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+DB_CACHE_SIZE = int(os.getenv("DB_CACHE_SIZE", "-20000"))  # negative values are KiB, so ~20MB
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+DB_BUSY_TIMEOUT = int(os.getenv("DB_BUSY_TIMEOUT", "5000"))  # milliseconds
+DB_TEMP_STORE = os.getenv("DB_TEMP_STORE", "MEMORY")
+
+PRAGMA_PROFILES = ("performance", "default")
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+TEMP_STORE_MODES = ("DEFAULT", "FILE", "MEMORY")
+
 
 def check_database_connection():
     try:
@@ -37,6 +66,363 @@ def check_table_exists(tablename: str):
         logger.error(error_message)
         raise Exception(error_message) from e
 
+
+def get_pragma_settings() -> dict[str, Any]:
+    """Returns the PRAGMA values the configured profile applies to new connections.
+
+    Returns:
+        dict[str, Any]: PRAGMA names mapped to their configured values, empty for the 'default' profile.
+
+    Raises:
+        ValueError: If the profile or any of its settings is not a recognised SQLite value.
+    """
+    profile = DB_PRAGMA_PROFILE.lower()
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(f"Invalid PRAGMA profile: {DB_PRAGMA_PROFILE}. Must be one of {PRAGMA_PROFILES}.")
+    if profile == "default":
+        return {}
+
+    settings = {
+        'journal_mode': DB_JOURNAL_MODE.upper(),
+        'synchronous': DB_SYNCHRONOUS.upper(),
+        'cache_size': DB_CACHE_SIZE,
+        'mmap_size': DB_MMAP_SIZE,
+        'busy_timeout': DB_BUSY_TIMEOUT,
+        'temp_store': DB_TEMP_STORE.upper(),
+    }
+    # PRAGMA values cannot be bound as parameters, so only known keywords are let through
+    if settings['journal_mode'] not in JOURNAL_MODES:
+        raise ValueError(f"Invalid journal mode: {DB_JOURNAL_MODE}. Must be one of {JOURNAL_MODES}.")
+    if settings['synchronous'] not in SYNCHRONOUS_MODES:
+        raise ValueError(f"Invalid synchronous mode: {DB_SYNCHRONOUS}. Must be one of {SYNCHRONOUS_MODES}.")
+    if settings['temp_store'] not in TEMP_STORE_MODES:
+        raise ValueError(f"Invalid temp store: {DB_TEMP_STORE}. Must be one of {TEMP_STORE_MODES}.")
+    return settings
+
+
+def apply_pragma_profile(conn: sqlite3.Connection) -> None:
+    """Applies the configured PRAGMA profile to a connection.
+
+    journal_mode is persisted in the database file, the rest are per connection.
+
+    Args:
+        conn (sqlite3.Connection): The connection to configure.
+    """
+    for name, value in get_pragma_settings().items():
+        conn.execute(f"PRAGMA {name} = {value};")
+
+
+def open_connection(db_path: str, **kwargs) -> sqlite3.Connection:
+    """Opens a connection to `db_path` with the PRAGMA profile applied.
+
+    Args:
+        db_path (str): Path to the SQLite database file.
+        **kwargs: Passed through to `sqlite3.connect`.
+
+    Returns:
+        sqlite3.Connection: The configured connection.
+    """
+    conn = sqlite3.connect(db_path, **kwargs)
+    try:
+        apply_pragma_profile(conn)
+    except (sqlite3.Error, ValueError):
+        conn.close()
+        raise
+    return conn
+
+
+def get_pragma_profile() -> dict[str, Any]:
+    """Reads back the PRAGMA settings in effect on a pooled connection.
+
+    Returns:
+        dict[str, Any]: The profile name, the effective PRAGMA values and the
+            read/write concurrency they give.
+
+    Raises:
+        sqlite3.Error: For any database errors.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        effective = {}
+        for name in ('journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'busy_timeout', 'temp_store'):
+            cursor.execute(f"PRAGMA {name};")
+            row = cursor.fetchone()
+            # mmap_size reports nothing when the build has memory-mapped I/O disabled
+            effective[name] = row[0] if row else None
+
+    # synchronous and temp_store are reported as their numeric codes
+    if isinstance(effective['synchronous'], int):
+        effective['synchronous'] = SYNCHRONOUS_MODES[effective['synchronous']]
+    if isinstance(effective['temp_store'], int):
+        effective['temp_store'] = TEMP_STORE_MODES[effective['temp_store']]
+    effective['journal_mode'] = str(effective['journal_mode']).upper()
+
+    if effective['journal_mode'] == "WAL":
+        concurrency = "readers run concurrently with a single writer"
+    else:
+        concurrency = "writers block readers for the duration of each write"
+
+    return {'profile': DB_PRAGMA_PROFILE.lower(), 'pragmas': effective, 'concurrency': concurrency}
+
+
+class ConnectionPool:
+    """A thread-safe pool of reusable SQLite connections.
+
+    Connections are opened lazily up to `size` and handed back to the pool
+    instead of being closed. A thread that checks a connection back in gets
+    that same connection again on its next checkout if it is still idle,
+    which keeps SQLite's per-connection page cache warm for that thread.
+
+    Attributes:
+        db_path (str): Path to the SQLite database file.
+        size (int): Maximum number of open connections.
+        timeout (float): Seconds to wait for a free connection before giving up.
+        health_check_interval (float): Connections idle for longer than this
+            many seconds are checked with `SELECT 1` before being handed out.
+    """
+
+    def __init__(self, db_path: str, size: int = 5, timeout: float = 5.0,
+                 health_check_interval: float = 30.0):
+        if size < 1:
+            raise ValueError(f"Invalid pool size: {size}. Pool size must be at least 1.")
+
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle: list[tuple[sqlite3.Connection, float]] = []
+        self._opened = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._local = threading.local()
+
+    def acquire(self) -> sqlite3.Connection:
+        """Checks a connection out of the pool, opening a new one if needed.
+
+        Returns:
+            sqlite3.Connection: A connection reserved for the caller until it is released.
+
+        Raises:
+            sqlite3.OperationalError: If the pool is closed or no connection frees up within `timeout`.
+            sqlite3.Error: If a new connection cannot be opened.
+        """
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise sqlite3.OperationalError("Connection pool is closed")
+                entry = self._take_idle()
+                if entry is not None:
+                    break
+                if self._opened < self.size:
+                    self._opened += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.error("Timed out waiting for a database connection from the pool")
+                    raise sqlite3.OperationalError("Timed out waiting for a database connection")
+                self._cond.wait(remaining)
+
+        if entry is not None:
+            conn, released_at = entry
+            if time.monotonic() - released_at < self.health_check_interval or self.is_healthy(conn):
+                self._local.conn = conn
+                return conn
+            logger.warning("Discarding unhealthy pooled database connection")
+            self._close(conn)
+
+        # either the pool had room or we replaced an unhealthy connection; the slot is already counted
+        try:
+            conn = self._connect()
+        except sqlite3.Error:
+            with self._cond:
+                self._opened -= 1
+                self._cond.notify()
+            raise
+        self._local.conn = conn
+        return conn
+
+    def release(self, conn: sqlite3.Connection, discard: bool = False) -> None:
+        """Returns a connection to the pool.
+
+        Any transaction the caller left open is rolled back, matching what
+        closing the connection would have done.
+
+        Args:
+            conn (sqlite3.Connection): The connection to return.
+            discard (bool): Close the connection instead of pooling it.
+        """
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error as e:
+                logger.warning("Failed to reset pooled connection, discarding it: %s", str(e))
+                discard = True
+
+        with self._cond:
+            if discard or self._closed:
+                self._opened -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+        if discard or self._closed:
+            self._close(conn)
+
+    def close(self) -> None:
+        """Closes all idle connections and refuses further checkouts.
+
+        Connections that are checked out are closed when they are released.
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close(conn)
+
+    def stats(self) -> dict[str, int]:
+        """Returns a snapshot of the pool's occupancy.
+
+        Returns:
+            dict[str, int]: The pool size and the number of open, idle and in-use connections.
+        """
+        with self._cond:
+            return {
+                'size': self.size,
+                'open': self._opened,
+                'idle': len(self._idle),
+                'in_use': self._opened - len(self._idle),
+            }
+
+    def _take_idle(self) -> Optional[tuple[sqlite3.Connection, float]]:
+        """Pops an idle connection, preferring the one this thread used last. Caller holds the lock."""
+        preferred = getattr(self._local, "conn", None)
+        if preferred is not None:
+            for index, entry in enumerate(self._idle):
+                if entry[0] is preferred:
+                    return self._idle.pop(index)
+        if self._idle:
+            return self._idle.pop()
+        return None
+
+    def _connect(self) -> sqlite3.Connection:
+        # connections move between request threads, but the pool guarantees exclusive use
+        conn = open_connection(self.db_path, check_same_thread=False)
+        logger.info("Opened pooled database connection to %s", self.db_path)
+        return conn
+
+    @staticmethod
+    def is_healthy(conn: sqlite3.Connection) -> bool:
+        """Returns True if the connection can still run a trivial query."""
+        try:
+            conn.execute("SELECT 1;").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @staticmethod
+    def _close(conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+            logger.info("Database connection closed.", extra={'event': 'db.connection_closed'})
+        except sqlite3.Error as e:
+            logger.warning("Error closing database connection: %s", str(e))
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """Returns the process-wide connection pool, creating it on first use.
+
+    Returns:
+        ConnectionPool: The shared pool for `DB_PATH`.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT,
+                                       health_check_interval=DB_POOL_HEALTH_CHECK_INTERVAL)
+                logger.info("Created database connection pool of size %d", DB_POOL_SIZE)
+    return _pool
+
+
+def close_connection_pool() -> None:
+    """Closes the process-wide connection pool.
+
+    The next call to `get_db_connection` creates a fresh pool, so this is
+    also how to pick up a changed `DB_PATH`.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+        logger.info("Database connection pool closed.")
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Returns the process-wide executor for blocking database work, creating it on first use.
+
+    Returns:
+        ThreadPoolExecutor: An executor with DB_EXECUTOR_WORKERS threads.
+    """
+    global _executor
+    if _executor is None:
+        with _pool_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+                logger.info("Created database executor with %d workers", DB_EXECUTOR_WORKERS)
+    return _executor
+
+
+async def run_in_db_executor(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Runs a blocking database call on the database executor and awaits its result.
+
+    The executor is bounded, so however many coroutines are waiting at most
+    DB_EXECUTOR_WORKERS calls touch SQLite at once and the event loop is never blocked.
+
+    Args:
+        func (Callable[..., Any]): The blocking function, e.g. `kitchen_model.get_meal_by_id`.
+        *args: Positional arguments for `func`.
+        **kwargs: Keyword arguments for `func`.
+
+    Returns:
+        Any: Whatever `func` returns. Exceptions it raises are re-raised here.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), functools.partial(func, *args, **kwargs))
+
+
+def close_db_executor() -> None:
+    """Waits for queued database work to finish and shuts the executor down."""
+    global _executor
+    with _pool_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+        logger.info("Database executor shut down.")
+
+
+db_connection_wait = registry.histogram("meal_max_db_connection_wait_seconds",
+                                        "Time get_db_connection waited for a pooled connection.",
+                                        buckets=FAST_LATENCY_BUCKETS)
+db_connection_hold = registry.histogram("meal_max_db_connection_hold_seconds",
+                                        "Time a pooled connection was held before it was returned.",
+                                        buckets=FAST_LATENCY_BUCKETS)
+db_connection_errors = registry.counter("meal_max_db_connection_errors_total",
+                                        "Database errors raised while a connection was held.")
+
+
 ###################################################
 #
 # This one yields rather than returns.
@@ -45,14 +431,36 @@ def check_table_exists(tablename: str):
 ###################################################
 @contextmanager
 def get_db_connection():
-    conn = None
+    if DB_POOL_DISABLED:
+        conn = None
+        try:
+            conn = open_connection(DB_PATH)
+            yield conn
+        except sqlite3.Error as e:
+            logger.error("Database connection error: %s", str(e))
+            raise e
+        finally:
+            if conn:
+                conn.close()
+                logger.info("Database connection closed.", extra={'event': 'db.connection_closed'})
+        return
+
+    pool = get_connection_pool()
+    start = time.perf_counter()
+    conn = pool.acquire()
+    acquired = time.perf_counter()
+    discard = False
     try:
-        conn = sqlite3.connect(DB_PATH)
         yield conn
     except sqlite3.Error as e:
         logger.error("Database connection error: %s", str(e))
+        db_connection_errors.inc()
+        # statement errors leave the connection usable; only drop it if it is actually broken
+        discard = not pool.is_healthy(conn)
         raise e
     finally:
-        if conn:
-            conn.close()
-            logger.info("Database connection closed.")
+        pool.release(conn, discard=discard)
+        if METRICS_ENABLED:
+            db_connection_wait.observe(acquired - start)
+            db_connection_hold.observe(time.perf_counter() - acquired)
+        logger.info("Database connection returned to pool.", extra={'event': 'db.connection_released'})
@@ -2,13 +2,11 @@
 
 # Check if the database file already exists
 if [ -f "$DB_PATH" ]; then
-    echo "Recreating database at $DB_PATH."
-    # Drop and recreate the tables
-    sqlite3 "$DB_PATH" < /app/sql/create_meal_table.sql
-    echo "Database recreated successfully."
+    echo "Migrating database at $DB_PATH."
 else
     echo "Creating database at $DB_PATH."
-    # Create the database for the first time
-    sqlite3 "$DB_PATH" < /app/sql/create_meal_table.sql
-    echo "Database created successfully."
-fi
\ No newline at end of file
+fi
+
+# Apply any pending schema migrations; existing meals are kept
+cd /app && python -m meal_max.utils.migrations
+echo "Database is at the latest schema version."
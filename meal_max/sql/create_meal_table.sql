@@ -1,3 +1,5 @@
+-- Drops and recreates the meals table at the latest schema version (used by clear_meals).
+-- Keep in step with sql/migrations; tests/test_migrations.py checks the two agree.
 DROP TABLE IF EXISTS meals;
 CREATE TABLE meals (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -8,4 +10,14 @@ CREATE TABLE meals (
     battles INTEGER DEFAULT 0,
     wins INTEGER DEFAULT 0,
     deleted BOOLEAN DEFAULT FALSE
-);
\ No newline at end of file
+);
+
+-- Partial covering indexes over active ranked meals, in leaderboard order (see migration 002).
+CREATE INDEX idx_meals_leaderboard_wins
+    ON meals (wins DESC, id, battles, meal, cuisine, price, difficulty, deleted)
+    WHERE deleted = FALSE AND battles > 0;
+CREATE INDEX idx_meals_leaderboard_win_pct
+    ON meals ((wins * 1.0 / battles) DESC, id, wins, battles, meal, cuisine, price, difficulty, deleted)
+    WHERE deleted = FALSE AND battles > 0;
+
+PRAGMA user_version = 2;
@@ -0,0 +1,12 @@
+-- Partial indexes over active ranked meals, in leaderboard order, so top-N pages stop after N rows.
+-- They carry every column the leaderboard queries read, so pages and the in-memory board's
+-- initial load are answered from the index without touching the table.
+-- The WHERE clause must match the queries' exactly for SQLite to use them.
+DROP INDEX IF EXISTS idx_meals_leaderboard_wins;
+DROP INDEX IF EXISTS idx_meals_leaderboard_win_pct;
+CREATE INDEX idx_meals_leaderboard_wins
+    ON meals (wins DESC, id, battles, meal, cuisine, price, difficulty, deleted)
+    WHERE deleted = FALSE AND battles > 0;
+CREATE INDEX idx_meals_leaderboard_win_pct
+    ON meals ((wins * 1.0 / battles) DESC, id, wins, battles, meal, cuisine, price, difficulty, deleted)
+    WHERE deleted = FALSE AND battles > 0;
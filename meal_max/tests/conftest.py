@@ -0,0 +1,13 @@
+import pytest
+
+from meal_max.models import kitchen_model
+from meal_max.models.leaderboard_model import leaderboard
+
+
+@pytest.fixture(autouse=True)
+def clear_meal_cache():
+    """Keeps cached meals and leaderboard entries from leaking between tests that reuse the same ids and names."""
+    if kitchen_model.meal_cache is not None:
+        kitchen_model.meal_cache.clear()
+    leaderboard.invalidate()
+    yield
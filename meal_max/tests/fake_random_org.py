@@ -0,0 +1,69 @@
+"""A local HTTP stand-in for random.org's decimal-fractions endpoint.
+
+Usage:
+    with FakeRandomOrg(seed=1) as server:
+        with patch.object(random_utils, 'RANDOM_ORG_URL', server.url):
+            ...
+
+Set `delay` to simulate a slow upstream and `status` to simulate an outage.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import random
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeRandomOrg:
+    """Serves `num` two-decimal random numbers per request from a seeded PRNG."""
+
+    def __init__(self, seed: int = 0, delay: float = 0.0, status: int = 200):
+        self.delay = delay
+        self.status = status
+        self.requests = []
+        self._rng = random.Random(seed)
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/decimal-fractions/"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep connections open between requests, as random.org does
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                fake.requests.append(query)
+                if fake.delay:
+                    time.sleep(fake.delay)
+                if fake.status != 200:
+                    self.send_response(fake.status)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                num = int(query.get('num', ['1'])[0])
+                body = "".join(f"{fake._rng.randrange(100) / 100:.2f}\n" for _ in range(num)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,178 @@
+import time
+
+import pytest
+from unittest.mock import patch
+
+from app import app, arenas
+from benchmarks.common import temp_database
+from meal_max.models import kitchen_model
+from meal_max.utils import sql_utils
+from meal_max.utils.random_providers import SeededRandomProvider
+
+
+@pytest.fixture
+def client():
+    with temp_database(10):
+        with app.test_client() as client:
+            yield client
+
+
+def connections_in_use() -> int:
+    return sql_utils.get_connection_pool().stats()['in_use']
+
+
+@pytest.fixture
+def export_rows():
+    """Holds on to every export iterator, so only an explicit close (not garbage collection) releases its connection."""
+    rows = []
+
+    def keep(iterate):
+        def wrapper(*args, **kwargs):
+            rows.append(iterate(*args, **kwargs))
+            return rows[-1]
+        return wrapper
+
+    with patch.object(kitchen_model, 'iter_meals', keep(kitchen_model.iter_meals)), \
+            patch.object(kitchen_model, 'iter_leaderboard', keep(kitchen_model.iter_leaderboard)):
+        yield rows
+
+
+@pytest.mark.parametrize('path', ['/api/export/meals', '/api/export/leaderboard'])
+def test_export_head_request_releases_its_connection(client, export_rows, path):
+    with patch.object(kitchen_model, 'EXPORT_BATCH_SIZE', 2):
+        response = client.head(path)
+        # a WSGI server closes the empty HEAD body, as the test client leaves to its caller
+        response.close()
+
+    assert response.status_code == 200
+    assert response.data == b''
+    assert len(export_rows) == 1
+    assert connections_in_use() == 0
+
+
+def test_slow_exports_do_not_hold_connections(client, export_rows):
+    with patch.object(kitchen_model, 'EXPORT_BATCH_SIZE', 2):
+        # more half-read downloads than the pool has connections
+        exports = [client.get('/api/export/meals', buffered=False)
+                   for _ in range(sql_utils.get_connection_pool().size + 1)]
+        in_use = connections_in_use()
+        lookup = client.get('/api/get-meal-by-name/Meal 0')
+        for response in exports:
+            response.close()
+
+    assert in_use == 0
+    assert lookup.status_code == 200
+
+
+@pytest.mark.parametrize('query', ['', '?sort=win_pct'])
+def test_leaderboard_export_pages_match_one_read(client, query):
+    with patch.object(kitchen_model, 'EXPORT_BATCH_SIZE', 2):
+        paged = client.get(f'/api/export/leaderboard{query}').get_data(as_text=True)
+    with patch.object(kitchen_model, 'EXPORT_BATCH_SIZE', 1000):
+        whole = client.get(f'/api/export/leaderboard{query}').get_data(as_text=True)
+
+    assert len(paged.splitlines()) > 2
+    assert paged == whole
+
+
+def test_export_streams_every_meal(client):
+    with patch.object(kitchen_model, 'EXPORT_BATCH_SIZE', 3):
+        response = client.get('/api/export/meals?format=csv')
+
+    assert response.status_code == 200
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == ','.join(kitchen_model.MEAL_EXPORT_FIELDS)
+    assert len(lines) == 11
+    assert connections_in_use() == 0
+
+
+def meal_name(client, meal_id: int) -> str:
+    return client.get(f'/api/get-meal-by-id/{meal_id}').get_json()['meal']['meal']
+
+
+def create_meal(client):
+    return client.post('/api/create-meal', json={'meal': 'Fresh', 'cuisine': 'Thai', 'price': 9.0, 'difficulty': 'LOW'})
+
+
+def delete_meal(client):
+    return client.delete('/api/delete-meal/3')
+
+
+def clear_meals(client):
+    return client.delete('/api/clear-meals')
+
+
+def battle(client):
+    headers = {'X-Arena-Id': 'conditional-battle'}
+    client.post('/api/clear-combatants', headers=headers)
+    with patch.object(arenas, 'random_provider', SeededRandomProvider(seed=1)):
+        for meal_id in (1, 2):
+            client.post('/api/prep-combatant', json={'meal': meal_name(client, meal_id)}, headers=headers)
+        return client.get('/api/battle', headers=headers)
+
+
+@pytest.mark.parametrize('path', ['/api/leaderboard', '/api/get-meal-by-id/1'])
+@pytest.mark.parametrize('write', [create_meal, delete_meal, clear_meals, battle])
+def test_conditional_get_changes_after_a_write(client, path, write):
+    first = client.get(path)
+    etag = first.headers['ETag']
+    cached = client.get(path, headers={'If-None-Match': etag})
+
+    assert write(client).status_code in (200, 201)
+    changed = client.get(path, headers={'If-None-Match': etag})
+
+    assert first.status_code == 200
+    assert cached.status_code == 304
+    assert cached.headers['ETag'] == etag
+    assert cached.data == b''
+    # the meal itself may now be gone, but the old copy must not be served as current
+    assert changed.status_code != 304
+    assert changed.headers.get('ETag') != etag
+
+
+@pytest.mark.parametrize('path', ['/api/leaderboard', '/api/get-meal-by-id/1'])
+def test_not_modified_does_not_touch_the_database(client, path):
+    etag = client.get(path).headers['ETag']
+    kitchen_model.meal_cache.clear()
+
+    with patch.object(sql_utils, 'get_connection_pool', side_effect=AssertionError("database touched")) as pool:
+        response = client.get(path, headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    pool.assert_not_called()
+
+
+def test_last_modified_waits_for_the_second_to_pass(client):
+    with patch.object(kitchen_model, 'get_data_version', return_value=(7, 1000.5)), \
+            patch('app.time', wraps=time) as clock:
+        clock.time.return_value = 1000.9
+        same_second = client.get('/api/leaderboard')
+        clock.time.return_value = 1001.0
+        later = client.get('/api/leaderboard')
+        modified_since = later.headers['Last-Modified']
+        not_modified = client.get('/api/leaderboard', headers={'If-Modified-Since': modified_since})
+        earlier = client.get('/api/leaderboard', headers={'If-Modified-Since': 'Thu, 01 Jan 1970 00:16:39 GMT'})
+
+    # a write later in second 1000 would share its Last-Modified, so none is sent until 1001
+    assert 'Last-Modified' not in same_second.headers
+    assert modified_since == 'Thu, 01 Jan 1970 00:16:40 GMT'
+    assert not_modified.status_code == 304
+    assert earlier.status_code == 200
+
+
+def test_combatants_vary_by_arena(client):
+    arenas.clear_combatants('red')
+    first = client.get('/api/get-combatants', headers={'X-Arena-Id': 'red'})
+    etag = first.headers['ETag']
+    same_arena = client.get('/api/get-combatants', headers={'X-Arena-Id': 'red', 'If-None-Match': etag})
+    other_arena = client.get('/api/get-combatants', headers={'X-Arena-Id': 'blue', 'If-None-Match': etag})
+    client.post('/api/prep-combatant', json={'meal': meal_name(client, 1)}, headers={'X-Arena-Id': 'red'})
+    after_prep = client.get('/api/get-combatants', headers={'X-Arena-Id': 'red', 'If-None-Match': etag})
+
+    assert 'X-Arena-Id' in first.vary
+    assert 'X-Arena-Id' in same_arena.vary
+    assert same_arena.status_code == 304
+    assert other_arena.status_code == 200
+    assert other_arena.headers['ETag'] != etag
+    assert after_prep.status_code == 200
+    assert [meal['id'] for meal in after_prep.get_json()['combatants']] == [1]
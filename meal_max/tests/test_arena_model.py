@@ -0,0 +1,153 @@
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+from meal_max.models.arena_model import ArenaRegistry
+from meal_max.models.kitchen_model import Meal
+from meal_max.utils.random_providers import SeededRandomProvider
+
+
+meal1 = Meal(id=1, meal='Meal1', price=10.0, cuisine='Italian', difficulty='MED')
+meal2 = Meal(id=2, meal='Meal2', price=15.0, cuisine='French', difficulty='LOW')
+meal3 = Meal(id=3, meal='Meal3', price=8.0, cuisine='Mexican', difficulty='HIGH')
+
+
+@pytest.fixture
+def registry():
+    return ArenaRegistry(max_arenas=3, idle_timeout=None, random_provider=SeededRandomProvider(seed=1))
+
+
+def test_arenas_keep_separate_combatants(registry):
+    registry.prep_combatant('alice', meal1)
+    registry.prep_combatant('bob', meal2)
+    registry.prep_combatant('bob', meal3)
+
+    assert registry.get_combatants('alice') == [meal1]
+    assert registry.get_combatants('bob') == [meal2, meal3]
+
+    registry.clear_combatants('bob')
+    assert registry.get_combatants('bob') == []
+    assert registry.get_combatants('alice') == [meal1]
+
+
+def test_battle_in_arena(registry):
+    registry.prep_combatant('alice', meal1)
+    registry.prep_combatant('alice', meal2)
+
+    with patch('meal_max.models.battle_model.record_battle_result') as mock_record:
+        winner = registry.battle('alice')
+
+    assert winner in ('Meal1', 'Meal2')
+    assert [meal.meal for meal in registry.get_combatants('alice')] == [winner]
+    mock_record.assert_called_once()
+
+
+def test_full_arena_rejects_third_combatant(registry):
+    registry.prep_combatant('alice', meal1)
+    registry.prep_combatant('alice', meal2)
+    with pytest.raises(ValueError) as excinfo:
+        registry.prep_combatant('alice', meal3)
+    assert str(excinfo.value) == "Combatant list is full, cannot add more combatants."
+
+
+def test_invalid_arena_id(registry):
+    with pytest.raises(ValueError) as excinfo:
+        registry.get_combatants('')
+    assert str(excinfo.value) == "Invalid arena id. Must be 1 to 64 characters."
+
+
+def test_arena_version_changes_with_combatants(registry):
+    version, _ = registry.get_version('alice')
+    assert registry.get_version('alice')[0] == version
+
+    registry.prep_combatant('alice', meal1)
+    prepped, _ = registry.get_version('alice')
+    assert prepped != version
+
+    registry.clear_combatants('alice')
+    assert registry.get_version('alice')[0] not in (version, prepped)
+
+
+def test_recreated_arena_gets_new_version(registry):
+    registry.prep_combatant('alice', meal1)
+    version, _ = registry.get_version('alice')
+    registry.remove('alice')
+
+    assert registry.get_version('alice')[0] != version
+
+
+def test_least_recently_used_arena_evicted_at_limit(registry):
+    for arena_id in ('a', 'b', 'c'):
+        registry.prep_combatant(arena_id, meal1)
+    registry.get_combatants('a')  # 'b' is now the least recently used
+    registry.prep_combatant('d', meal1)
+
+    assert registry.stats()['arenas'] == 3
+    assert registry.stats()['evicted'] == 1
+    assert registry.get_combatants('a') == [meal1]
+    assert registry.get_combatants('b') == []
+
+
+def test_reads_do_not_create_arenas(registry):
+    for arena_id in ('a', 'b', 'c'):
+        registry.prep_combatant(arena_id, meal1)
+    for i in range(10):
+        assert registry.get_combatants(f'stranger-{i}') == []
+        assert registry.get_version(f'stranger-{i}')[0] == 0
+
+    assert registry.stats()['arenas'] == 3
+    assert registry.stats()['evicted'] == 0
+    assert all(registry.get_combatants(arena_id) == [meal1] for arena_id in ('a', 'b', 'c'))
+
+
+def test_unknown_arena_changed_when_an_arena_was_last_dropped(registry):
+    _, before = registry.get_version('alice')
+    registry.prep_combatant('alice', meal1)
+    time.sleep(0.01)
+    registry.remove('alice')
+
+    version, modified = registry.get_version('alice')
+    assert version == 0
+    assert modified > before
+
+
+def test_idle_arenas_evicted():
+    registry = ArenaRegistry(max_arenas=10, idle_timeout=0.05, random_provider=SeededRandomProvider())
+    registry.prep_combatant('a', meal1)
+    time.sleep(0.1)
+    registry.prep_combatant('b', meal2)
+
+    assert registry.stats()['arenas'] == 1
+    assert registry.get_combatants('a') == []
+
+
+def test_concurrent_preps_do_not_overwrite_each_other():
+    registry = ArenaRegistry(max_arenas=100, idle_timeout=None, random_provider=SeededRandomProvider())
+    errors, shared_errors = [], []
+
+    def prep(arena_id):
+        try:
+            registry.prep_combatant(arena_id, meal1)
+            registry.prep_combatant(arena_id, meal2)
+        except ValueError as e:
+            errors.append(e)
+
+    def prep_shared():
+        try:
+            registry.prep_combatant('shared', meal3)
+        except ValueError as e:
+            shared_errors.append(e)
+
+    # one arena per client, plus ten clients racing for the two slots of a shared arena
+    threads = [threading.Thread(target=prep, args=(f'client{i}',)) for i in range(50)]
+    threads += [threading.Thread(target=prep_shared) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert all(registry.get_combatants(f'client{i}') == [meal1, meal2] for i in range(50))
+    assert len(registry.get_combatants('shared')) == 2
+    assert len(shared_errors) == 8
@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+import asgi
+from benchmarks.common import temp_database
+from meal_max.utils.async_random import AsyncLocalRandomClient
+from meal_max.utils.random_providers import SeededRandomProvider
+
+
+MEALS = [
+    {'meal': 'Meal1', 'cuisine': 'Italian', 'price': 10.0, 'difficulty': 'MED'},
+    {'meal': 'Meal2', 'cuisine': 'French', 'price': 15.0, 'difficulty': 'LOW'},
+]
+
+
+@pytest.fixture
+def database():
+    with temp_database(0) as path:
+        yield path
+    asgi.arenas.clear_combatants('default')
+
+
+@pytest.fixture
+def random_client():
+    client = AsyncLocalRandomClient(SeededRandomProvider(seed=1))
+    with patch.object(asgi, 'random_client', client):
+        yield client
+
+
+def serve(*requests):
+    """Sends (method, url, kwargs) requests to the ASGI application in order and returns the responses."""
+    async def run():
+        transport = httpx.ASGITransport(app=asgi.application)
+        async with httpx.AsyncClient(transport=transport, base_url='http://testserver') as client:
+            return [await client.request(method, url, **kwargs) for method, url, kwargs in requests]
+    return asyncio.run(run())
+
+
+def test_battle_on_the_event_loop(database, random_client):
+    responses = serve(
+        *(('POST', '/api/create-meal', {'json': meal}) for meal in MEALS),
+        *(('POST', '/api/prep-combatant', {'json': {'meal': meal['meal']}}) for meal in MEALS),
+        ('GET', '/api/battle', {}),
+    )
+
+    assert [response.status_code for response in responses] == [201, 201, 200, 200, 200]
+    assert responses[-1].json()['status'] == 'success'
+    assert responses[-1].json()['winner'] in ('Meal1', 'Meal2')
+
+
+def test_battle_without_combatants_draws_no_random_number(database, random_client):
+    with patch.object(random_client, 'get_random', AsyncMock(return_value=0.5)) as get_random:
+        response, = serve(('GET', '/api/battle', {}))
+
+    assert response.status_code == 500
+    assert response.json() == {'error': 'Two combatants must be prepped for a battle.'}
+    get_random.assert_not_called()
+
+
+def test_battle_in_an_invalid_arena_draws_no_random_number(database, random_client):
+    with patch.object(random_client, 'get_random', AsyncMock(return_value=0.5)) as get_random:
+        response, = serve(('GET', '/api/battle', {'headers': {'X-Arena-Id': 'x' * 1000}}))
+
+    assert response.status_code == 500
+    assert response.json()['error'].startswith('Invalid arena id.')
+    get_random.assert_not_called()
+
+
+def test_battle_records_route_metrics(database, random_client):
+    requests = asgi.http_requests.value('GET', '/api/battle', '500')
+    observed = asgi.http_request_duration.labels('GET', '/api/battle').snapshot()['count']
+
+    serve(('GET', '/api/battle', {}))
+
+    assert asgi.http_requests.value('GET', '/api/battle', '500') == requests + 1
+    assert asgi.http_request_duration.labels('GET', '/api/battle').snapshot()['count'] == observed + 1
+
+
+def test_battle_metrics_follow_metrics_enabled(database, random_client):
+    requests = asgi.http_requests.value('GET', '/api/battle', '500')
+
+    with patch.object(asgi, 'METRICS_ENABLED', False):
+        serve(('GET', '/api/battle', {}))
+
+    assert asgi.http_requests.value('GET', '/api/battle', '500') == requests
+
+
+def test_other_routes_fall_through_to_flask(database):
+    response, = serve(('GET', '/api/health', {}))
+
+    assert response.status_code == 200
+    assert response.json() == {'status': 'healthy'}
+
+
+def test_lifespan_closes_the_clients():
+    async def run():
+        messages = asyncio.Queue()
+        sent = []
+        for message in ({'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}):
+            messages.put_nowait(message)
+
+        async def send(message):
+            sent.append(message)
+
+        await asgi.application({'type': 'lifespan'}, messages.get, send)
+        return sent
+
+    with patch.object(asgi, 'random_client') as random_client, \
+            patch.object(asgi, 'close_db_executor') as close_db_executor:
+        random_client.aclose = AsyncMock()
+        sent = asyncio.run(run())
+
+    assert sent == [{'type': 'lifespan.startup.complete'}, {'type': 'lifespan.shutdown.complete'}]
+    random_client.aclose.assert_awaited_once()
+    close_db_executor.assert_called_once()
@@ -0,0 +1,135 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+
+from meal_max.utils import random_utils
+from meal_max.utils.async_random import AsyncRandomOrgClient
+from meal_max.utils.random_providers import SeededRandomProvider
+from tests.fake_random_org import FakeRandomOrg
+
+
+@pytest.fixture
+def fake_random_org():
+    with FakeRandomOrg(seed=3) as server:
+        with patch.object(random_utils, 'RANDOM_ORG_URL', server.url):
+            yield server
+
+
+def draw(client, count, concurrent=True):
+    async def run():
+        try:
+            if concurrent:
+                return await asyncio.gather(*(client.get_random() for _ in range(count)))
+            return [await client.get_random() for _ in range(count)]
+        finally:
+            await client.aclose()
+    return asyncio.run(run())
+
+
+def test_get_random_serves_from_batches(fake_random_org):
+    client = AsyncRandomOrgClient(batch_size=10)
+    numbers = draw(client, 25, concurrent=False)
+
+    assert len(numbers) == 25
+    assert all(0 <= number < 1 for number in numbers)
+    assert len(fake_random_org.requests) == 3
+    assert client.stats()['depth'] == 5
+
+
+def test_concurrent_draws_share_one_refill(fake_random_org):
+    fake_random_org.delay = 0.1
+    client = AsyncRandomOrgClient(batch_size=1)
+    numbers = draw(client, 50)
+
+    # the first request is for one number; every coroutine that queued behind it is covered by the second
+    assert len(numbers) == 50
+    assert [request['num'] for request in fake_random_org.requests] == [['1'], ['49']]
+
+
+def test_falls_back_when_random_org_is_down(fake_random_org):
+    fake_random_org.status = 503
+    client = AsyncRandomOrgClient(batch_size=10, fallback=SeededRandomProvider(seed=2))
+
+    assert draw(client, 1) == [SeededRandomProvider(seed=2).get_random()]
+    assert client.stats()['fallbacks'] == 1
+
+
+def test_raises_without_fallback(fake_random_org):
+    fake_random_org.status = 503
+    client = AsyncRandomOrgClient(batch_size=10)
+
+    with pytest.raises(RuntimeError) as excinfo:
+        draw(client, 1)
+    assert str(excinfo.value).startswith("Request to random.org failed")
+
+
+def test_every_draw_waiting_on_a_failed_refill_falls_back(fake_random_org):
+    fake_random_org.status = 503
+    fake_random_org.delay = 0.3
+    client = AsyncRandomOrgClient(batch_size=1, fallback=SeededRandomProvider(seed=2))
+
+    start = time.perf_counter()
+    numbers = draw(client, 6)
+
+    # one failed request answers all six, rather than each waiter paying for its own
+    assert time.perf_counter() - start < 0.6
+    assert len(numbers) == 6
+    assert len(fake_random_org.requests) == 1
+    assert client.stats()['fallbacks'] == 6
+
+
+def test_random_org_is_skipped_until_the_cooldown_ends(fake_random_org):
+    fake_random_org.status = 503
+    client = AsyncRandomOrgClient(batch_size=10, fallback=SeededRandomProvider(seed=2), cooldown=0.2)
+
+    async def run():
+        try:
+            await client.get_random()
+            opened = client.stats()['state']
+            await asyncio.gather(*(client.get_random() for _ in range(5)))
+            requests_while_open = len(fake_random_org.requests)
+            fake_random_org.status = 200
+            await asyncio.sleep(0.25)
+            await client.get_random()
+            return opened, requests_while_open
+        finally:
+            await client.aclose()
+
+    opened, requests_while_open = asyncio.run(run())
+
+    assert opened == 'open'
+    assert requests_while_open == 1
+    assert len(fake_random_org.requests) == 2
+    assert client.stats()['state'] == 'closed'
+    assert client.stats()['depth'] == 9
+
+
+def test_slow_refill_falls_back_and_keeps_its_numbers(fake_random_org):
+    fake_random_org.delay = 0.3
+    client = AsyncRandomOrgClient(batch_size=10, fallback=SeededRandomProvider(seed=2), call_timeout=0.05)
+
+    async def run():
+        try:
+            start = time.perf_counter()
+            number = await client.get_random()
+            elapsed = time.perf_counter() - start
+            await asyncio.sleep(0.5)
+            return number, elapsed
+        finally:
+            await client.aclose()
+
+    number, elapsed = asyncio.run(run())
+
+    assert number == SeededRandomProvider(seed=2).get_random()
+    assert elapsed < 0.2
+    assert client.stats()['depth'] == 10
+
+
+def test_retries_connection_errors_and_5xx(fake_random_org):
+    fake_random_org.status = 503
+    client = AsyncRandomOrgClient(batch_size=10, retries=2, retry_backoff=0.01)
+
+    with pytest.raises(RuntimeError):
+        draw(client, 1)
+    assert len(fake_random_org.requests) == 3
@@ -1,8 +1,19 @@
+import random
 import pytest
 from unittest.mock import patch
 
-from meal_max.models.battle_model import BattleModel
+import numpy as np
+
+from meal_max.models.battle_model import (
+    BattleModel,
+    decide_battles,
+    encode_difficulties,
+    get_battle_scores,
+    get_win_probabilities,
+    meals_to_arrays,
+)
 from meal_max.models.kitchen_model import Meal
+from meal_max.utils.random_providers import SeededRandomProvider
 
 def test_prep_combatant_adds_combatant_correctly():
     battle_model = BattleModel()
@@ -47,45 +58,43 @@ def test_clear_combatants():
     assert battle_model.get_combatants() == []
 
 
-@patch('meal_max.models.battle_model.get_random')
-@patch('meal_max.models.battle_model.update_meal_stats')
-def test_battle_winner_when_delta_greater_than_random_number(mock_update_meal_stats, mock_get_random):
+@patch('meal_max.models.battle_model.get_random_provider')
+@patch('meal_max.models.battle_model.record_battle_result')
+def test_battle_winner_when_delta_greater_than_random_number(mock_record_battle_result, mock_get_random_provider):
     battle_model = BattleModel()
     meal1 = Meal(id=1, meal='Meal1', price=10.0, cuisine='Italian', difficulty='MED')
     meal2 = Meal(id=2, meal='Meal2', price=15.0, cuisine='French', difficulty='LOW')
     battle_model.prep_combatant(meal1)
     battle_model.prep_combatant(meal2)
 
-    # Mock get_random to return a value less than delta
-    mock_get_random.return_value = 0.05  
+    # Mock the random provider to return a value less than delta
+    mock_get_random_provider.return_value.get_random.return_value = 0.05  
 
     winner_name = battle_model.battle()
 
     # Expected winner is combatant_1 (meal1)
     assert winner_name == meal1.meal
-    mock_update_meal_stats.assert_any_call(meal1.id, 'win')
-    mock_update_meal_stats.assert_any_call(meal2.id, 'loss')
+    mock_record_battle_result.assert_called_once_with(meal1.id, meal2.id)
     assert battle_model.get_combatants() == [meal1]
 
 
-@patch('meal_max.models.battle_model.get_random')
-@patch('meal_max.models.battle_model.update_meal_stats')
-def test_battle_winner_when_delta_less_than_random_number(mock_update_meal_stats, mock_get_random):
+@patch('meal_max.models.battle_model.get_random_provider')
+@patch('meal_max.models.battle_model.record_battle_result')
+def test_battle_winner_when_delta_less_than_random_number(mock_record_battle_result, mock_get_random_provider):
     battle_model = BattleModel()
     meal1 = Meal(id=1, meal='Meal1', price=10.0, cuisine='Italian', difficulty='MED')
     meal2 = Meal(id=2, meal='Meal2', price=15.0, cuisine='French', difficulty='LOW')
     battle_model.prep_combatant(meal1)
     battle_model.prep_combatant(meal2)
 
-    # Mock get_random to return a value greater than delta
-    mock_get_random.return_value = 0.2  
+    # Mock the random provider to return a value greater than delta
+    mock_get_random_provider.return_value.get_random.return_value = 0.2  
 
     winner_name = battle_model.battle()
 
     # Expected winner is combatant_2 (meal2)
     assert winner_name == meal2.meal
-    mock_update_meal_stats.assert_any_call(meal2.id, 'win')
-    mock_update_meal_stats.assert_any_call(meal1.id, 'loss')
+    mock_record_battle_result.assert_called_once_with(meal2.id, meal1.id)
     assert battle_model.get_combatants() == [meal2]
 
 
@@ -105,3 +114,114 @@ def test_battle_raises_error_with_no_combatants():
     with pytest.raises(ValueError) as excinfo:
         battle_model.battle()
     assert str(excinfo.value) == "Two combatants must be prepped for a battle."
+
+
+def test_battle_uses_injected_random_provider():
+    provider = SeededRandomProvider(seed=42)
+    expected = SeededRandomProvider(seed=42).get_random()
+    battle_model = BattleModel(random_provider=provider)
+    meal1 = Meal(id=1, meal='Meal1', price=10.0, cuisine='Italian', difficulty='MED')
+    meal2 = Meal(id=2, meal='Meal2', price=15.0, cuisine='French', difficulty='LOW')
+    battle_model.prep_combatant(meal1)
+    battle_model.prep_combatant(meal2)
+
+    delta = abs(battle_model.get_battle_score(meal1) - battle_model.get_battle_score(meal2)) / 100
+    with patch('meal_max.models.battle_model.record_battle_result'):
+        winner_name = battle_model.battle()
+
+    # the scores are fixed, so the seeded draw alone decides the winner
+    assert winner_name == (meal1.meal if delta > expected else meal2.meal)
+
+
+
+@pytest.mark.parametrize("random_number, winner", [(0.18, 'Meal1'), (0.19, 'Meal2')])
+def test_battle_first_combatant_wins_when_delta_exceeds_draw(random_number, winner):
+    battle_model = BattleModel(random_provider=SeededRandomProvider(seed=42))
+    meal1 = Meal(id=1, meal='Meal1', price=10.0, cuisine='Italian', difficulty='MED')
+    meal2 = Meal(id=2, meal='Meal2', price=15.0, cuisine='French', difficulty='LOW')
+    battle_model.prep_combatant(meal1)
+    battle_model.prep_combatant(meal2)
+
+    # scores are 68 and 87, so delta is 0.19 and only a strictly smaller draw favours Meal1
+    with patch('meal_max.models.battle_model.record_battle_result'):
+        assert battle_model.battle(random_number) == winner
+
+def random_meals(rng, count, start=0):
+    return [
+        Meal(id=i, meal=f'Meal{i}', price=round(rng.uniform(0, 50), 2),
+             cuisine=rng.choice(['Thai', 'French', 'Italian', 'Mexican', 'Ethiopian']),
+             difficulty=rng.choice(['HIGH', 'MED', 'LOW']))
+        for i in range(start, start + count)
+    ]
+
+
+def test_get_battle_scores_matches_scalar_score():
+    battle_model = BattleModel(SeededRandomProvider())
+    meals = random_meals(random.Random(1), 500)
+
+    scores = get_battle_scores(*meals_to_arrays(meals))
+
+    assert scores.tolist() == [battle_model.get_battle_score(meal) for meal in meals]
+
+
+def test_decide_battles_matches_battle():
+    rng = random.Random(2)
+    meals_1, meals_2 = random_meals(rng, 300), random_meals(rng, 300, start=300)
+    randoms = [rng.randrange(100) / 100 for _ in range(300)]
+
+    first_wins = decide_battles(get_battle_scores(*meals_to_arrays(meals_1)),
+                                get_battle_scores(*meals_to_arrays(meals_2)), randoms)
+
+    battle_model = BattleModel(SeededRandomProvider())
+    expected = []
+    for meal_1, meal_2, random_number in zip(meals_1, meals_2, randoms):
+        battle_model.clear_combatants()
+        battle_model.prep_combatant(meal_1)
+        battle_model.prep_combatant(meal_2)
+        with patch.object(battle_model.random_provider, 'get_random', return_value=random_number), \
+                patch('meal_max.models.battle_model.record_battle_result'):
+            expected.append(battle_model.battle() == meal_1.meal)
+    assert first_wins.tolist() == expected
+
+
+def test_get_win_probabilities_counts_winning_draws():
+    scores_1 = np.array([68.0, 50.0, 10.0, 200.0, 68.0])
+    scores_2 = np.array([87.0, 50.0, 10.5, 0.0, 68.01])
+    grid = np.arange(100) / 100
+
+    probabilities = get_win_probabilities(scores_1, scores_2)
+
+    # brute force over every possible draw
+    expected = [np.mean(decide_battles(np.full(100, s1), np.full(100, s2), grid)) for s1, s2 in zip(scores_1, scores_2)]
+    assert probabilities.tolist() == expected
+    assert probabilities[0] == 0.19
+    assert probabilities[1] == 0.0
+    assert probabilities[3] == 1.0
+
+
+def test_get_battle_scores_invalid_input():
+    with pytest.raises(ValueError) as excinfo:
+        get_battle_scores([10.0, 12.0], [7], [1, 1])
+    assert str(excinfo.value) == "prices, cuisine_lengths and difficulty_codes must have the same shape."
+
+    with pytest.raises(ValueError) as excinfo:
+        get_battle_scores([10.0], [7], [3])
+    assert str(excinfo.value) == "Difficulty codes must be between 0 and 2."
+
+    with pytest.raises(ValueError) as excinfo:
+        encode_difficulties(['MED', 'EASY'])
+    assert str(excinfo.value) == "Difficulty must be 'LOW', 'MED', or 'HIGH'."
+
+
+def test_battle_with_pre_drawn_random_number():
+    battle_model = BattleModel(random_provider=SeededRandomProvider())
+    meal1 = Meal(id=1, meal='Meal1', price=10.0, cuisine='Italian', difficulty='MED')
+    meal2 = Meal(id=2, meal='Meal2', price=15.0, cuisine='French', difficulty='LOW')
+    battle_model.prep_combatant(meal1)
+    battle_model.prep_combatant(meal2)
+
+    with patch.object(battle_model.random_provider, 'get_random') as mock_get_random, \
+            patch('meal_max.models.battle_model.record_battle_result'):
+        # delta is 0.19, so a draw of 0.1 goes to the first combatant
+        assert battle_model.battle(random_number=0.1) == meal1.meal
+    mock_get_random.assert_not_called()
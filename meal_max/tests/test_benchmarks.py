@@ -0,0 +1,61 @@
+import pytest
+
+from benchmarks import battle_benchmark, kitchen_benchmark, meal_benchmark
+from benchmarks.common import summarize
+from benchmarks.compare import compare
+from benchmarks.http_benchmark import parse_mix
+from meal_max.utils import sql_utils
+
+
+def test_summarize():
+    summary = summarize([0.001, 0.002, 0.003, 0.004])
+    assert summary['ops'] == 4
+    assert summary['ops_per_sec'] == 400.0
+    assert summary['mean_us'] == 2500.0
+    assert summary['p50_us'] == 3000.0
+    assert summary['max_us'] == 4000.0
+
+
+def test_compare_flags_regressions():
+    baseline = {'sizes': {'1000': {'get_meal_by_id': {'mean_us': 10.0}, 'delete_meal': {'mean_us': 20.0}}}}
+    current = {'sizes': {'1000': {'get_meal_by_id': {'mean_us': 12.0}, 'delete_meal': {'mean_us': 19.0},
+                                  'create_meal': {'mean_us': 5.0}}}}
+
+    rows = {row['operation']: row for row in compare(baseline, current, threshold=10)}
+
+    assert set(rows) == {'sizes.1000.get_meal_by_id', 'sizes.1000.delete_meal'}
+    assert rows['sizes.1000.get_meal_by_id']['change_pct'] == 20.0
+    assert rows['sizes.1000.get_meal_by_id']['regression'] is True
+    assert rows['sizes.1000.delete_meal']['regression'] is False
+
+
+def test_parse_mix():
+    assert parse_mix("battle=3, leaderboard=1") == {'battle': 3, 'leaderboard': 1}
+    with pytest.raises(ValueError):
+        parse_mix("battle=fast")
+    with pytest.raises(ValueError):
+        parse_mix("battle=0")
+
+
+def test_kitchen_benchmark_runs_on_temp_database():
+    """Test that a tiny kitchen run covers every operation and leaves the configured DB_PATH in place."""
+    db_path = sql_utils.DB_PATH
+    results = kitchen_benchmark.run_size(meals=20, ops=5)
+
+    assert sql_utils.DB_PATH == db_path
+    assert results['get_meal_by_id.cold']['ops'] == 5
+    assert results['clear_meals']['ops'] == 1
+    assert all(summary['mean_us'] > 0 for summary in results.values())
+
+
+def test_battle_benchmark_modes():
+    for mode in battle_benchmark.MODES:
+        assert battle_benchmark.run_mode(mode, battles=10, meals=10)['ops'] == 10
+
+
+def test_meal_benchmark_slotted_meals_are_smaller():
+    rows = meal_benchmark._rows(1000, seed=0)
+    results = {layout: meal_benchmark.run_layout(layout, rows) for layout in meal_benchmark.LAYOUTS}
+
+    assert results['from_row']['instance_bytes'] < results['dict_dataclass']['instance_bytes']
+    assert results['from_row']['traced_bytes_per_meal'] < results['dict_dataclass']['traced_bytes_per_meal']
@@ -0,0 +1,66 @@
+import pytest
+from unittest.mock import patch
+
+from meal_max.utils.cache_utils import LRUCache
+
+
+def test_get_returns_cached_value_and_counts_hits():
+    cache = LRUCache(max_size=2)
+    cache.put('a', 1)
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['hit_rate'] == 0.5
+
+
+def test_put_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = LRUCache(max_size=2, ttl=10)
+    with patch('meal_max.utils.cache_utils.time.monotonic', return_value=100.0):
+        cache.put('a', 1)
+    with patch('meal_max.utils.cache_utils.time.monotonic', return_value=109.0):
+        assert cache.get('a') == 1
+    with patch('meal_max.utils.cache_utils.time.monotonic', return_value=110.0):
+        assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_invalidate_where_drops_matching_entries():
+    cache = LRUCache(max_size=4)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.put('c', 1)
+    cache.invalidate_where(lambda value: value == 1)
+
+    assert cache.get('a') is None
+    assert cache.get('c') is None
+    assert cache.get('b') == 2
+    assert cache.stats()['invalidations'] == 2
+
+
+def test_clear_drops_everything():
+    cache = LRUCache(max_size=2)
+    cache.put('a', 1)
+    cache.clear()
+    assert cache.get('a') is None
+    assert cache.stats()['size'] == 0
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError) as excinfo:
+        LRUCache(max_size=0)
+    assert str(excinfo.value) == "Invalid cache size: 0. Must be at least 1."
@@ -1,19 +1,32 @@
 import pytest
-from unittest.mock import patch, MagicMock, mock_open, ANY
+from dataclasses import FrozenInstanceError
+import pickle
+from unittest.mock import patch, MagicMock, mock_open, ANY, call
 import sqlite3
 import textwrap
 
 # Adjust the import statements according to your project structure
+from meal_max.models import kitchen_model
 from meal_max.models.kitchen_model import (
     Meal,
     create_meal,
+    create_meals_bulk,
     clear_meals,
     delete_meal,
     get_leaderboard,
     get_meal_by_id,
     get_meal_by_name,
+    get_meal_cache_stats,
+    find_meals,
+    get_meals_by_ids,
+    get_meals_by_names,
+    iter_leaderboard,
+    iter_meals,
+    record_battle_result,
+    record_battle_results,
     update_meal_stats,
 )
+from meal_max.models.leaderboard_model import encode_cursor
 
 
 def test_meal_init_valid():
@@ -37,6 +50,21 @@ def test_meal_init_invalid_difficulty():
     assert str(excinfo.value) == "Difficulty must be 'LOW', 'MED', or 'HIGH'."
 
 
+def test_meal_from_row():
+    meal = Meal.from_row((1, 'Spaghetti', 'Italian', 10.0, 'MED', False))
+
+    assert meal == Meal(id=1, meal='Spaghetti', cuisine='Italian', price=10.0, difficulty='MED')
+    assert not hasattr(meal, '__dict__')
+    assert pickle.loads(pickle.dumps(meal)) == meal
+
+
+@pytest.mark.skipif(not kitchen_model.MEAL_FROZEN, reason="MEAL_FROZEN is false")
+def test_meal_is_frozen():
+    meal = Meal(id=1, meal='Spaghetti', cuisine='Italian', price=10.0, difficulty='MED')
+    with pytest.raises(FrozenInstanceError):
+        meal.price = 12.0
+
+
 @patch('meal_max.models.kitchen_model.get_db_connection')
 def test_create_meal_success(mock_get_db_connection):
     mock_conn = MagicMock()
@@ -63,6 +91,82 @@ def test_create_meal_success(mock_get_db_connection):
     mock_conn.commit.assert_called_once()
 
 
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_create_meals_bulk_success(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchall.return_value = [('Tacos',)]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    results = create_meals_bulk([
+        {'meal': 'Spaghetti', 'cuisine': 'Italian', 'price': 10.0, 'difficulty': 'MED'},
+        {'meal': 'Tacos', 'cuisine': 'Mexican', 'price': '8.5', 'difficulty': 'LOW'},
+        {'meal': 'Spaghetti', 'cuisine': 'Italian', 'price': 11.0, 'difficulty': 'MED'},
+        {'meal': 'Sushi', 'cuisine': 'Japanese', 'price': -1, 'difficulty': 'HIGH'},
+    ])
+
+    assert results == [
+        {'index': 0, 'meal': 'Spaghetti', 'status': 'inserted'},
+        {'index': 1, 'meal': 'Tacos', 'status': 'duplicate'},
+        {'index': 2, 'meal': 'Spaghetti', 'status': 'duplicate'},
+        {'index': 3, 'meal': 'Sushi', 'status': 'invalid',
+         'error': "Invalid price: -1.0. Price must be a positive number."},
+    ]
+    mock_cursor.execute.assert_called_once_with("SELECT meal FROM meals WHERE meal IN (?, ?)", ['Spaghetti', 'Tacos'])
+    assert mock_cursor.executemany.call_args[0][1] == [('Spaghetti', 'Italian', 10.0, 'MED')]
+    mock_conn.commit.assert_called_once()
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_create_meals_bulk_commits_per_chunk(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchall.return_value = []
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    meals = ({'meal': f'Meal{i}', 'cuisine': 'Italian', 'price': 10.0, 'difficulty': 'MED'} for i in range(5))
+    results = create_meals_bulk(meals, chunk_size=2)
+
+    assert [result['status'] for result in results] == ['inserted'] * 5
+    assert mock_cursor.executemany.call_count == 3
+    assert mock_conn.commit.call_count == 3
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_create_meals_bulk_concurrent_duplicate(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchall.return_value = []
+    mock_cursor.executemany.side_effect = sqlite3.IntegrityError()
+    # the row-by-row retry finds that the second meal was inserted by someone else
+    mock_cursor.execute.side_effect = [None, None, sqlite3.IntegrityError()]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    results = create_meals_bulk([
+        {'meal': 'Spaghetti', 'cuisine': 'Italian', 'price': 10.0, 'difficulty': 'MED'},
+        {'meal': 'Tacos', 'cuisine': 'Mexican', 'price': 8.0, 'difficulty': 'LOW'},
+    ])
+
+    assert [result['status'] for result in results] == ['inserted', 'duplicate']
+    mock_conn.rollback.assert_called_once()
+    mock_conn.commit.assert_called_once()
+
+
+def test_create_meals_bulk_invalid_rows_skip_database():
+    with patch('meal_max.models.kitchen_model.get_db_connection') as mock_get_db_connection:
+        mock_conn = MagicMock()
+        mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+        results = create_meals_bulk(['not a meal', {'meal': 'Soup', 'cuisine': 'French', 'price': 5.555, 'difficulty': 'LOW'}])
+
+    assert results == [
+        {'index': 0, 'meal': None, 'status': 'invalid',
+         'error': "Row must be an object with meal, cuisine, price and difficulty"},
+        {'index': 1, 'meal': 'Soup', 'status': 'invalid',
+         'error': "Invalid price: 5.555. Price must have at most two decimal places."},
+    ]
+    mock_conn.cursor.return_value.executemany.assert_not_called()
+
+
 def test_create_meal_invalid_price():
     with pytest.raises(ValueError) as excinfo:
         create_meal('Spaghetti', 'Italian', -10.0, 'MED')
@@ -143,6 +247,104 @@ def test_delete_meal_success(mock_get_db_connection):
     mock_conn.commit.assert_called_once()
 
 
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_writes_bump_data_version(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchone.return_value = [False]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    version, _ = kitchen_model.get_data_version()
+    create_meal('Spaghetti', 'Italian', 10.0, 'MED')
+    delete_meal(1)
+    update_meal_stats(1, 'win')
+
+    assert kitchen_model.get_data_version()[0] == version + 3
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_failed_write_keeps_data_version(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.fetchone.return_value = None
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    version, _ = kitchen_model.get_data_version()
+    with pytest.raises(ValueError):
+        delete_meal(1)
+
+    assert kitchen_model.get_data_version()[0] == version
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_data_version_is_bumped_after_the_in_memory_updates(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchone.return_value = [False]
+    mock_cursor.fetchall.return_value = [(1, 'Meal1', 'Italian', 10.0, 'MED', 1, 1),
+                                         (2, 'Meal2', 'French', 15.0, 'LOW', 1, 0)]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+    seen = []
+
+    def record(*args):
+        # read without the lock, which the bump holds while it invalidates the cache
+        seen.append(kitchen_model._data_version)
+
+    with patch.object(kitchen_model, 'leaderboard') as board, patch.object(kitchen_model, 'meal_cache') as cache, \
+            patch('builtins.open', mock_open(read_data='')):
+        for method in (board.remove, board.upsert, board.invalidate, cache.clear, cache.invalidate,
+                       cache.invalidate_where):
+            method.side_effect = record
+        version, _ = kitchen_model.get_data_version()
+        create_meal('Spaghetti', 'Italian', 10.0, 'MED')
+        delete_meal(1)
+        record_battle_result(1, 2)
+        clear_meals()
+
+    # every cache and leaderboard update still sees the version from before its write
+    assert seen == [version, version + 1, version + 1, version + 2, version + 3, version + 3]
+    assert kitchen_model.get_data_version()[0] == version + 4
+
+
+@pytest.mark.parametrize('write', [
+    lambda: delete_meal(1),
+    lambda: update_meal_stats(1, 'win'),
+    lambda: record_battle_result(1, 2),
+    lambda: record_battle_results([(1, 2)]),
+])
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_leaderboard_is_updated_after_the_connection_is_returned(mock_get_db_connection, write):
+    """A leaderboard reload holds the board lock while it waits for a connection, so writers must not wait the other way round."""
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchone.return_value = [False]
+    mock_cursor.fetchall.return_value = [(1, 'Meal1', 'Italian', 10.0, 'MED', 1, 1),
+                                         (2, 'Meal2', 'French', 15.0, 'LOW', 1, 0)]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+    order = []
+    mock_get_db_connection.return_value.__exit__.side_effect = lambda *exc_info: order.append('released')
+
+    with patch.object(kitchen_model, 'leaderboard') as board:
+        board.remove.side_effect = board.upsert.side_effect = lambda *args: order.append('board')
+        write()
+
+    assert order == ['released', 'board']
+    board.invalidate.assert_not_called()
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_update_meal_stats_upserts_the_returned_row(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchone.return_value = [False]
+    mock_cursor.fetchall.return_value = [(1, 'Meal1', 'Italian', 10.0, 'MED', 4, 2)]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    with patch.object(kitchen_model, 'leaderboard') as board:
+        update_meal_stats(1, 'loss')
+
+    board.upsert.assert_called_once_with([(1, 'Meal1', 'Italian', 10.0, 'MED', 4, 2)])
+
+
 @patch('meal_max.models.kitchen_model.get_db_connection')
 def test_delete_meal_already_deleted(mock_get_db_connection):
     mock_conn = MagicMock()
@@ -218,6 +420,64 @@ def test_get_leaderboard_database_error(mock_get_db_connection):
     assert str(excinfo.value) == 'Database error'
 
 
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_iter_meals_fetches_in_batches(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchall.side_effect = [
+        [(1, 'Meal1', 'Italian', 10.0, 'MED', 5, 3), (2, 'Meal2', 'French', 15.0, 'LOW', 0, 0)],
+        [(3, 'Meal3', 'Mexican', 8.0, 'HIGH', 1, 1)],
+    ]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    rows = iter_meals(batch_size=2)
+    # nothing is read until the first row is asked for
+    mock_get_db_connection.assert_not_called()
+
+    meals = list(rows)
+
+    assert [meal['id'] for meal in meals] == [1, 2, 3]
+    assert meals[0] == {'id': 1, 'meal': 'Meal1', 'cuisine': 'Italian', 'price': 10.0, 'difficulty': 'MED',
+                        'battles': 5, 'wins': 3}
+    # each batch resumes after the last id, on a connection of its own
+    assert [params for _, params in (c[0] for c in mock_cursor.execute.call_args_list)] == [[0, 2], [2, 2]]
+    assert "WHERE deleted = FALSE AND id > ? ORDER BY id LIMIT ?" in mock_cursor.execute.call_args[0][0]
+    assert mock_get_db_connection.return_value.__exit__.call_count == 2
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_iter_leaderboard_resumes_from_the_last_entry(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchall.side_effect = [
+        [(1, 'Meal1', 'Italian', 10.0, 'MED', 5, 3, 0.6)],
+        [(4, 'Meal4', 'Italian', 12.0, 'LOW', 2, 1, 0.5)],
+        [],
+    ]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    rows = iter_leaderboard('win_pct', cuisine='Italian', batch_size=1)
+    assert next(rows)['win_pct'] == 60.0
+    # the first batch's connection is already back in the pool
+    mock_get_db_connection.return_value.__exit__.assert_called_once()
+    assert [entry['id'] for entry in rows] == [4]
+
+    first, second, third = (c[0] for c in mock_cursor.execute.call_args_list)
+    assert "ORDER BY (wins * 1.0 / battles) DESC, id ASC LIMIT ? OFFSET ?" in first[0]
+    assert first[1] == ['Italian', 1, 0]
+    assert second[1] == ['Italian', 0.6, 0.6, 1, 1, 0]
+    assert third[1] == ['Italian', 0.5, 0.5, 4, 1, 0]
+
+
+def test_iter_leaderboard_invalid_arguments():
+    with pytest.raises(ValueError) as excinfo:
+        iter_leaderboard('invalid_sort')
+    assert str(excinfo.value) == "Invalid sort_by parameter: invalid_sort"
+
+    with pytest.raises(ValueError):
+        iter_meals(batch_size=0)
+
+
 @patch('meal_max.models.kitchen_model.get_db_connection')
 def test_get_meal_by_id_success(mock_get_db_connection):
     mock_conn = MagicMock()
@@ -243,6 +503,35 @@ def test_get_meal_by_id_not_found(mock_get_db_connection):
     assert str(excinfo.value) == "Meal with ID 1 not found"
 
 
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_meal_read_before_a_concurrent_delete_is_not_cached(mock_get_db_connection):
+    row = (1, 'Meal1', 'Italian', 10.0, 'MED', False)
+
+    def deleted_after_the_read(result):
+        # the delete commits and invalidates the cache between this read and its cache write
+        def read(*args):
+            kitchen_model._bump_data_version(lambda: kitchen_model._invalidate_meal(meal_id=1))
+            return result
+        return read
+
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchone.side_effect = deleted_after_the_read(row)
+    mock_cursor.fetchall.side_effect = deleted_after_the_read([row])
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    assert get_meal_by_id(1).id == 1
+    assert get_meals_by_ids([1])[0].id == 1
+    assert kitchen_model.meal_cache.get(('id', 1)) is None
+    assert kitchen_model.meal_cache.get(('name', 'Meal1')) is None
+
+    # with no write in between, the next read is cached as before
+    mock_cursor.fetchone.side_effect = None
+    mock_cursor.fetchone.return_value = row
+    get_meal_by_id(1)
+    assert kitchen_model.meal_cache.get(('id', 1)) is not None
+
+
 @patch('meal_max.models.kitchen_model.get_db_connection')
 def test_get_meal_by_id_deleted(mock_get_db_connection):
     mock_conn = MagicMock()
@@ -327,7 +616,8 @@ def test_update_meal_stats_win(mock_get_db_connection):
 
     calls = [
         (("SELECT deleted FROM meals WHERE id = ?", (1,)),),
-        (("UPDATE meals SET battles = battles + 1, wins = wins + 1 WHERE id = ?", (1,)),)
+        (("UPDATE meals SET battles = battles + 1, wins = wins + 1 WHERE id = ?"
+          " RETURNING id, meal, cuisine, price, difficulty, battles, wins", (1,)),)
     ]
     mock_cursor.execute.assert_has_calls(calls)
     mock_conn.commit.assert_called_once()
@@ -344,7 +634,8 @@ def test_update_meal_stats_loss(mock_get_db_connection):
 
     calls = [
         (("SELECT deleted FROM meals WHERE id = ?", (1,)),),
-        (("UPDATE meals SET battles = battles + 1 WHERE id = ?", (1,)),)
+        (("UPDATE meals SET battles = battles + 1 WHERE id = ?"
+          " RETURNING id, meal, cuisine, price, difficulty, battles, wins", (1,)),)
     ]
     mock_cursor.execute.assert_has_calls(calls)
     mock_conn.commit.assert_called_once()
@@ -398,3 +689,339 @@ def test_update_meal_stats_database_error(mock_get_db_connection):
     with pytest.raises(sqlite3.Error) as excinfo:
         update_meal_stats(1, 'win')
     assert str(excinfo.value) == 'Database error'
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_record_battle_result_success(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchall.return_value = [
+        (1, 'Meal1', 'Italian', 10.0, 'MED', 1, 1),
+        (2, 'Meal2', 'French', 15.0, 'LOW', 1, 0),
+    ]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    with patch('meal_max.models.kitchen_model.leaderboard') as mock_leaderboard:
+        record_battle_result(1, 2)
+
+    # a single statement updates both rows and returns them for the leaderboard
+    mock_cursor.execute.assert_called_once()
+    sql_executed = ' '.join(mock_cursor.execute.call_args[0][0].split())
+    assert sql_executed == (
+        "UPDATE meals SET battles = battles + 1, wins = wins + CASE WHEN id = ? THEN 1 ELSE 0 END "
+        "WHERE id IN (?, ?) AND deleted = FALSE "
+        "RETURNING id, meal, cuisine, price, difficulty, battles, wins"
+    )
+    mock_leaderboard.upsert.assert_called_once_with(mock_cursor.fetchall.return_value)
+    assert mock_cursor.execute.call_args[0][1] == (1, 1, 2)
+    mock_conn.commit.assert_called_once()
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_record_battle_result_meal_not_found(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchall.side_effect = [[(1, 'Meal1', 'Italian', 10.0, 'MED', 1, 1)], [(1, False)]]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    with pytest.raises(ValueError) as excinfo:
+        record_battle_result(1, 2)
+    assert str(excinfo.value) == "Meal with ID 2 not found"
+    mock_conn.rollback.assert_called_once()
+    mock_conn.commit.assert_not_called()
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_record_battle_result_meal_deleted(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchall.side_effect = [[(2, 'Meal2', 'French', 15.0, 'LOW', 1, 0)], [(1, True), (2, False)]]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    with pytest.raises(ValueError) as excinfo:
+        record_battle_result(1, 2)
+    assert str(excinfo.value) == "Meal with ID 1 has been deleted"
+    mock_conn.commit.assert_not_called()
+
+
+def test_record_battle_result_same_meal():
+    with pytest.raises(ValueError) as excinfo:
+        record_battle_result(1, 1)
+    assert str(excinfo.value) == "Invalid battle result: meal with ID 1 cannot battle itself."
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_record_battle_result_database_error(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.execute.side_effect = sqlite3.Error('Database error')
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    with pytest.raises(sqlite3.Error) as excinfo:
+        record_battle_result(1, 2)
+    assert str(excinfo.value) == 'Database error'
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_get_meal_by_id_served_from_cache(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchone.return_value = (1, 'Meal1', 'Italian', 10.0, 'MED', False)
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    meal = get_meal_by_id(1)
+
+    # both the id and the name lookup now hit the cache
+    assert get_meal_by_id(1) is meal
+    assert get_meal_by_name('Meal1') is meal
+    mock_cursor.execute.assert_called_once()
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_delete_meal_invalidates_cache(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchone.return_value = (1, 'Meal1', 'Italian', 10.0, 'MED', False)
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+    get_meal_by_name('Meal1')
+
+    mock_cursor.fetchone.return_value = [False]
+    delete_meal(1)
+
+    mock_cursor.fetchone.return_value = (1, 'Meal1', 'Italian', 10.0, 'MED', True)
+    with pytest.raises(ValueError) as excinfo:
+        get_meal_by_name('Meal1')
+    assert str(excinfo.value) == "Meal with name Meal1 has been deleted"
+    with pytest.raises(ValueError) as excinfo:
+        get_meal_by_id(1)
+    assert str(excinfo.value) == "Meal with ID 1 has been deleted"
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+@patch('builtins.open', new_callable=mock_open, read_data='CREATE TABLE meals...')
+def test_clear_meals_empties_cache(mock_file, mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchone.return_value = (1, 'Meal1', 'Italian', 10.0, 'MED', False)
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+    get_meal_by_id(1)
+
+    clear_meals()
+
+    assert get_meal_cache_stats()['size'] == 0
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_get_leaderboard_paginated_with_filters(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchall.return_value = []
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    get_leaderboard(sort_by='wins', limit=10, offset=20, cuisine='Italian', difficulty='MED')
+
+    sql_executed = ' '.join(mock_cursor.execute.call_args[0][0].split())
+    assert sql_executed == (
+        "SELECT id, meal, cuisine, price, difficulty, battles, wins, (wins * 1.0 / battles) AS win_pct "
+        "FROM meals WHERE deleted = FALSE AND battles > 0 AND cuisine = ? AND difficulty = ? "
+        "ORDER BY wins DESC, id ASC LIMIT ? OFFSET ?"
+    )
+    assert mock_cursor.execute.call_args[0][1] == ['Italian', 'MED', 10, 20]
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_get_leaderboard_keyset_cursor(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchall.return_value = []
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    cursor = encode_cursor({'id': 7, 'wins': 2, 'battles': 3}, sort_by='win_pct')
+    get_leaderboard(sort_by='win_pct', limit=5, cursor=cursor)
+
+    sql_executed = ' '.join(mock_cursor.execute.call_args[0][0].split())
+    assert sql_executed.endswith(
+        "AND ((wins * 1.0 / battles) < ? OR ((wins * 1.0 / battles) = ? AND id > ?)) "
+        "ORDER BY (wins * 1.0 / battles) DESC, id ASC LIMIT ? OFFSET ?"
+    )
+    assert mock_cursor.execute.call_args[0][1] == [2 / 3, 2 / 3, 7, 5, 0]
+
+
+def test_get_leaderboard_invalid_limit():
+    with pytest.raises(ValueError) as excinfo:
+        get_leaderboard(limit=-1)
+    assert str(excinfo.value) == "Invalid limit: -1. Must be a non-negative integer."
+
+
+def test_get_leaderboard_invalid_cursor():
+    with pytest.raises(ValueError) as excinfo:
+        get_leaderboard(cursor='not-a-cursor')
+    assert str(excinfo.value) == "Invalid leaderboard cursor: not-a-cursor"
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_get_meals_by_ids_single_query(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchall.return_value = [
+        (1, 'Meal1', 'Italian', 10.0, 'MED', False),
+        (3, 'Meal3', 'Mexican', 8.0, 'HIGH', False),
+    ]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    meals = get_meals_by_ids([3, 1])
+
+    assert [meal.id for meal in meals] == [3, 1]
+    mock_cursor.execute.assert_called_once_with(
+        "SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE id IN (?, ?)", [3, 1]
+    )
+
+    # the meals are now cached, so asking again does not query
+    assert get_meals_by_ids([1, 3]) == [meals[1], meals[0]]
+    mock_cursor.execute.assert_called_once()
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_get_meals_by_ids_not_found(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.fetchall.return_value = [(1, 'Meal1', 'Italian', 10.0, 'MED', False)]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    with pytest.raises(ValueError) as excinfo:
+        get_meals_by_ids([1, 2])
+    assert str(excinfo.value) == "Meal with ID 2 not found"
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_get_meals_by_ids_deleted(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.fetchall.return_value = [
+        (1, 'Meal1', 'Italian', 10.0, 'MED', False),
+        (2, 'Meal2', 'French', 15.0, 'LOW', True),
+    ]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    with pytest.raises(ValueError) as excinfo:
+        get_meals_by_ids([1, 2])
+    assert str(excinfo.value) == "Meal with ID 2 has been deleted"
+
+
+@patch('meal_max.models.kitchen_model.BULK_CHUNK_SIZE', 2)
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_get_meals_by_ids_chunked(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchall.side_effect = [
+        [(1, 'Meal1', 'Italian', 10.0, 'MED', False), (2, 'Meal2', 'French', 15.0, 'LOW', False)],
+        [(3, 'Meal3', 'Mexican', 8.0, 'HIGH', False)],
+    ]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    meals = get_meals_by_ids([1, 2, 3, 1])
+
+    assert [meal.id for meal in meals] == [1, 2, 3, 1]
+    # duplicates are looked up once, and every chunk shares one connection
+    assert mock_cursor.execute.call_args_list == [
+        call("SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE id IN (?, ?)", [1, 2]),
+        call("SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE id IN (?)", [3]),
+    ]
+    mock_get_db_connection.assert_called_once()
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_get_meals_by_names(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchall.return_value = [(2, 'Meal2', 'French', 15.0, 'LOW', False)]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    meals = get_meals_by_names(['Meal2'])
+
+    assert meals == [Meal(id=2, meal='Meal2', cuisine='French', price=15.0, difficulty='LOW')]
+    mock_cursor.execute.assert_called_once_with(
+        "SELECT id, meal, cuisine, price, difficulty, deleted FROM meals WHERE meal IN (?)", ['Meal2']
+    )
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_get_meals_by_names_not_found(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.fetchall.return_value = []
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    with pytest.raises(ValueError) as excinfo:
+        get_meals_by_names(['Meal9'])
+    assert str(excinfo.value) == "Meal with name Meal9 not found"
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_find_meals_reports_missing_and_deleted(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value.fetchall.return_value = [
+        (1, 'Meal1', 'Italian', 10.0, 'MED', False),
+        (2, 'Meal2', 'French', 15.0, 'LOW', True),
+    ]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    result = find_meals(meal_ids=[4, 2, 1])
+
+    assert [meal.id for meal in result['meals']] == [1]
+    assert result['missing'] == [4]
+    assert result['deleted'] == [2]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {'meal_ids': [1], 'meal_names': ['Meal1']},
+    {'meal_ids': [1, 'two']},
+    {'meal_ids': [True]},
+    {'meal_names': 'Meal1'},
+])
+def test_find_meals_invalid_input(kwargs):
+    with pytest.raises(ValueError):
+        find_meals(**kwargs)
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_record_battle_results_one_update_per_meal(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchone.side_effect = [
+        (1, 'Meal1', 'Italian', 10.0, 'MED', 2, 2),
+        (2, 'Meal2', 'French', 15.0, 'LOW', 2, 0),
+        (3, 'Meal3', 'Mexican', 8.0, 'HIGH', 2, 1),
+    ]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    with patch('meal_max.models.kitchen_model.leaderboard') as mock_leaderboard:
+        record_battle_results([(1, 2), (1, 3), (3, 2)])
+
+    assert [call[0][1] for call in mock_cursor.execute.call_args_list] == [(2, 2, 1), (2, 0, 2), (2, 1, 3)]
+    sql_executed = ' '.join(mock_cursor.execute.call_args[0][0].split())
+    assert sql_executed == (
+        "UPDATE meals SET battles = battles + ?, wins = wins + ? "
+        "WHERE id = ? AND deleted = FALSE "
+        "RETURNING id, meal, cuisine, price, difficulty, battles, wins"
+    )
+    mock_conn.commit.assert_called_once()
+    assert len(mock_leaderboard.upsert.call_args[0][0]) == 3
+
+
+@patch('meal_max.models.kitchen_model.get_db_connection')
+def test_record_battle_results_rolls_back_on_deleted_meal(mock_get_db_connection):
+    mock_conn = MagicMock()
+    mock_cursor = mock_conn.cursor.return_value
+    mock_cursor.fetchone.side_effect = [(1, 'Meal1', 'Italian', 10.0, 'MED', 1, 1), None, (True,)]
+    mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+
+    with pytest.raises(ValueError) as excinfo:
+        record_battle_results([(1, 2)])
+    assert str(excinfo.value) == "Meal with ID 2 has been deleted"
+    mock_conn.rollback.assert_called_once()
+    mock_conn.commit.assert_not_called()
+
+
+def test_record_battle_results_same_meal():
+    with pytest.raises(ValueError) as excinfo:
+        record_battle_results([(1, 2), (3, 3)])
+    assert str(excinfo.value) == "Invalid battle result: meal with ID 3 cannot battle itself."
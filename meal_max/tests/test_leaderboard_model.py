@@ -0,0 +1,131 @@
+import sqlite3
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from meal_max.models.leaderboard_model import Leaderboard, decode_cursor, encode_cursor
+
+
+ROWS = [
+    (1, 'Meal1', 'Italian', 10.0, 'MED', 5, 3),
+    (2, 'Meal2', 'French', 15.0, 'LOW', 2, 2),
+    (3, 'Meal3', 'Mexican', 8.0, 'HIGH', 4, 1),
+]
+
+
+@pytest.fixture
+def board():
+    with patch('meal_max.models.leaderboard_model.get_db_connection') as mock_get_db_connection:
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value.fetchall.return_value = ROWS
+        mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+        board = Leaderboard()
+        board.get_leaderboard()
+        yield board
+
+
+def test_get_leaderboard_sort_by_wins(board):
+    leaderboard = board.get_leaderboard(sort_by='wins')
+    assert [meal['id'] for meal in leaderboard] == [1, 2, 3]
+    assert leaderboard[0] == {'id': 1, 'meal': 'Meal1', 'cuisine': 'Italian', 'price': 10.0,
+                              'difficulty': 'MED', 'battles': 5, 'wins': 3, 'win_pct': 60.0}
+
+
+def test_get_leaderboard_sort_by_win_pct(board):
+    assert [meal['id'] for meal in board.get_leaderboard(sort_by='win_pct')] == [2, 1, 3]
+
+
+def test_get_leaderboard_limit(board):
+    assert [meal['id'] for meal in board.get_leaderboard(sort_by='win_pct', limit=2)] == [2, 1]
+
+
+def test_get_leaderboard_invalid_sort_by(board):
+    with pytest.raises(ValueError) as excinfo:
+        board.get_leaderboard(sort_by='battles')
+    assert str(excinfo.value) == "Invalid sort_by parameter: battles"
+
+
+def test_upsert_moves_meal_and_adds_new_meal(board):
+    board.upsert([(3, 'Meal3', 'Mexican', 8.0, 'HIGH', 8, 5), (4, 'Meal4', 'Indian', 9.0, 'MED', 1, 1)])
+
+    assert [meal['id'] for meal in board.get_leaderboard(sort_by='wins')] == [3, 1, 2, 4]
+    # 100% like Meal2, but behind it on id
+    assert board.get_rank(4, sort_by='win_pct')['rank'] == 2
+    assert board.get_rank(3, sort_by='wins') == {
+        'id': 3, 'meal': 'Meal3', 'cuisine': 'Mexican', 'price': 8.0, 'difficulty': 'HIGH',
+        'battles': 8, 'wins': 5, 'win_pct': 62.5, 'rank': 1, 'total': 4,
+    }
+
+
+def test_upsert_keeps_returning_price_a_float(board):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE meals (id INTEGER PRIMARY KEY, meal TEXT, cuisine TEXT, price REAL, "
+                  "difficulty TEXT, battles INTEGER, wins INTEGER)")
+    conn.execute("INSERT INTO meals VALUES (5, 'Meal5', 'Thai', 20.0, 'LOW', 0, 0)")
+    rows = conn.execute("UPDATE meals SET battles = 1, wins = 1 WHERE id = 5 "
+                        "RETURNING id, meal, cuisine, price, difficulty, battles, wins").fetchall()
+    conn.close()
+
+    board.upsert(rows)
+
+    price = board.get_rank(5)['price']
+    assert price == 20.0 and isinstance(price, float)
+
+
+def test_upsert_ignores_stale_rows(board):
+    board.upsert([(1, 'Meal1', 'Italian', 10.0, 'MED', 4, 3)])
+    assert board.get_rank(1)['battles'] == 5
+
+
+def test_ties_break_by_id(board):
+    board.upsert([(3, 'Meal3', 'Mexican', 8.0, 'HIGH', 6, 3)])
+    assert [meal['id'] for meal in board.get_leaderboard(sort_by='wins')] == [1, 3, 2]
+
+
+def test_remove_drops_meal(board):
+    board.remove(1)
+    assert [meal['id'] for meal in board.get_leaderboard()] == [2, 3]
+    with pytest.raises(ValueError) as excinfo:
+        board.get_rank(1)
+    assert str(excinfo.value) == "Meal with ID 1 is not on the leaderboard"
+
+
+def test_invalidate_reloads_from_database(board):
+    board.invalidate()
+    with patch('meal_max.models.leaderboard_model.get_db_connection') as mock_get_db_connection:
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value.fetchall.return_value = ROWS[:1]
+        mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+        assert [meal['id'] for meal in board.get_leaderboard()] == [1]
+        mock_conn.cursor.return_value.execute.assert_called_once()
+
+
+def test_upsert_before_load_is_deferred():
+    board = Leaderboard()
+    board.upsert([(1, 'Meal1', 'Italian', 10.0, 'MED', 1, 1)])
+    with patch('meal_max.models.leaderboard_model.get_db_connection') as mock_get_db_connection:
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value.fetchall.return_value = ROWS
+        mock_get_db_connection.return_value.__enter__.return_value = mock_conn
+        assert len(board.get_leaderboard()) == 3
+
+
+def test_get_leaderboard_offset(board):
+    assert [meal['id'] for meal in board.get_leaderboard(sort_by='wins', limit=1, offset=1)] == [2]
+
+
+def test_get_leaderboard_cursor_continues_after_entry(board):
+    first_page = board.get_leaderboard(sort_by='win_pct', limit=1)
+    cursor = encode_cursor(first_page[0], sort_by='win_pct')
+    assert [meal['id'] for meal in board.get_leaderboard(sort_by='win_pct', cursor=cursor)] == [1, 3]
+
+
+def test_decode_cursor_round_trip():
+    cursor = encode_cursor({'id': 3, 'wins': 1, 'battles': 3}, sort_by='win_pct')
+    assert decode_cursor(cursor) == (1 / 3, 3)
+
+
+def test_decode_cursor_invalid():
+    with pytest.raises(ValueError) as excinfo:
+        decode_cursor('bm90IGpzb24=')
+    assert str(excinfo.value) == "Invalid leaderboard cursor: bm90IGpzb24="
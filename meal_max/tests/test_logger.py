@@ -0,0 +1,141 @@
+import json
+import logging
+from logging.handlers import QueueHandler
+import pytest
+from unittest.mock import patch
+
+from flask import Flask
+from flask.logging import default_handler
+
+from meal_max.utils import logger as logger_utils
+from meal_max.utils.logger import (
+    JsonFormatter,
+    SamplingFilter,
+    configure_app_logger,
+    configure_logger,
+    get_log_level,
+    parse_module_levels,
+    parse_sample_rates,
+)
+
+
+def test_parse_module_levels():
+    assert parse_module_levels(" meal_max.models=WARNING, meal_max.utils.sql_utils=info,") == {
+        'meal_max.models': logging.WARNING,
+        'meal_max.utils.sql_utils': logging.INFO,
+    }
+
+
+@pytest.mark.parametrize("spec, message", [
+    ("meal_max.models", "Invalid LOG_LEVELS entry: meal_max.models. Expected module=LEVEL."),
+    ("meal_max.models=LOUD", "Invalid log level: LOUD."),
+])
+def test_parse_module_levels_invalid(spec, message):
+    with pytest.raises(ValueError) as excinfo:
+        parse_module_levels(spec)
+    assert str(excinfo.value) == message
+
+
+def test_get_log_level_uses_closest_module_entry():
+    levels = {'meal_max.models': logging.WARNING, 'meal_max.models.battle_model': logging.ERROR}
+    with patch.object(logger_utils, '_module_levels', levels), \
+            patch.object(logger_utils, '_default_level', logging.DEBUG):
+        assert get_log_level('meal_max.models.battle_model') == logging.ERROR
+        assert get_log_level('meal_max.models.kitchen_model') == logging.WARNING
+        assert get_log_level('meal_max.utils.sql_utils') == logging.DEBUG
+
+
+def test_queue_mode_writes_on_listener_thread(capsys):
+    """Test that queue mode hands records to the listener, which formats and writes them."""
+    with patch.object(logger_utils, 'LOG_MODE', 'queue'), \
+            patch.object(logger_utils, '_log_handler', None), \
+            patch.object(logger_utils, '_queue_handler', None), \
+            patch.object(logger_utils, '_listener', None):
+        logger = logging.getLogger('tests.queue_mode')
+        configure_logger(logger)
+        handler = logger.handlers[-1]
+        assert isinstance(handler, QueueHandler)
+
+        record = logger.makeRecord(logger.name, logging.INFO, __file__, 0, "Score for %s: %.3f", ('Meal1', 1.5), None)
+        assert handler.prepare(record) is record
+        assert record.msg == "Score for %s: %.3f"
+
+        logger.info("Score for %s: %.3f", 'Meal1', 1.5)
+        logger_utils.stop_log_listener()
+        logger.removeHandler(handler)
+
+    assert "tests.queue_mode - INFO - Score for Meal1: 1.500" in capsys.readouterr().err
+
+
+def test_configure_logger_is_idempotent(capsys):
+    """Test that configuring a logger repeatedly attaches the shared handler once, so each line is written once."""
+    with patch.object(logger_utils, 'LOG_MODE', 'sync'), patch.object(logger_utils, '_log_handler', None):
+        logger = logging.getLogger('tests.idempotent')
+        for _ in range(3):
+            configure_logger(logger)
+        assert logger.handlers == [logger_utils.get_log_handler()]
+
+        logger.info("Battle started")
+        logger.removeHandler(logger_utils.get_log_handler())
+
+    assert capsys.readouterr().err.count("Battle started") == 1
+
+
+def test_configure_app_logger_shares_module_handler():
+    app = Flask('tests_app')
+    with patch.object(logger_utils, 'LOG_MODE', 'sync'), patch.object(logger_utils, '_log_handler', None):
+        configure_app_logger(app)
+        configure_app_logger(app)
+        assert app.logger.handlers == [logger_utils.get_log_handler()]
+    assert default_handler not in app.logger.handlers
+
+
+def make_record(level=logging.INFO, event=None, **fields):
+    record = logging.LogRecord('meal_max.models.battle_model', level, __file__, 0, "Score for %s: %.3f",
+                               ('Meal1', 1.5), None)
+    if event is not None:
+        record.event = event
+    record.__dict__.update(fields)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    entry = json.loads(JsonFormatter().format(make_record(event='battle.score', meal_id=1, score=1.5)))
+
+    assert entry['level'] == 'INFO'
+    assert entry['logger'] == 'meal_max.models.battle_model'
+    assert entry['message'] == "Score for Meal1: 1.500"
+    assert entry['event'] == 'battle.score'
+    assert entry['meal_id'] == 1
+    assert entry['score'] == 1.5
+    assert 'args' not in entry and 'msg' not in entry
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates("battle.score=0.1, db.connection_released=0") == {
+        'battle.score': 0.1,
+        'db.connection_released': 0.0,
+    }
+    with pytest.raises(ValueError) as excinfo:
+        parse_sample_rates("battle.score=2")
+    assert str(excinfo.value) == ("Invalid LOG_SAMPLE_RATES entry: battle.score=2. Expected event=rate, "
+                                  "with rate between 0 and 1.")
+
+
+def test_sampling_filter_samples_tagged_events_only():
+    sampling = SamplingFilter({'battle.score': 0.25, 'db.connection_released': 0.0})
+
+    with patch.object(sampling._random, 'random', side_effect=[0.1, 0.5]):
+        kept = make_record(event='battle.score')
+        assert sampling.filter(kept)
+        assert kept.sample_rate == 0.25
+        assert not sampling.filter(make_record(event='battle.score'))
+
+    assert not sampling.filter(make_record(event='db.connection_released'))
+    assert sampling.filter(make_record(event='battle.winner'))
+    assert sampling.filter(make_record())
+
+
+def test_sampling_filter_always_keeps_warnings_and_errors():
+    sampling = SamplingFilter({'db.connection_released': 0.0})
+    assert sampling.filter(make_record(level=logging.ERROR, event='db.connection_released'))
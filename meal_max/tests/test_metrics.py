@@ -0,0 +1,108 @@
+import threading
+import pytest
+
+from meal_max.utils.metrics import LatencyHistogram, MetricsRegistry, call_duration, call_errors, timed
+
+
+def test_observations_land_in_their_buckets():
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(seconds)
+
+    snapshot = histogram.snapshot()
+    assert snapshot['buckets'] == {'0.1': 2, '1.0': 1, '+Inf': 1}
+    assert snapshot['count'] == 4
+    assert snapshot['sum'] == pytest.approx(2.65)
+    assert snapshot['max'] == 2.0
+
+
+def test_empty_histogram():
+    snapshot = LatencyHistogram().snapshot()
+    assert snapshot['count'] == 0
+    assert snapshot['avg'] == 0.0
+    assert snapshot['max'] is None
+
+
+def test_reset_clears_observations():
+    histogram = LatencyHistogram(buckets=(1.0,))
+    histogram.observe(0.5)
+    histogram.reset()
+    assert histogram.snapshot()['buckets'] == {'1.0': 0, '+Inf': 0}
+
+
+def test_invalid_buckets():
+    with pytest.raises(ValueError) as excinfo:
+        LatencyHistogram(buckets=(1.0, 0.5))
+    assert str(excinfo.value) == "Histogram buckets must be a non-empty, strictly increasing sequence."
+
+
+def test_concurrent_observations_are_all_counted():
+    histogram = LatencyHistogram()
+    threads = [threading.Thread(target=lambda: [histogram.observe(0.01) for _ in range(1000)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert histogram.snapshot()['count'] == 8000
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests_total", "Requests.", ("route", "status"))
+    duration = registry.histogram("test_duration_seconds", "Duration.", ("route",), buckets=(0.1, 1.0))
+    registry.gauge("test_depth", "Depth.", lambda: 3)
+    registry.gauge("test_missing", "Missing.", lambda: None)
+
+    requests.inc('/api/battle', '200')
+    requests.inc('/api/battle', '200')
+    duration.observe(0.05, '/api/battle')
+    duration.observe(0.5, '/api/battle')
+
+    assert registry.render() == (
+        '# HELP test_requests_total Requests.\n'
+        '# TYPE test_requests_total counter\n'
+        'test_requests_total{route="/api/battle",status="200"} 2\n'
+        '# HELP test_duration_seconds Duration.\n'
+        '# TYPE test_duration_seconds histogram\n'
+        'test_duration_seconds_bucket{route="/api/battle",le="0.1"} 1\n'
+        'test_duration_seconds_bucket{route="/api/battle",le="1.0"} 2\n'
+        'test_duration_seconds_bucket{route="/api/battle",le="+Inf"} 2\n'
+        'test_duration_seconds_sum{route="/api/battle"} 0.55\n'
+        'test_duration_seconds_count{route="/api/battle"} 2\n'
+        '# HELP test_depth Depth.\n'
+        '# TYPE test_depth gauge\n'
+        'test_depth 3\n'
+        '# HELP test_missing Missing.\n'
+        '# TYPE test_missing gauge\n'
+    )
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("test_total", "Test.", ("path",)).inc('a"b\\c\nd')
+    assert 'test_total{path="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+
+def test_registry_returns_existing_metric():
+    registry = MetricsRegistry()
+    assert registry.counter("test_total", "Test.") is registry.counter("test_total", "Test.")
+
+
+def test_timed_records_duration_and_errors():
+    @timed("tests.succeeds")
+    def succeeds():
+        return 'ok'
+
+    @timed("tests.fails")
+    def fails():
+        raise ValueError("boom")
+
+    assert succeeds() == 'ok'
+    with pytest.raises(ValueError):
+        fails()
+
+    assert call_duration.labels("tests.succeeds").snapshot()['count'] == 1
+    assert call_duration.labels("tests.fails").snapshot()['count'] == 1
+    assert call_errors.value("tests.fails") == 1
+    assert call_errors.value("tests.succeeds") == 0
+    assert succeeds.__name__ == 'succeeds'
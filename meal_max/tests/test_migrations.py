@@ -0,0 +1,186 @@
+from contextlib import contextmanager
+import os
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from meal_max.models import kitchen_model
+from meal_max.models.leaderboard_model import Leaderboard, encode_cursor
+from meal_max.utils.migrations import apply_migrations, get_schema_version, list_migrations, migrate
+
+
+SQL_DIR = os.path.join(os.path.dirname(__file__), "..", "sql")
+MIGRATIONS_DIR = os.path.join(SQL_DIR, "migrations")
+
+# the schema create_meal_table.sql built before migrations existed
+LEGACY_SCHEMA = """
+CREATE TABLE meals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    meal TEXT NOT NULL UNIQUE,
+    cuisine TEXT NOT NULL,
+    price REAL NOT NULL,
+    difficulty TEXT CHECK(difficulty IN ('HIGH', 'MED', 'LOW')),
+    battles INTEGER DEFAULT 0,
+    wins INTEGER DEFAULT 0,
+    deleted BOOLEAN DEFAULT FALSE
+);
+"""
+
+
+class RecordingCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        self.connection.queries.append((sql, parameters))
+        return super().execute(sql, parameters)
+
+
+class RecordingConnection(sqlite3.Connection):
+    """Keeps every query run through its cursors so their plans can be checked."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.queries = []
+
+    def cursor(self, factory=RecordingCursor):
+        return super().cursor(factory)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "meal_max.db")
+    migrate(path, MIGRATIONS_DIR)
+    return path
+
+
+@pytest.fixture
+def recording_conn(db_path):
+    conn = sqlite3.connect(db_path, factory=RecordingConnection)
+    conn.executemany(
+        "INSERT INTO meals (meal, cuisine, price, difficulty, battles, wins, deleted) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(f"Meal{i}", "Italian" if i % 2 else "French", 10.0, "MED", i % 7, i % 5, i % 11 == 0) for i in range(200)]
+    )
+    conn.commit()
+    conn.queries.clear()
+
+    @contextmanager
+    def get_db_connection():
+        yield conn
+
+    with patch('meal_max.models.kitchen_model.get_db_connection', get_db_connection), \
+            patch('meal_max.models.leaderboard_model.get_db_connection', get_db_connection):
+        yield conn
+    conn.close()
+
+
+def query_plan(conn, sql, parameters):
+    return " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters))
+
+
+def schema(conn):
+    rows = conn.execute("SELECT type, name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_%' ORDER BY name")
+    return [(type_, name, " ".join(sql.split())) for type_, name, sql in rows]
+
+
+######################################################
+#
+#    Applying migrations
+#
+######################################################
+
+
+def test_list_migrations_in_version_order():
+    versions = [version for version, _ in list_migrations(MIGRATIONS_DIR)]
+    assert versions == sorted(versions)
+    assert versions[0] == 1
+
+
+def test_migrate_new_database(tmp_path):
+    path = str(tmp_path / "meal_max.db")
+    latest = list_migrations(MIGRATIONS_DIR)[-1][0]
+
+    assert migrate(path, MIGRATIONS_DIR) == list(range(1, latest + 1))
+    assert migrate(path, MIGRATIONS_DIR) == []
+
+    conn = sqlite3.connect(path)
+    assert get_schema_version(conn) == latest
+    conn.close()
+
+
+def test_migrate_keeps_existing_meals(tmp_path):
+    path = str(tmp_path / "meal_max.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.execute("INSERT INTO meals (meal, cuisine, price, difficulty, battles, wins) VALUES ('Pizza', 'Italian', 12.5, 'MED', 3, 2)")
+    conn.commit()
+
+    apply_migrations(conn, MIGRATIONS_DIR)
+
+    assert conn.execute("SELECT meal, battles, wins FROM meals").fetchall() == [('Pizza', 3, 2)]
+    assert 'idx_meals_leaderboard_wins' in [name for _, name, _ in schema(conn)]
+    conn.close()
+
+
+def test_failed_migration_is_rolled_back(tmp_path):
+    migrations_dir = tmp_path / "migrations"
+    migrations_dir.mkdir()
+    (migrations_dir / "001_create_meals_table.sql").write_text(LEGACY_SCHEMA)
+    (migrations_dir / "002_broken.sql").write_text(
+        "CREATE INDEX idx_meals_cuisine ON meals (cuisine);\nCREATE INDEX idx_broken ON missing_table (id);"
+    )
+    conn = sqlite3.connect(str(tmp_path / "meal_max.db"))
+
+    with pytest.raises(sqlite3.Error):
+        apply_migrations(conn, str(migrations_dir))
+
+    assert get_schema_version(conn) == 1
+    assert 'idx_meals_cuisine' not in [name for _, name, _ in schema(conn)]
+    conn.close()
+
+
+def test_create_table_script_matches_migrations(db_path, tmp_path):
+    migrated = sqlite3.connect(db_path)
+    recreated = sqlite3.connect(str(tmp_path / "recreated.db"))
+    with open(os.path.join(SQL_DIR, "create_meal_table.sql")) as fh:
+        recreated.executescript(fh.read())
+
+    # CREATE TABLE IF NOT EXISTS is stored verbatim, so compare without it
+    assert [(t, n, s.replace(" IF NOT EXISTS", "")) for t, n, s in schema(migrated)] == schema(recreated)
+    assert get_schema_version(recreated) == get_schema_version(migrated)
+    migrated.close()
+    recreated.close()
+
+
+######################################################
+#
+#    Query plans
+#
+######################################################
+
+
+@pytest.mark.parametrize("sort_by", ["wins", "win_pct"])
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {'limit': 10},
+    {'limit': 10, 'offset': 20},
+    {'limit': 10, 'cuisine': 'Italian', 'difficulty': 'MED'},
+    {'limit': 10, 'cursor': True},
+])
+def test_leaderboard_query_uses_covering_index(recording_conn, sort_by, kwargs):
+    if kwargs.get('cursor'):
+        first_page = kitchen_model.get_leaderboard(sort_by, limit=10)
+        kwargs = {**kwargs, 'cursor': encode_cursor(first_page[-1], sort_by)}
+        recording_conn.queries.clear()
+
+    kitchen_model.get_leaderboard(sort_by, **kwargs)
+
+    (sql, parameters), = recording_conn.queries
+    plan = query_plan(recording_conn, sql, parameters)
+    assert f"USING COVERING INDEX idx_meals_leaderboard_{sort_by}" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_leaderboard_load_uses_covering_index(recording_conn):
+    Leaderboard().get_leaderboard()
+
+    (sql, parameters), = recording_conn.queries
+    assert "USING COVERING INDEX idx_meals_leaderboard_" in query_plan(recording_conn, sql, parameters)
@@ -0,0 +1,106 @@
+import pytest
+from unittest.mock import Mock, patch
+
+from meal_max.utils import random_utils
+from meal_max.utils.random_providers import (
+    CircuitBreakerProvider,
+    LocalRandomProvider,
+    RandomOrgProvider,
+    SeededRandomProvider,
+    create_random_provider,
+)
+from tests.fake_random_org import FakeRandomOrg
+
+
+@pytest.fixture
+def fake_random_org():
+    with FakeRandomOrg(seed=7) as server:
+        with patch.object(random_utils, 'RANDOM_ORG_URL', server.url), \
+                patch.object(random_utils, 'RANDOM_BUFFER_SIZE', 0):
+            yield server
+
+
+def failing_provider(error=RuntimeError("Request to random.org failed: 503")):
+    provider = Mock(spec=RandomOrgProvider)
+    provider.name = "random_org"
+    provider.get_random.side_effect = error
+    return provider
+
+
+def test_local_provider_returns_two_decimal_fractions():
+    provider = LocalRandomProvider()
+    for _ in range(100):
+        value = provider.get_random()
+        assert 0 <= value < 1
+        assert round(value, 2) == value
+
+
+def test_seeded_provider_is_reproducible():
+    assert SeededRandomProvider(seed=3).get_randoms(5) == SeededRandomProvider(seed=3).get_randoms(5)
+    assert SeededRandomProvider(seed=3).get_randoms(5) != SeededRandomProvider(seed=4).get_randoms(5)
+
+
+def test_create_random_provider_invalid_name():
+    with pytest.raises(ValueError) as excinfo:
+        create_random_provider('dice')
+    assert str(excinfo.value) == "Invalid random provider: dice. Must be one of ('random_org', 'local', 'seeded')."
+
+
+def test_random_org_provider_against_local_stand_in(fake_random_org):
+    provider = RandomOrgProvider()
+    value = provider.get_random()
+    assert 0 <= value < 1
+
+    values = provider.get_randoms(25)
+    assert len(values) == 25
+    assert fake_random_org.requests[-1]['num'] == ['25']
+
+
+def test_circuit_breaker_falls_back_on_error():
+    breaker = CircuitBreakerProvider(failing_provider(), SeededRandomProvider(seed=1), window=5, call_timeout=None)
+    assert breaker.get_random() == SeededRandomProvider(seed=1).get_random()
+    assert breaker.state == CircuitBreakerProvider.CLOSED
+    assert breaker.stats()['fallbacks'] == 1
+
+
+def test_circuit_breaker_opens_after_error_rate_exceeded():
+    primary = failing_provider()
+    breaker = CircuitBreakerProvider(primary, LocalRandomProvider(), window=4, error_rate_threshold=0.5,
+                                     call_timeout=None)
+    for _ in range(4):
+        breaker.get_random()
+    assert breaker.state == CircuitBreakerProvider.OPEN
+
+    # while open the primary is not called at all
+    breaker.get_random()
+    assert primary.get_random.call_count == 4
+
+
+def test_circuit_breaker_half_open_trial_closes_on_success():
+    primary = failing_provider()
+    breaker = CircuitBreakerProvider(primary, LocalRandomProvider(), window=2, cooldown=0, call_timeout=None)
+    breaker.get_random()
+    breaker.get_random()
+    assert breaker.state == CircuitBreakerProvider.OPEN
+
+    primary.get_random.side_effect = None
+    primary.get_random.return_value = 0.5
+    assert breaker.get_random() == 0.5
+    assert breaker.state == CircuitBreakerProvider.CLOSED
+
+
+def test_circuit_breaker_bounds_latency_of_slow_remote(fake_random_org):
+    fake_random_org.delay = 0.5
+    breaker = CircuitBreakerProvider(RandomOrgProvider(), SeededRandomProvider(seed=2), window=1,
+                                     latency_threshold=0.05, call_timeout=0.05)
+    assert breaker.get_random() == SeededRandomProvider(seed=2).get_random()
+    assert breaker.state == CircuitBreakerProvider.OPEN
+
+
+def test_circuit_breaker_falls_back_when_remote_is_down(fake_random_org):
+    fake_random_org.status = 503
+    breaker = CircuitBreakerProvider(RandomOrgProvider(), LocalRandomProvider(), window=3)
+    for _ in range(3):
+        assert 0 <= breaker.get_random() < 1
+    assert breaker.state == CircuitBreakerProvider.OPEN
+    assert breaker.stats()['failures'] == 3
@@ -1,12 +1,22 @@
 import pytest
+import time
 from unittest.mock import patch, Mock
 from requests.exceptions import Timeout, RequestException
 
 # Adjust the import statement according to your project structure
-from meal_max.utils.random_utils import get_random
+from meal_max.utils import random_utils
+from meal_max.utils.random_utils import RandomBuffer, fetch_random_numbers, get_random
+from tests.fake_random_org import FakeRandomOrg
 
 
-@patch('meal_max.utils.random_utils.requests.get')
+@pytest.fixture(autouse=True)
+def unbuffered():
+    """Makes get_random fetch a single number per call, as it did before buffering."""
+    with patch.object(random_utils, 'RANDOM_BUFFER_SIZE', 0):
+        yield
+
+
+@patch('meal_max.utils.random_utils.requests.Session.get')
 def test_get_random_success(mock_get):
     """Test that get_random returns the correct float when the request is successful."""
     # Mock the response from requests.get
@@ -20,11 +30,11 @@ def test_get_random_success(mock_get):
     assert random_number == 0.42
     mock_get.assert_called_once_with(
         "https://www.random.org/decimal-fractions/?num=1&dec=2&col=1&format=plain&rnd=new",
-        timeout=5
+        timeout=(3.05, 5.0)
     )
 
 
-@patch('meal_max.utils.random_utils.requests.get')
+@patch('meal_max.utils.random_utils.requests.Session.get')
 def test_get_random_invalid_response(mock_get):
     """Test that get_random raises ValueError when the response is invalid."""
     # Mock the response with invalid text
@@ -38,7 +48,7 @@ def test_get_random_invalid_response(mock_get):
     assert str(excinfo.value) == "Invalid response from random.org: invalid_number"
 
 
-@patch('meal_max.utils.random_utils.requests.get')
+@patch('meal_max.utils.random_utils.requests.Session.get')
 def test_get_random_timeout(mock_get):
     """Test that get_random raises RuntimeError on request timeout."""
     # Simulate a timeout exception
@@ -49,7 +59,7 @@ def test_get_random_timeout(mock_get):
     assert str(excinfo.value) == "Request to random.org timed out."
 
 
-@patch('meal_max.utils.random_utils.requests.get')
+@patch('meal_max.utils.random_utils.requests.Session.get')
 def test_get_random_request_exception(mock_get):
     """Test that get_random raises RuntimeError on general request exceptions."""
     # Simulate a general request exception
@@ -60,7 +70,7 @@ def test_get_random_request_exception(mock_get):
     assert str(excinfo.value) == "Request to random.org failed: Some error"
 
 
-@patch('meal_max.utils.random_utils.requests.get')
+@patch('meal_max.utils.random_utils.requests.Session.get')
 def test_get_random_http_error(mock_get):
     """Test that get_random raises RuntimeError when response status is not 200."""
     # Mock response with a non-200 status code
@@ -72,3 +82,130 @@ def test_get_random_http_error(mock_get):
     with pytest.raises(RuntimeError) as excinfo:
         get_random()
     assert str(excinfo.value) == "Request to random.org failed: Internal Server Error"
+
+
+@patch('meal_max.utils.random_utils.requests.Session.get')
+def test_fetch_random_numbers_batch(mock_get):
+    """Test that a batch request asks random.org for num numbers and parses every line."""
+    mock_response = Mock()
+    mock_response.text = '0.42\n0.07\n0.99\n'
+    mock_get.return_value = mock_response
+
+    assert fetch_random_numbers(3) == [0.42, 0.07, 0.99]
+    mock_get.assert_called_once_with(
+        "https://www.random.org/decimal-fractions/?num=3&dec=2&col=1&format=plain&rnd=new",
+        timeout=(3.05, 5.0)
+    )
+
+
+@patch('meal_max.utils.random_utils.requests.Session.get')
+def test_fetch_random_numbers_short_response(mock_get):
+    """Test that a batch with fewer numbers than requested is rejected."""
+    mock_response = Mock()
+    mock_response.text = '0.42\n'
+    mock_get.return_value = mock_response
+
+    with pytest.raises(ValueError) as excinfo:
+        fetch_random_numbers(2)
+    assert str(excinfo.value) == "Invalid response from random.org: 0.42"
+
+
+def test_fetch_random_numbers_invalid_num():
+    """Test that batch sizes outside random.org's limits are rejected before any request."""
+    with pytest.raises(ValueError) as excinfo:
+        fetch_random_numbers(0)
+    assert str(excinfo.value) == "Invalid batch size: 0. Must be between 1 and 10000."
+
+
+def test_random_buffer_serves_from_memory():
+    """Test that one batch serves several calls and the first call counts as a miss."""
+    fetch = Mock(return_value=[0.1, 0.2, 0.3])
+    buffer = RandomBuffer(batch_size=3, low_water=0, fetch=fetch, background=False)
+
+    assert [buffer.get(), buffer.get(), buffer.get()] == [0.1, 0.2, 0.3]
+    fetch.assert_called_once_with(3)
+
+    stats = buffer.stats()
+    assert stats['depth'] == 0
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+    assert stats['refills'] == 1
+
+
+def test_random_buffer_refills_in_background_below_low_water():
+    """Test that dropping below the low-water mark triggers a refill without blocking the caller."""
+    fetch = Mock(side_effect=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]])
+    buffer = RandomBuffer(batch_size=3, low_water=3, fetch=fetch)
+    buffer.refill()
+
+    assert buffer.get() == 0.1
+    # wait for the background refill to land
+    for _ in range(100):
+        if buffer.stats()['refills'] == 2:
+            break
+        time.sleep(0.01)
+
+    assert fetch.call_count == 2
+    assert buffer.stats()['depth'] == 5
+    assert buffer.stats()['misses'] == 0
+
+
+def test_random_buffer_miss_surfaces_fetch_error():
+    """Test that an empty buffer whose refill fails raises the fetch error and counts it."""
+    fetch = Mock(side_effect=RuntimeError("Request to random.org timed out."))
+    buffer = RandomBuffer(batch_size=5, low_water=1, fetch=fetch, background=False)
+
+    with pytest.raises(RuntimeError) as excinfo:
+        buffer.get()
+    assert str(excinfo.value) == "Request to random.org timed out."
+    assert buffer.stats()['refill_errors'] == 1
+    assert buffer.stats()['refill_in_flight'] is False
+
+
+@patch('meal_max.utils.random_utils.fetch_random_numbers')
+def test_get_random_uses_shared_buffer(mock_fetch):
+    """Test that get_random is served from the shared buffer when buffering is enabled."""
+    mock_fetch.return_value = [0.25] * 10
+    with patch.object(random_utils, 'RANDOM_BUFFER_SIZE', 10), \
+            patch.object(random_utils, '_buffer', RandomBuffer(10, 0, fetch=mock_fetch, background=False)):
+        assert get_random() == 0.25
+        assert get_random() == 0.25
+        assert random_utils.get_random_buffer_stats()['depth'] == 8
+    mock_fetch.assert_called_once_with(10)
+
+
+@pytest.fixture
+def fresh_session():
+    """Gives the test its own random.org session, without retry backoff, and closes it afterwards."""
+    random_utils.close_session()
+    with patch.object(random_utils, 'RANDOM_RETRY_BACKOFF', 0):
+        yield
+    random_utils.close_session()
+
+
+def test_session_keeps_connection_alive(fresh_session):
+    """Test that repeated fetches reuse one pooled connection and are recorded in the latency histogram."""
+    before = random_utils.get_http_stats()
+    with FakeRandomOrg(seed=1) as server, patch.object(random_utils, 'RANDOM_ORG_URL', server.url):
+        for _ in range(5):
+            assert len(fetch_random_numbers(3)) == 3
+        stats = random_utils.get_http_stats()
+
+    assert len(server.requests) == 5
+    assert stats['connections_opened'] == 1
+    assert stats['requests'] - before['requests'] == 5
+    assert stats['latency_seconds']['count'] - before['latency_seconds']['count'] == 5
+
+
+def test_session_retries_server_errors(fresh_session):
+    """Test that 5xx responses are retried RANDOM_RETRIES times before the error is raised."""
+    before = random_utils.get_http_stats()
+    with FakeRandomOrg(status=503) as server, patch.object(random_utils, 'RANDOM_ORG_URL', server.url):
+        with pytest.raises(RuntimeError) as excinfo:
+            fetch_random_numbers(1)
+
+    assert str(excinfo.value).startswith("Request to random.org failed: 503 Server Error")
+    assert len(server.requests) == random_utils.RANDOM_RETRIES + 1
+    stats = random_utils.get_http_stats()
+    assert stats['failures'] - before['failures'] == 1
+    assert stats['retries'] - before['retries'] == random_utils.RANDOM_RETRIES
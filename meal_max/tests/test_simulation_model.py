@@ -0,0 +1,110 @@
+import pytest
+from unittest.mock import patch
+
+from meal_max.models import simulation_model
+from meal_max.models.kitchen_model import Meal
+from meal_max.models.simulation_model import close_executor, main, simulate
+
+
+MEALS = {
+    1: Meal(id=1, meal='Meal1', price=10.0, cuisine='Italian', difficulty='MED'),
+    2: Meal(id=2, meal='Meal2', price=15.0, cuisine='French', difficulty='LOW'),
+    3: Meal(id=3, meal='Meal3', price=8.0, cuisine='Mexican', difficulty='HIGH'),
+}
+
+
+@pytest.fixture(autouse=True)
+def mock_get_meals_by_ids():
+    with patch('meal_max.models.simulation_model.get_meals_by_ids',
+               side_effect=lambda meal_ids: [MEALS[meal_id] for meal_id in meal_ids]) as mock:
+        yield mock
+
+
+@pytest.fixture(scope='module', autouse=True)
+def shared_pool():
+    yield
+    close_executor()
+
+
+def test_simulate_converges_to_exact_probabilities():
+    result = simulate([1, 2, 3], bouts=200000, seed=1, workers=1)
+
+    assert [meal['id'] for meal in result['meals']] == [1, 2, 3]
+    # scores are 68, 87 and 55, so deltas are 0.19, 0.13 and 0.32
+    assert result['exact_win_probabilities'] == [[None, 0.19, 0.13], [0.19, None, 0.32], [0.13, 0.32, None]]
+    for simulated_row, exact_row in zip(result['win_probabilities'], result['exact_win_probabilities']):
+        for simulated, exact in zip(simulated_row, exact_row):
+            assert simulated == pytest.approx(exact, abs=0.005) if exact is not None else simulated is None
+
+
+def test_simulate_is_reproducible_across_worker_counts():
+    with patch('meal_max.models.simulation_model.SIMULATION_CHUNK_BOUTS', 5000):
+        in_process = simulate([1, 2, 3], bouts=20000, seed=7, workers=1)
+        pooled = simulate([1, 2, 3], bouts=20000, seed=7, workers=2)
+        reseeded = simulate([1, 2, 3], bouts=20000, seed=8, workers=1)
+
+    assert pooled['win_probabilities'] == in_process['win_probabilities']
+    assert reseeded['win_probabilities'] != in_process['win_probabilities']
+
+
+def test_simulate_splits_one_pair_across_workers():
+    with patch('meal_max.models.simulation_model.SIMULATION_CHUNK_BOUTS', 1000), \
+            patch('meal_max.models.simulation_model._get_executor',
+                  wraps=simulation_model._get_executor) as get_executor:
+        pooled = simulate([1, 2], bouts=4000, seed=3, workers=4)
+        in_process = simulate([1, 2], bouts=4000, seed=3, workers=1)
+
+    # four chunks of the single pair make four tasks, and one worker needs no pool
+    get_executor.assert_called_once_with(4)
+    assert pooled['win_probabilities'] == in_process['win_probabilities']
+
+
+def test_simulate_reuses_the_process_pool():
+    simulate([1, 2, 3], bouts=2000, seed=1, workers=2)
+    executor = simulation_model._executor
+    simulate([1, 2, 3], bouts=2000, seed=2, workers=2)
+
+    assert executor is not None
+    assert simulation_model._executor is executor
+
+
+def test_simulate_skips_the_pool_for_a_single_task():
+    close_executor()
+    with patch('meal_max.models.simulation_model.SIMULATION_CHUNK_BOUTS', 1000):
+        simulate([1, 2], bouts=1000, seed=1, workers=4)
+
+    assert simulation_model._executor is None
+
+
+def test_simulate_returns_seed_when_not_given():
+    result = simulate([1, 2], bouts=100, workers=1)
+    assert simulate([1, 2], bouts=100, seed=result['seed'], workers=1)['win_probabilities'] == \
+        result['win_probabilities']
+
+
+@pytest.mark.parametrize('kwargs, message', [
+    ({'meal_ids': [1]}, "A simulation needs at least two different meals."),
+    ({'meal_ids': [1, 1]}, "A simulation needs at least two different meals."),
+    ({'meal_ids': [1, 2], 'bouts': 0}, "Invalid bouts: 0. Must be a positive integer."),
+    ({'meal_ids': [1, 2], 'workers': 0}, "Invalid workers: 0. Must be a positive integer."),
+    ({'meal_ids': [1, 2], 'bouts': True}, "Invalid bouts: True. Must be a positive integer."),
+    ({'meal_ids': [1, 2], 'workers': True}, "Invalid workers: True. Must be a positive integer."),
+    ({'meal_ids': [True, 2]}, "meal_ids must be a list of integer meal ids."),
+])
+def test_simulate_invalid_input(mock_get_meals_by_ids, kwargs, message):
+    with pytest.raises(ValueError) as excinfo:
+        simulate(**kwargs)
+    assert str(excinfo.value) == message
+    mock_get_meals_by_ids.assert_not_called()
+
+
+def test_simulate_too_large():
+    with patch('meal_max.models.simulation_model.SIMULATION_MAX_TOTAL_BOUTS', 1000):
+        with pytest.raises(ValueError) as excinfo:
+            simulate([1, 2, 3], bouts=500, workers=1)
+    assert str(excinfo.value) == "Simulation too large: 3 pairs x 500 bouts exceeds 1000 bouts."
+
+
+def test_cli_prints_result(capsys):
+    main(['1', '2', '--bouts', '1000', '--seed', '3', '--workers', '1'])
+    assert '"bouts_per_pair": 1000' in capsys.readouterr().out
@@ -0,0 +1,199 @@
+import asyncio
+import pytest
+import sqlite3
+import threading
+import time
+from unittest.mock import patch
+
+from meal_max.utils import sql_utils
+from meal_max.utils.sql_utils import ConnectionPool, get_db_connection
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "meal_max.db")
+    with patch.object(sql_utils, "DB_PATH", path):
+        sql_utils.close_connection_pool()
+        yield path
+        sql_utils.close_connection_pool()
+
+
+def test_pool_reuses_connection_for_same_thread(db_path):
+    pool = ConnectionPool(db_path, size=2)
+    conn1 = pool.acquire()
+    pool.release(conn1)
+    conn2 = pool.acquire()
+    assert conn2 is conn1
+    assert pool.stats() == {'size': 2, 'open': 1, 'idle': 0, 'in_use': 1}
+    pool.release(conn2)
+    pool.close()
+
+
+def test_pool_prefers_thread_affine_connection(db_path):
+    pool = ConnectionPool(db_path, size=2)
+    conn1 = pool.acquire()
+    conn2 = pool.acquire()
+    pool.release(conn1)
+    pool.release(conn2)
+
+    # the last connection this thread used is preferred even though conn2 is on top of the idle stack
+    assert pool.acquire() is conn2
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(pool.acquire()))
+    thread.start()
+    thread.join()
+    assert other == [conn1]
+    pool.close()
+
+
+def test_pool_times_out_when_exhausted(db_path):
+    pool = ConnectionPool(db_path, size=1, timeout=0.05)
+    conn = pool.acquire()
+    with pytest.raises(sqlite3.OperationalError) as excinfo:
+        pool.acquire()
+    assert str(excinfo.value) == "Timed out waiting for a database connection"
+    pool.release(conn)
+    pool.close()
+
+
+def test_pool_rolls_back_uncommitted_work_on_release(db_path):
+    pool = ConnectionPool(db_path, size=1)
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.execute("INSERT INTO t VALUES (1)")
+    pool.release(conn)
+
+    conn = pool.acquire()
+    assert not conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    pool.release(conn)
+    pool.close()
+
+
+def test_pool_replaces_unhealthy_connection(db_path):
+    pool = ConnectionPool(db_path, size=1, health_check_interval=0)
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close()
+
+    replacement = pool.acquire()
+    assert replacement is not conn
+    assert replacement.execute("SELECT 1").fetchone() == (1,)
+    assert pool.stats()['open'] == 1
+    pool.release(replacement)
+    pool.close()
+
+
+def test_pool_rejects_invalid_size(db_path):
+    with pytest.raises(ValueError) as excinfo:
+        ConnectionPool(db_path, size=0)
+    assert str(excinfo.value) == "Invalid pool size: 0. Pool size must be at least 1."
+
+
+def test_pool_refuses_checkout_after_close(db_path):
+    pool = ConnectionPool(db_path, size=1)
+    pool.close()
+    with pytest.raises(sqlite3.OperationalError) as excinfo:
+        pool.acquire()
+    assert str(excinfo.value) == "Connection pool is closed"
+
+
+def test_pool_close_tags_closed_connections(db_path, caplog):
+    pool = ConnectionPool(db_path, size=1)
+    pool.release(pool.acquire())
+
+    with caplog.at_level("INFO", logger=sql_utils.logger.name):
+        pool.close()
+
+    closed = [record for record in caplog.records if record.getMessage() == "Database connection closed."]
+    assert closed and all(record.event == 'db.connection_closed' for record in closed)
+
+
+def test_get_db_connection_uses_shared_pool(db_path):
+    with get_db_connection() as conn1:
+        pass
+    with get_db_connection() as conn2:
+        pass
+    assert conn1 is conn2
+    assert sql_utils.get_connection_pool().stats()['open'] == 1
+
+
+def test_get_db_connection_keeps_connection_after_statement_error(db_path):
+    with pytest.raises(sqlite3.OperationalError):
+        with get_db_connection() as conn1:
+            conn1.execute("SELECT * FROM missing_table")
+    with get_db_connection() as conn2:
+        pass
+    assert conn1 is conn2
+
+
+def test_get_db_connection_pool_disabled(db_path):
+    with patch.object(sql_utils, "DB_POOL_DISABLED", True):
+        with get_db_connection() as conn1:
+            pass
+        with get_db_connection() as conn2:
+            pass
+    assert conn1 is not conn2
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn1.execute("SELECT 1")
+
+
+def test_pool_connections_use_performance_profile(db_path):
+    profile = sql_utils.get_pragma_profile()
+    assert profile['profile'] == 'performance'
+    assert profile['pragmas']['journal_mode'] == 'WAL'
+    assert profile['pragmas']['synchronous'] == 'NORMAL'
+    assert profile['pragmas']['cache_size'] == sql_utils.DB_CACHE_SIZE
+    assert profile['pragmas']['busy_timeout'] == sql_utils.DB_BUSY_TIMEOUT
+    assert profile['pragmas']['temp_store'] == 'MEMORY'
+    assert profile['concurrency'] == "readers run concurrently with a single writer"
+
+
+def test_default_profile_leaves_sqlite_defaults(db_path):
+    with patch.object(sql_utils, "DB_PRAGMA_PROFILE", "default"):
+        assert sql_utils.get_pragma_settings() == {}
+        profile = sql_utils.get_pragma_profile()
+    assert profile['pragmas']['journal_mode'] == 'DELETE'
+    assert profile['concurrency'] == "writers block readers for the duration of each write"
+
+
+def test_get_pragma_settings_rejects_invalid_journal_mode():
+    with patch.object(sql_utils, "DB_JOURNAL_MODE", "WAL; DROP TABLE meals"):
+        with pytest.raises(ValueError) as excinfo:
+            sql_utils.get_pragma_settings()
+    assert str(excinfo.value).startswith("Invalid journal mode: WAL; DROP TABLE meals.")
+
+
+def test_get_pragma_settings_rejects_invalid_profile():
+    with patch.object(sql_utils, "DB_PRAGMA_PROFILE", "turbo"):
+        with pytest.raises(ValueError) as excinfo:
+            sql_utils.get_pragma_settings()
+    assert str(excinfo.value).startswith("Invalid PRAGMA profile: turbo.")
+
+
+def test_run_in_db_executor_bounds_concurrency():
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def query(value):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return value * 2
+
+    async def run():
+        return await asyncio.gather(*(sql_utils.run_in_db_executor(query, i) for i in range(20)))
+
+    with patch.object(sql_utils, "DB_EXECUTOR_WORKERS", 3):
+        sql_utils.close_db_executor()
+        try:
+            assert asyncio.run(run()) == [i * 2 for i in range(20)]
+        finally:
+            sql_utils.close_db_executor()
+    assert peak <= 3
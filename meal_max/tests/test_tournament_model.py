@@ -0,0 +1,134 @@
+from collections import Counter
+from itertools import combinations
+import pytest
+from unittest.mock import Mock, patch
+
+from meal_max.models.battle_model import BattleModel
+from meal_max.models.kitchen_model import Meal
+from meal_max.models.tournament_model import TournamentModel
+from meal_max.utils.random_providers import RandomProvider, SeededRandomProvider
+
+
+MEALS = {
+    meal_id: Meal(id=meal_id, meal=f'Meal{meal_id}', cuisine=cuisine, price=price, difficulty=difficulty)
+    for meal_id, cuisine, price, difficulty in [
+        (1, 'Italian', 10.0, 'MED'),
+        (2, 'French', 15.0, 'LOW'),
+        (3, 'Mexican', 8.0, 'HIGH'),
+        (4, 'Thai', 12.0, 'MED'),
+        (5, 'Indian', 9.0, 'LOW'),
+        (6, 'Greek', 11.0, 'HIGH'),
+        (7, 'Korean', 14.0, 'MED'),
+    ]
+}
+
+
+@pytest.fixture
+def mock_kitchen():
+    with patch('meal_max.models.tournament_model.get_meals_by_ids',
+               side_effect=lambda meal_ids: [MEALS[meal_id] for meal_id in meal_ids]) as mock_get_meals, \
+            patch('meal_max.models.tournament_model.record_battle_results') as mock_record:
+        yield mock_get_meals, mock_record
+
+
+def run(meal_ids, tournament_format, **kwargs):
+    return TournamentModel(SeededRandomProvider(seed=5)).run(meal_ids, tournament_format, **kwargs)
+
+
+def test_round_robin_plays_every_pair_once(mock_kitchen):
+    mock_get_meals, mock_record = mock_kitchen
+    result = run([1, 2, 3, 4, 5], 'round_robin')
+
+    pairs = [frozenset((bout['meal_1'], bout['meal_2'])) for bout in result['bouts']]
+    assert sorted(pairs, key=sorted) == sorted((frozenset(p) for p in combinations([1, 2, 3, 4, 5], 2)), key=sorted)
+    # with five meals, each of the five rounds has two bouts and one meal sitting out
+    assert result['rounds'] == 5
+    assert Counter(bout['round'] for bout in result['bouts']) == {r: 2 for r in range(1, 6)}
+
+    mock_get_meals.assert_called_once_with([1, 2, 3, 4, 5])
+    mock_record.assert_called_once_with([(bout['winner'], bout['loser']) for bout in result['bouts']])
+    wins = [standing['wins'] for standing in result['standings']]
+    assert wins == sorted(wins, reverse=True)
+    assert result['champion']['id'] == result['standings'][0]['id']
+
+
+def test_single_elimination_gives_top_seeds_byes(mock_kitchen):
+    result = run([1, 2, 3, 4, 5], 'single_elimination')
+
+    assert len(result['bouts']) == 4
+    # five meals in an eight-slot bracket: seeds 1-3 skip the first round and 4 meets 5
+    first_round = [bout for bout in result['bouts'] if bout['round'] == 1]
+    assert [(bout['meal_1'], bout['meal_2']) for bout in first_round] == [(4, 5)]
+    champion = result['standings'][0]
+    assert champion['losses'] == 0
+    assert all(standing['losses'] == 1 for standing in result['standings'][1:])
+
+
+def test_double_elimination_needs_two_losses(mock_kitchen):
+    result = run([1, 2, 3, 4, 5, 6], 'double_elimination')
+
+    champion, *others = result['standings']
+    assert champion['losses'] <= 1
+    assert all(standing['losses'] == 2 for standing in others)
+    assert len(result['bouts']) in (2 * 6 - 2, 2 * 6 - 1)
+
+
+def test_swiss_avoids_rematches_and_spreads_byes(mock_kitchen):
+    result = run([1, 2, 3, 4, 5, 6, 7], 'swiss', rounds=3)
+
+    assert result['rounds'] == 3
+    pairs = [frozenset((bout['meal_1'], bout['meal_2'])) for bout in result['bouts']]
+    assert len(pairs) == 9
+    assert len(set(pairs)) == len(pairs)
+    assert sum(standing['byes'] for standing in result['standings']) == 3
+    assert all(standing['byes'] <= 1 for standing in result['standings'])
+
+
+def test_randomness_is_drawn_in_one_batch(mock_kitchen):
+    provider = Mock(spec=RandomProvider)
+    provider.get_randoms.return_value = [0.0] * 6
+
+    result = TournamentModel(provider).run([1, 2, 3, 4], 'round_robin')
+
+    provider.get_randoms.assert_called_once_with(6)
+    provider.get_random.assert_not_called()
+    # with a draw of 0 the first-listed meal wins unless the scores are equal, as in BattleModel.battle
+    assert all(bout['winner'] == bout['meal_1'] for bout in result['bouts'])
+
+
+def test_scores_follow_meals_whatever_order_they_are_returned_in(mock_kitchen):
+    mock_get_meals, _ = mock_kitchen
+    mock_get_meals.side_effect = lambda meal_ids: [MEALS[meal_id] for meal_id in reversed(meal_ids)]
+    provider = Mock(spec=RandomProvider)
+    provider.get_randoms.return_value = [0.25] * 3
+    scorer = BattleModel(provider)
+
+    result = TournamentModel(provider).run([1, 2, 3], 'round_robin')
+
+    for bout in result['bouts']:
+        delta = abs(scorer.get_battle_score(MEALS[bout['meal_1']]) - scorer.get_battle_score(MEALS[bout['meal_2']])) / 100
+        assert bout['winner'] == (bout['meal_1'] if delta > 0.25 else bout['meal_2'])
+
+
+def test_same_seed_same_tournament(mock_kitchen):
+    assert run([1, 2, 3, 4, 5, 6, 7], 'double_elimination') == run([1, 2, 3, 4, 5, 6, 7], 'double_elimination')
+
+
+@pytest.mark.parametrize('meal_ids, tournament_format, rounds, message', [
+    ([1, 2], 'ladder', None,
+     "Invalid tournament format: ladder. Must be one of "
+     "('round_robin', 'single_elimination', 'double_elimination', 'swiss')."),
+    ([1], 'round_robin', None, "A tournament needs at least two meals."),
+    ([1, 2, 1], 'round_robin', None, "Each meal can only enter a tournament once."),
+    ([1, 2, 3], 'round_robin', 2, "rounds can only be set for a swiss tournament."),
+    ([1, 2, 3], 'swiss', 3, "Invalid rounds: 3. Must be between 1 and 2."),
+    ([1, 2, 3], 'swiss', True, "Invalid rounds: True. Must be between 1 and 2."),
+    ([1, True], 'round_robin', None, "meal_ids must be a list of integer meal ids."),
+])
+def test_invalid_tournament(mock_kitchen, meal_ids, tournament_format, rounds, message):
+    mock_get_meals, mock_record = mock_kitchen
+    with pytest.raises(ValueError) as excinfo:
+        run(meal_ids, tournament_format, rounds=rounds)
+    assert str(excinfo.value) == message
+    mock_get_meals.assert_not_called()
+    mock_record.assert_not_called()